@@ -0,0 +1,70 @@
+'''
+xform benchmarks.
+
+Run a single benchmark from the repository root, e.g::
+
+    python -m benchmarks.bench_instrument
+'''
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+
+def bench(func: Callable[[], Any], number: int = 10000,
+          repeat: int = 5) -> float:
+    '''
+    Best time of `repeat` runs.
+
+    :param func: `<callable>` sync function
+    :return: `<float>` seconds per call
+    '''
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / number
+
+
+def abench(func: Callable[[], Awaitable[Any]], number: int = 10000,
+           repeat: int = 5) -> float:
+    '''
+    Best time of `repeat` runs, func return awaitable.
+
+    :param func: `<callable>` return coroutine
+    :return: `<float>` seconds per call
+    '''
+    async def _run():
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        return time.perf_counter() - start
+
+    loop = asyncio.new_event_loop()
+    try:
+        best = min(loop.run_until_complete(_run()) for _ in range(repeat))
+    finally:
+        loop.close()
+    return best / number
+
+
+def interleave(*funcs: Callable[[], Awaitable[Any]], number: int = 5000,
+               rounds: int = 10) -> list:
+    '''
+    Run the async benchmarks in turn and keep the best round of each,
+    used when the expected difference is below the noise of one run.
+
+    :return: `<list>` seconds per call of each func
+    '''
+    best = [None] * len(funcs)
+    for _ in range(rounds):
+        for i, func in enumerate(funcs):
+            value = abench(func, number=number, repeat=1)
+            best[i] = value if best[i] is None else min(best[i], value)
+    return best
+
+
+def report(name: str, seconds: float) -> None:
+    print(f'{name:<48} {seconds * 1e6:>10.2f} us')
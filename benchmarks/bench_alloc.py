@@ -0,0 +1,155 @@
+'''
+Allocation budgets of Form.bind/dict_bind(tracemalloc).
+
+For representative forms(benchmarks.suite_forms) each bind is measured
+by its peak of traced memory(bytes allocated while binding, i.e. the
+dicts, coroutines, strings, Content/DataBinding objects alive at the
+same time) and the blocks/bytes still retained after 500 binds(caches,
+leaks). The binds are driven without event loop, so the numbers don't
+include task/loop allocations.
+
+Exit status 1 when a case is over its budget(alloc_budgets.json), the
+budgets depend on the Python version and are rewritten from the current
+numbers with --write, e.g::
+
+    python -m benchmarks.bench_alloc
+    python -m benchmarks.bench_alloc --write --headroom 10
+'''
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from xform.adapters.memory import DictRequest
+from xform.fields import Nested
+from xform.form import Form
+
+from .suite_forms import ACCOUNT, IDS, LISTS, USER, USER_ERRORS, \
+    USER_QUERY, AccountForm, CompactListForm, ListForm, UserForm
+
+BUDGETS = os.path.join(os.path.dirname(__file__), 'alloc_budgets.json')
+RETAINED_BINDS = 500
+
+
+def _drive(coro: Awaitable) -> Any:
+    '''
+    Run a coroutine that never suspends, e.g: binds of sync fields.
+    '''
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError('the bind awaited, use sync fields only')
+
+
+def _reset(fields: dict) -> None:
+    '''
+    Drop the state of the last bind kept by the fields, it is released
+    while binding and would hide the allocations of the bind.
+    '''
+    for field in fields.values():
+        field.reset()
+        if isinstance(field, Nested):
+            _reset(field.schema.__fields__)
+
+
+def cases() -> Dict[str, Tuple[Form, Callable[[], Awaitable]]]:
+    user, account = UserForm(), AccountForm()
+    lists, compact = ListForm(), CompactListForm()
+    query = DictRequest(query=USER_QUERY)
+    body = DictRequest(body=USER)
+    return {
+        'dict_bind valid': (user, lambda: user.dict_bind(USER)),
+        'dict_bind error heavy': (user, lambda: user.dict_bind(USER_ERRORS)),
+        'dict_bind nested 2 levels':
+            (account, lambda: account.dict_bind(ACCOUNT)),
+        'dict_bind lists 1000': (lists, lambda: lists.dict_bind(LISTS)),
+        'dict_bind compact IntList 1000':
+            (compact, lambda: compact.dict_bind({'ids': IDS})),
+        'bind DictRequest query': (user, lambda: user.bind(query)),
+        'bind DictRequest json': (user, lambda: user.bind(body)),
+    }
+
+
+def measure(form: Form, bind: Callable[[], Awaitable],
+            repeat: int = 5) -> dict:
+    '''
+    :return: `<dict>` peak_bytes(per bind), retained_blocks and
+        retained_bytes(per RETAINED_BINDS binds)
+    '''
+    for _ in range(10):
+        # warm the caches, e.g: compiled date formats
+        _drive(bind())
+    gc.collect()
+    tracemalloc.start()
+    try:
+        peak = None
+        for _ in range(repeat):
+            _reset(form.__fields__)
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            _drive(bind())
+            value = tracemalloc.get_traced_memory()[1] - current
+            peak = value if peak is None else min(peak, value)
+        gc.collect()
+        before = tracemalloc.take_snapshot()
+        for _ in range(RETAINED_BINDS):
+            _drive(bind())
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    return {'peak_bytes': peak, 'retained_blocks': max(blocks, 0),
+            'retained_bytes': max(size, 0)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_alloc')
+    parser.add_argument('--write', action='store_true',
+                        help=f'write the budgets to {BUDGETS}')
+    parser.add_argument('--headroom', type=float, default=10,
+                        help='percent added to the budgets by --write')
+    args = parser.parse_args()
+
+    results = {name: measure(form, bind)
+               for name, (form, bind) in cases().items()}
+    if args.write:
+        scale = 1 + args.headroom / 100
+        budgets = {name: {key: int(value * scale) + (key != 'peak_bytes')
+                          for key, value in row.items()}
+                   for name, row in results.items()}
+        with open(BUDGETS, 'w') as f:
+            json.dump(budgets, f, indent=2, sort_keys=True)
+            f.write('\n')
+    with open(BUDGETS) as f:
+        budgets = json.load(f)
+
+    failed = []
+    print(f'{"case":<36} {"peak bytes":>16} {"retained blocks":>18} '
+          f'{"retained bytes":>18}')
+    for name, row in results.items():
+        budget = budgets.get(name, {})
+        cells = []
+        for key in ('peak_bytes', 'retained_blocks', 'retained_bytes'):
+            limit = budget.get(key)
+            over = limit is not None and row[key] > limit
+            if over:
+                failed.append(f'{name} {key}')
+            limit = '-' if limit is None else limit
+            cells.append(f'{row[key]:>8}/{limit:<7}{"!" if over else " "}')
+        print(f'{name:<36} ' + ' '.join(f'{cell:>18}' for cell in cells))
+    if failed:
+        print('FAIL: over budget: ' + ', '.join(failed))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
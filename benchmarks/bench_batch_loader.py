@@ -0,0 +1,78 @@
+'''
+Batching of async lookups across concurrent binds.
+
+Compare backend queries of a per-value lookup field with BatchField.
+'''
+import asyncio
+import random
+import time
+
+from xform import fields
+from xform.form import Form
+from xform.loader import BatchField
+
+
+class FakeBackend:
+    def __init__(self, latency: float = 0.002):
+        self.latency = latency
+        self.queries = 0
+
+    async def get_users(self, ids: list) -> dict:
+        self.queries += 1
+        await asyncio.sleep(self.latency)
+        return {uid: {'uid': uid} for uid in ids if uid % 100}
+
+
+BACKEND = FakeBackend()
+
+
+class UserField(fields.Integer):
+    cvt_type = None
+
+    async def _validate(self, value, attr, data):
+        users = await BACKEND.get_users([int(value)])
+        if not users:
+            self.set_error('invalid')
+        else:
+            return users[int(value)]
+
+
+class BatchUserField(BatchField):
+    async def batch_load(self, keys: list) -> dict:
+        return await BACKEND.get_users(keys)
+
+
+class UserForm(Form):
+    user = UserField(required=True)
+
+
+class BatchUserForm(Form):
+    user = BatchUserField(required=True, key_type=int)
+    members = BatchUserField(lst=True, required=False, key_type=int)
+
+
+async def burst(form: Form, requests: int):
+    rand = random.Random(0)
+    tasks = []
+    for _ in range(requests):
+        data = {'user': str(rand.randint(1, 10 ** 6))}
+        if isinstance(form, BatchUserForm):
+            data['members'] = [str(rand.randint(1, 10 ** 6))
+                               for _ in range(5)]
+        tasks.append(form.dict_bind(data))
+    return await asyncio.gather(*tasks)
+
+
+def main(requests: int = 2000):
+    for form in (UserForm(), BatchUserForm()):
+        BACKEND.queries = 0
+        start = time.perf_counter()
+        asyncio.run(burst(form, requests))
+        elapsed = time.perf_counter() - start
+        print(f'{form.__class__.__name__:<16} binds={requests} '
+              f'queries={BACKEND.queries} elapsed={elapsed:.3f}s')
+    print(BatchUserForm.__fields__['user'].loader.stats())
+
+
+if __name__ == '__main__':
+    main()
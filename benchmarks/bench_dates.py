@@ -0,0 +1,54 @@
+'''
+Date/time parsing.
+
+Compare the strptime + strftime round trip with the compiled parsers of
+xform.dates(ISO fast path, compiled fmt regex), and the DateTime/
+StartDate+EndedDate/Timestamp fields.
+'''
+import datetime
+
+from xform import fields
+from xform.dates import DateParser
+from xform.form import Form
+
+from . import abench, bench, report
+
+VALUES = [
+    ('%Y-%m-%d %H:%M:%S', '2021-01-01 12:30:45'),
+    ('%Y-%m-%d', '2021-01-01'),
+    ('%Y/%m/%d %H:%M', '2021/01/01 12:30'),
+    ('%d %b %Y', '01 Jan 2021'),
+]
+
+
+def strptime_round_trip(value: str, fmt: str):
+    date = datetime.datetime.strptime(value, fmt)
+    return date if date.strftime(fmt) == value else None
+
+
+class RangeForm(Form):
+    start = fields.StartDate(required=True)
+    end = fields.EndedDate('start', required=True)
+
+
+def main():
+    for fmt, value in VALUES:
+        # uncached parser, measure the parsing itself
+        parser = DateParser(fmt)
+        report(f'strptime round trip {fmt}',
+               bench(lambda: strptime_round_trip(value, fmt)))
+        report(f'DateParser {fmt}', bench(lambda: parser._parse(value)))
+    field = fields.DateTime(required=True, convert=True)
+    report('DateTime convert=True',
+           abench(lambda: field._run_validate('2021-01-01 12:30:45', 'f', {})))
+    field = fields.Timestamp(required=True, length=13)
+    report('Timestamp millisecond',
+           abench(lambda: field._run_validate('1609459200123', 'f', {})))
+    form = RangeForm()
+    data = {'start': '2021-01-01', 'end': '2021-02-01'}
+    report('StartDate+EndedDate dict_bind',
+           abench(lambda: form.dict_bind(data)))
+
+
+if __name__ == '__main__':
+    main()
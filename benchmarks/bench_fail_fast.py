@@ -0,0 +1,71 @@
+'''
+Fail-fast binds in the scheduled order.
+
+Expensive fields are declared first, the last field is cheap and often
+invalid. The same inputs run through dict_bind of the full form, of the
+fail-fast form(static order) and of the adaptive fail-fast form, after
+its scheduler has learned the order.
+'''
+import asyncio
+import random
+
+from xform import fields
+from xform.form import Form
+from xform.schedule import Scheduler
+
+from . import interleave, report
+
+
+class FullForm(Form):
+    url = fields.Url(required=True)
+    payload = fields.Jsonify(required=True)
+    card = fields.IDCard(required=True)
+    stime = fields.DateTime(required=True)
+    page = fields.Integer(required=True, _min=1)
+
+
+class FailFastForm(FullForm):
+    __fail_fast__ = True
+
+
+class AdaptiveForm(FullForm):
+    __fail_fast__ = Scheduler(adaptive=True)
+
+
+def inputs(invalid: float, number: int = 256, seed: int = 1) -> list:
+    rnd = random.Random(seed)
+    return [{
+        'url': 'https://www.example.com/path/to/page?id=1',
+        'payload': '{"ids": [1, 2, 3], "name": "test"}',
+        'card': '11010519491231002X',
+        'stime': '2021-01-01 12:30:45',
+        'page': '0' if rnd.random() < invalid else '2'
+    } for _ in range(number)]
+
+
+def _runner(form: Form, values: list):
+    index = [0]
+
+    def run():
+        index[0] += 1
+        return form.dict_bind(values[index[0] % len(values)])
+
+    return run
+
+
+def main():
+    for invalid in (0.0, 0.5, 0.9):
+        values = inputs(invalid)
+        forms = (FullForm(), FailFastForm(), AdaptiveForm())
+        # learn the order
+        loop = asyncio.new_event_loop()
+        for data in values:
+            loop.run_until_complete(forms[2].dict_bind(data))
+        loop.close()
+        seconds = interleave(*[_runner(form, values) for form in forms])
+        for form, value in zip(forms, seconds):
+            report(f'{type(form).__name__} invalid={invalid}', value)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+'''
+Import time of form hierarchies.
+
+A module of 500 generated forms(chains of 25 subclasses, every form
+declares 2 fields and overrides 1 inherited field, every 5th form also
+inherits a mixin) is written to a temporary directory and imported in a
+fresh interpreter, reports the import time and the memory of the forms.
+'''
+import os
+import subprocess
+import sys
+import tempfile
+
+FORMS = 500
+DEPTH = 25
+MIXINS = 5
+
+_MEASURE = '''
+import time, tracemalloc
+import xform.form
+tracemalloc.start()
+start = time.perf_counter()
+import generated_forms
+elapsed = time.perf_counter() - start
+print(elapsed, tracemalloc.get_traced_memory()[0])
+'''
+
+
+def generate(forms: int = FORMS, depth: int = DEPTH,
+             mixins: int = MIXINS) -> str:
+    '''
+    :return: `<str>` source of the forms module
+    '''
+    lines = ['from xform import fields',
+             'from xform.form import Form',
+             '']
+    for i in range(mixins):
+        lines += [f'class Mixin{i}(Form):',
+                  f'    page{i} = fields.Integer(required=False, default=1)',
+                  '']
+    for i in range(forms):
+        bases = [f'Form{i - 1}' if i % depth else 'Form']
+        if i % 5 == 4:
+            bases.append(f'Mixin{i % mixins}')
+        lines += [f'class Form{i}({", ".join(bases)}):',
+                  f'    id{i} = fields.Integer(required=True, _min=1)',
+                  f'    name{i} = fields.Str(required=False, length=(1, 64))']
+        if i % depth:
+            lines.append(f'    id{i - 1} = fields.Integer(required=False)')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def measure(path: str, repeat: int = 5) -> tuple:
+    '''
+    :return: `<tuple>` (best seconds, bytes)
+    '''
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [path, os.getcwd(), env.get('PYTHONPATH', '')])
+    best, memory = None, 0
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', _MEASURE], env=env,
+                                check=True, capture_output=True,
+                                text=True).stdout
+        elapsed, memory = output.split()
+        elapsed = float(elapsed)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, int(memory)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as path:
+        with open(os.path.join(path, 'generated_forms.py'), 'w') as f:
+            f.write(generate())
+        # warm the bytecode cache, measure the class creation
+        measure(path, repeat=1)
+        elapsed, memory = measure(path)
+    print(f'{FORMS} forms(depth {DEPTH}) import {elapsed * 1e3:>10.2f} ms')
+    print(f'{FORMS} forms(depth {DEPTH}) memory {memory / 1024:>10.0f} KiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+'''
+Import time budget of xform.form.
+
+`python -X importtime` in fresh interpreters, asyncio is imported first
+(every user of the binds runs an event loop), the best cumulative time of
+xform.form is the cost of xform itself. Exit status 1 when the time is
+over the budget or an optional module is imported eagerly, e.g::
+
+    python -m benchmarks.bench_import --budget 20
+'''
+import argparse
+import os
+import subprocess
+import sys
+
+# loaded on first use only
+LAZY_MODULES = ('attr', 'multidict', 'json', 'ujson',
+                'concurrent.futures.process', 'xform.content_type',
+                'xform.adapters.tornado', 'xform.adapters.aiohttp',
+                'xform.adapters.sanic', 'xform.adapters.flask',
+                'xform.adapters.memory')
+
+_CHECK = '''
+import sys
+import asyncio
+import xform.form
+print(' '.join(name for name in {!r} if name in sys.modules))
+'''
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    # write the bytecode cache, measure the import rather than compile
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = os.pathsep.join([os.getcwd(),
+                                         env.get('PYTHONPATH', '')])
+    return env
+
+
+def import_times(module: str = 'xform.form') -> dict:
+    '''
+    :return: `<dict>` {module: (self us, cumulative us)}
+    '''
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         f'import asyncio; import {module}'],
+        env=_env(), check=True, capture_output=True, text=True).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def eager_modules() -> list:
+    '''
+    :return: `<list>` LAZY_MODULES imported by xform.form
+    '''
+    output = subprocess.run([sys.executable, '-c', _CHECK.format(
+        LAZY_MODULES)], env=_env(), check=True, capture_output=True,
+        text=True).stdout
+    return output.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--budget', type=float, default=20,
+                        help='milliseconds, default 20')
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    import_times()
+    best = None
+    for _ in range(args.repeat):
+        times = import_times()
+        if best is None or times['xform.form'][1] < best['xform.form'][1]:
+            best = times
+    for name, (own, cumulative) in best.items():
+        if name.startswith('xform'):
+            print(f'{name:<32} {own / 1e3:>8.2f} ms {cumulative / 1e3:>8.2f} '
+                  'ms cumulative')
+    total = best['xform.form'][1] / 1e3
+    print(f'{"import xform.form":<32} {total:>8.2f} ms (budget '
+          f'{args.budget:.2f} ms)')
+    failed = False
+    if total > args.budget:
+        print(f'FAIL: import time {total:.2f} ms over budget')
+        failed = True
+    eager = eager_modules()
+    if eager:
+        print(f'FAIL: imported eagerly: {", ".join(eager)}')
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
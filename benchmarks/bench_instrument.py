@@ -0,0 +1,48 @@
+'''
+Instrumentation overhead.
+
+Compare Form.dict_bind without hook against the raw `_bind` loop
+(the difference is the single hook check) and against a no-op hook.
+'''
+from xform import fields, instrument
+from xform.binding import DataBinding
+from xform.form import Form
+
+from . import abench, interleave, report
+
+
+class UserForm(Form):
+    id = fields.Integer(required=True, _min=1)
+    name = fields.Str(required=True, length=(1, 20))
+    email = fields.Email(required=False)
+    roles = fields.IntList(required=False)
+    stime = fields.Date(required=False)
+
+
+DATA = {'id': '12', 'name': 'tester', 'email': 'tester@example.com',
+        'roles': ['1', '2', '3'], 'stime': '2021-01-01'}
+
+
+def main():
+    form = UserForm()
+    fields_ = form.__fields__
+
+    def raw():
+        return form._bind(DataBinding.dict_binding(fields_, DATA))
+
+    def dict_bind():
+        return form.dict_bind(DATA)
+
+    instrument.clear_hooks()
+    base, disabled = interleave(raw, dict_bind)
+    instrument.add_hook(lambda event, span: None)
+    enabled = abench(dict_bind)
+    instrument.clear_hooks()
+    report('_bind (no hook check)', base)
+    report('dict_bind, no hook', disabled)
+    report('dict_bind, no-op hook', enabled)
+    print(f'disabled overhead: {(disabled - base) / base * 100:.2f}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+'''
+IntList with huge id lists.
+
+Validate 100k ids from a query string(str) and from JSON(int), compare
+the list mode with compact=True(array('q')) and compact='numpy' when
+numpy is installed, time per bind and memory of the returned value.
+'''
+import random
+import sys
+import tracemalloc
+
+from xform import fields
+
+from . import abench, report
+
+SIZE = 100000
+
+
+def modes():
+    yield 'list', {}
+    yield 'compact dedup=False', {'compact': True, 'dedup': False}
+    yield 'compact', {'compact': True}
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return
+    yield 'numpy', {'compact': 'numpy'}
+
+
+def value_size(value) -> int:
+    if isinstance(value, list):
+        return sys.getsizeof(value) + sum(sys.getsizeof(i) for i in value)
+    return sys.getsizeof(value)
+
+
+def main(size: int = SIZE):
+    rand = random.Random(0)
+    ids = [rand.randint(1, 10 ** 9) for _ in range(size)]
+    inputs = [('query', [str(i) for i in ids]), ('json', ids)]
+    for name, kwargs in modes():
+        field = fields.IntList(required=True, max_len=size, _min=1,
+                               **kwargs)
+        for source, value in inputs:
+            def run():
+                return field._run_validate(value, 'ids', {})
+
+            report(f'IntList {name} {source}',
+                   abench(run, number=5, repeat=3))
+            field.reset()
+            tracemalloc.start()
+            abench(run, number=1, repeat=1)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f'{"":<8}value={value_size(field.get_value()) / 1024:.0f}'
+                  f'KiB peak={peak / 1024:.0f}KiB')
+
+
+if __name__ == '__main__':
+    main()
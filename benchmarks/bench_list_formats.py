@@ -0,0 +1,78 @@
+'''
+List wire formats.
+
+Bind an IntList of 1k ids from the query string, sent as repeated keys
+(ids=1&ids=2...) or as one value with list_format csv/json/range, with
+the adapter's parsed arguments and with raw_parsing.
+'''
+import asyncio
+import json
+from types import SimpleNamespace
+from urllib.parse import parse_qs, quote
+
+from xform import fields
+from xform.adapters.tornado import TornadoRequest
+from xform.form import Form
+from xform.httputil import HttpRequest
+
+from . import abench, report
+
+SIZE = 1000
+
+
+class FakeHandler:
+    '''
+    Minimal tornado.web.RequestHandler, the query string is parsed on
+    each request like tornado does.
+    '''
+
+    def __init__(self, query: str) -> None:
+        self.request = SimpleNamespace(query=query, method='GET',
+                                       headers={}, body=b'')
+        self.locale = SimpleNamespace(code='en_US',
+                                      translate=lambda message: message)
+
+    def get_query_arguments(self, name: str) -> list:
+        return parse_qs(self.request.query).get(name, [])
+
+    def get_query_argument(self, name: str, default=None):
+        values = self.get_query_arguments(name)
+        return values[-1] if values else default
+
+
+class RawTornadoRequest(TornadoRequest):
+    raw_parsing = True
+
+
+def make_form(list_format: str = None) -> Form:
+    class IdsForm(Form):
+        ids = fields.IntList(required=True, max_len=SIZE * 2,
+                             list_format=list_format)
+    return IdsForm()
+
+
+def main(size: int = SIZE):
+    ids = list(range(1, size + 1))
+    cases = [
+        ('repeated', None, '&'.join(f'ids={i}' for i in ids)),
+        ('csv', 'csv', 'ids=' + ','.join(map(str, ids))),
+        ('json', 'json', 'ids=' + quote(json.dumps(ids))),
+        ('range', 'range', f'ids=1-{size}'),
+    ]
+    for proxy in (TornadoRequest, RawTornadoRequest):
+        HttpRequest.configure().set_request_proxy(proxy)
+        for name, list_format, query in cases:
+            form = make_form(list_format)
+            data, error = asyncio.run(form.bind(FakeHandler(query)))
+            assert not error and len(data['ids']) == size, error
+
+            async def run():
+                # a new request each time, nothing parsed yet
+                return await form.bind(FakeHandler(query))
+
+            report(f'{proxy.__name__} {name} ({len(query)} bytes)',
+                   abench(run, number=200))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+'''
+Async lookup cache with single-flight coalescing.
+
+Bursts of concurrent binds ask a fake async backend for a few ids,
+compare backend calls and elapsed time with and without the cache.
+'''
+import asyncio
+import random
+import time
+
+from xform import fields
+from xform.cache import cached_validate
+from xform.form import Form
+
+
+class FakeBackend:
+    def __init__(self, latency: float = 0.005):
+        self.latency = latency
+        self.calls = 0
+
+    async def get_user(self, uid: int):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if uid % 10 == 0:
+            return None
+        return {'uid': uid, 'name': f'user_{uid}'}
+
+
+BACKEND = FakeBackend()
+
+
+class UserField(fields.Integer):
+    cvt_type = None
+    err_msg = {'not_exist': 'User does not exist'}
+
+    async def _validate(self, value, attr, data):
+        user = await BACKEND.get_user(int(value))
+        if not user:
+            self.set_error('not_exist')
+        else:
+            return user
+
+
+class CachedUserField(UserField):
+    @cached_validate(maxsize=1024, ttl=60, negative_ttl=5)
+    async def _validate(self, value, attr, data):
+        return await super()._validate(value, attr, data)
+
+
+class UserForm(Form):
+    user = UserField(required=True)
+
+
+class CachedUserForm(Form):
+    user = CachedUserField(required=True)
+
+
+async def burst(form: Form, requests: int, ids: int):
+    rand = random.Random(0)
+    tasks = [form.dict_bind({'user': str(rand.randint(1, ids))})
+             for _ in range(requests)]
+    return await asyncio.gather(*tasks)
+
+
+def main(requests: int = 2000, ids: int = 50):
+    for form in (UserForm(), CachedUserForm()):
+        BACKEND.calls = 0
+        start = time.perf_counter()
+        asyncio.run(burst(form, requests, ids))
+        elapsed = time.perf_counter() - start
+        print(f'{form.__class__.__name__:<16} requests={requests} '
+              f'backend calls={BACKEND.calls} elapsed={elapsed:.3f}s')
+    print(CachedUserField._validate.cache.stats())
+
+
+if __name__ == '__main__':
+    main()
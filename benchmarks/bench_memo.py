@@ -0,0 +1,35 @@
+'''
+Per-value memoization of pure fields.
+
+Validate the same hot value with and without `memoize`.
+'''
+from xform import fields
+
+from . import abench, report
+
+CASES = [
+    ('Url', lambda **kw: fields.Url(**kw),
+     'https://www.example.com/path/to/page?id=1'),
+    ('IDCard', lambda **kw: fields.IDCard(**kw), '11010519491231002X'),
+    ('DateTime', lambda **kw: fields.DateTime(convert=True, **kw),
+     '2021-01-01 12:30:45'),
+    ('Order', lambda **kw: fields.Order(('id', 'time', 'name'), **kw),
+     'id asc,time desc,name'),
+    ('Jsonify', lambda **kw: fields.Jsonify(**kw),
+     '{"ids": [1, 2, 3, 4, 5], "name": "test", "tags": {"a": 1, "b": 2}}'),
+]
+
+
+def main():
+    for name, factory, value in CASES:
+        for memoize in (None, 1024):
+            field = factory(required=True, memoize=memoize)
+
+            def run():
+                return field._run_validate(value, 'field', {})
+
+            report(f'{name} memoize={memoize}', abench(run))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+'''
+Metrics overhead per bind.
+'''
+from xform import metrics
+
+from . import abench, report
+from .bench_instrument import DATA, UserForm
+
+INVALID = {'id': '0', 'name': '', 'email': 'x', 'roles': ['a']}
+
+
+def main():
+    form = UserForm()
+    registry = metrics.Registry()
+    for name, data in (('valid', DATA), ('invalid', INVALID)):
+        disabled = enabled = None
+        for _ in range(10):
+            metrics.disable()
+            value = abench(lambda: form.dict_bind(data), 5000, 1)
+            disabled = value if disabled is None else min(disabled, value)
+            metrics.enable(registry)
+            value = abench(lambda: form.dict_bind(data), 5000, 1)
+            enabled = value if enabled is None else min(enabled, value)
+        metrics.disable()
+        report(f'dict_bind {name}, metrics disabled', disabled)
+        report(f'dict_bind {name}, metrics enabled', enabled)
+        print(f'overhead: {(enabled - disabled) * 1e6:.2f} us/bind')
+
+
+if __name__ == '__main__':
+    main()
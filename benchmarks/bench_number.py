@@ -0,0 +1,49 @@
+'''
+Numeric fields.
+
+Validate Number/Integer/Float values from a query string(str) and from
+JSON(native int/float), with and without _min/_max.
+'''
+from xform import fields
+from xform.form import Form
+
+from . import abench, report
+
+CASES = [
+    ('Integer', lambda: fields.Integer(required=True), '12345', 12345),
+    ('Integer _min/_max', lambda: fields.Integer(required=True, _min=1,
+                                                 _max=100000),
+     '12345', 12345),
+    ('Float _min/_max', lambda: fields.Float(required=True, _min=0.5,
+                                             _max=1000.0),
+     '123.45', 123.45),
+    ('Number', lambda: fields.Number(required=True), '123.45', 123.45),
+]
+
+
+class PageForm(Form):
+    page = fields.Integer(required=True, _min=1)
+    size = fields.Integer(required=True, _min=1, _max=100)
+    price = fields.Float(required=True)
+    amount = fields.Number(required=True, _max=10000)
+
+
+def main():
+    for name, factory, query, native in CASES:
+        field = factory()
+        for source, value in (('query', query), ('json', native)):
+            def run():
+                return field._run_validate(value, 'field', {})
+
+            report(f'{name} {source}', abench(run))
+    form = PageForm()
+    query = {'page': '3', 'size': '20', 'price': '9.99', 'amount': '120'}
+    native = {'page': 3, 'size': 20, 'price': 9.99, 'amount': 120}
+    report('PageForm.dict_bind query',
+           abench(lambda: form.dict_bind(query)))
+    report('PageForm.dict_bind json',
+           abench(lambda: form.dict_bind(native)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+'''
+Offload CPU-heavy validation to executor.
+
+Concurrent binds of large Jsonify payloads, a heartbeat task measures
+how long the event loop is blocked(max lag) with inline and offloaded
+validation, small payloads stay inline(offload_size).
+
+json.loads holds the GIL, threads only split the blocking into shorter
+slices, processes keep the event loop free at the cost of pickling.
+'''
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from xform import fields
+from xform.form import Form
+
+PAYLOAD = json.dumps([{'id': i, 'name': f'item_{i}', 'tags': ['a', 'b']}
+                      for i in range(20000)])
+
+
+class InlineForm(Form):
+    items = fields.Jsonify(required=True)
+
+
+class ThreadForm(Form):
+    items = fields.Jsonify(required=True, executor=True, offload_size=65536)
+
+
+def process_form(executor: ProcessPoolExecutor) -> Form:
+    class ProcessForm(Form):
+        items = fields.Jsonify(required=True, executor=executor,
+                               offload_size=65536)
+    return ProcessForm()
+
+
+async def heartbeat(stop: asyncio.Event, interval: float = 0.001) -> float:
+    loop, lag = asyncio.get_event_loop(), 0.0
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(lag, loop.time() - start - interval)
+    return lag
+
+
+async def run(form: Form, requests: int):
+    stop = asyncio.Event()
+    beat = asyncio.ensure_future(heartbeat(stop))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await asyncio.gather(*[form.dict_bind({'items': PAYLOAD})
+                           for _ in range(requests)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    return elapsed, await beat
+
+
+def main(requests: int = 20):
+    print(f'payload={len(PAYLOAD)} bytes requests={requests}')
+    with ProcessPoolExecutor(4) as executor:
+        # start the workers
+        list(executor.map(abs, range(4)))
+        for form in (InlineForm(), ThreadForm(), process_form(executor)):
+            elapsed, lag = asyncio.run(run(form, requests))
+            print(f'{form.__class__.__name__:<12} elapsed={elapsed:.3f}s '
+                  f'max loop lag={lag * 1e3:.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
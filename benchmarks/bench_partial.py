@@ -0,0 +1,39 @@
+'''
+Partial and projection binds.
+
+A form of 60 fields, the request has 2 of them: bind all fields,
+partial=True, and only=(the 2 fields), through DictRequest(json body and
+query string).
+'''
+from xform import fields
+from xform.adapters.memory import DictRequest
+from xform.form import Form
+
+from . import abench, report
+
+FIELDS = 60
+
+WideForm = type('WideForm', (Form,), {
+    f'f{index}': (fields.Integer if index % 2 else fields.Str)(
+        required=False) for index in range(FIELDS)})
+
+BODY = {'f0': 'name', 'f1': '12'}
+QUERY = 'f0=name&f1=12'
+
+
+def main():
+    form = WideForm()
+    for location, request in (('json', DictRequest(body=BODY)),
+                              ('query', DictRequest(query=QUERY))):
+        for name, kwargs in (('all', {}),
+                             ('partial', {'partial': True}),
+                             ('only', {'only': ('f0', 'f1')})):
+
+            def run():
+                return form.bind(request, **kwargs)
+
+            report(f'{location} {name}', abench(run, number=5000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+'''
+Timeouts, concurrency limits and bind deadlines.
+
+A fake lookup backend that is slow for some requests(degraded), compare
+the bind latency(p50/p99) and the backend concurrency with and without
+timeout/concurrency/deadline. The guarded fields are checked to keep
+the state of concurrent binds apart first.
+'''
+import asyncio
+import random
+import time
+
+from xform import fields
+from xform.form import Form
+
+
+class FakeBackend:
+    def __init__(self, latency: float = 0.002, slow: float = 0.2,
+                 slow_rate: float = 0.05):
+        self.latency = latency
+        self.slow = slow
+        self.slow_rate = slow_rate
+        self.rand = random.Random(0)
+        self.inflight = self.peak = 0
+
+    async def get_user(self, uid: int):
+        self.inflight += 1
+        self.peak = max(self.peak, self.inflight)
+        try:
+            slow = self.rand.random() < self.slow_rate
+            await asyncio.sleep(self.slow if slow else self.latency)
+            return {'uid': uid}
+        finally:
+            self.inflight -= 1
+
+
+BACKEND = FakeBackend()
+
+
+class UserField(fields.Integer):
+    cvt_type = None
+
+    async def _validate(self, value, attr, data):
+        return await BACKEND.get_user(int(value))
+
+
+class UserForm(Form):
+    user = UserField(required=True)
+    name = fields.Str(required=True)
+
+
+class GuardedUserForm(Form):
+    user = UserField(required=True, timeout=0.02, concurrency=50)
+    name = fields.Str(required=True)
+
+
+class TimeoutNameForm(Form):
+    name = fields.Str(required=True, timeout=1.0)
+
+
+async def check_concurrent_binds(requests: int = 5):
+    '''
+    Concurrent binds of a guarded(timeout=) field get their own values.
+    '''
+    form = TimeoutNameForm()
+    result = await asyncio.gather(*[form.dict_bind({'name': f'v{i}'})
+                                    for i in range(requests)])
+    for i, (data, err) in enumerate(result):
+        assert not err and data == {'name': f'v{i}'}, (i, data, err)
+
+
+def percentile(values: list, percent: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent))]
+
+
+async def burst(form: Form, requests: int, deadline: float = None):
+    async def one(i):
+        start = time.perf_counter()
+        _, err = await form.dict_bind({'user': str(i), 'name': 'test'},
+                                      deadline=deadline)
+        return time.perf_counter() - start, bool(err)
+
+    return await asyncio.gather(*[one(i) for i in range(requests)])
+
+
+def main(requests: int = 200):
+    asyncio.run(check_concurrent_binds())
+    cases = [('no limit', UserForm(), None),
+             ('timeout=0.02 concurrency=50', GuardedUserForm(), None),
+             ('deadline=0.02', UserForm(), 0.02)]
+    for name, form, deadline in cases:
+        BACKEND.rand.seed(0)
+        BACKEND.peak = 0
+        result = asyncio.run(burst(form, requests, deadline))
+        elapsed = [item[0] for item in result]
+        errors = sum(item[1] for item in result)
+        print(f'{name:<28} p50={percentile(elapsed, 0.5) * 1e3:7.2f}ms '
+              f'p99={percentile(elapsed, 0.99) * 1e3:7.2f}ms '
+              f'max={max(elapsed) * 1e3:7.2f}ms timeouts={errors} '
+              f'backend peak={BACKEND.peak}')
+
+
+if __name__ == '__main__':
+    main()
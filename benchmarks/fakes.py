@@ -0,0 +1,168 @@
+'''
+In-memory requests of the supported web frameworks.
+
+Only the attributes read by the xform adapters are emulated, the query
+string/body is parsed once when the fake request is created, like the
+frameworks do before the handler runs, so binds measure xform itself.
+
+usage::
+
+    proxy, request = make_request('aiohttp', 'POST', body='{"id": 1}',
+                                  content_type='application/json')
+    HttpRequest.configure().set_request_proxy(proxy)
+    data, error = await form.bind(request)
+'''
+from types import SimpleNamespace
+from typing import Any, Tuple
+from urllib.parse import parse_qs
+
+from multidict import MultiDict
+
+from xform.adapters.aiohttp import AioHttpRequest
+from xform.adapters.flask import FlaskRequest
+from xform.adapters.sanic import SanicRequest
+from xform.adapters.tornado import TornadoRequest
+
+__all__ = ['FRAMEWORKS', 'make_request']
+
+MIME_FORM = 'application/x-www-form-urlencoded'
+
+
+def _parse(qs: str) -> dict:
+    return parse_qs(qs, keep_blank_values=True)
+
+
+class _Params(dict):
+    '''
+    sanic RequestParameters/werkzeug MultiDict, {key: [value, ...]}
+    '''
+
+    def get(self, name: str, default: Any = None) -> Any:
+        values = super().get(name)
+        return values[0] if values else default
+
+    def getlist(self, name: str, default: Any = None) -> list:
+        return super().get(name) or (default if default is not None else [])
+
+
+class FakeTornadoHandler:
+    '''
+    tornado.web.RequestHandler
+    '''
+
+    def __init__(self, method: str, query: str, body: bytes,
+                 headers: dict) -> None:
+        self.request = SimpleNamespace(method=method, query=query,
+                                       body=body, headers=headers)
+        self.locale = SimpleNamespace(code='en_US',
+                                      translate=lambda message: message)
+        self._query = _parse(query)
+        form = headers.get('Content-Type', '').startswith(MIME_FORM)
+        self._body = _parse(body.decode()) if form else {}
+
+    def get_query_arguments(self, name: str) -> list:
+        return self._query.get(name, [])
+
+    def get_query_argument(self, name: str, default: Any = None) -> Any:
+        values = self.get_query_arguments(name)
+        return values[-1] if values else default
+
+    def get_arguments(self, name: str) -> list:
+        return self._body.get(name, []) + self._query.get(name, [])
+
+    def get_argument(self, name: str, default: Any = None) -> Any:
+        values = self.get_arguments(name)
+        return values[-1] if values else default
+
+    def get_cookie(self, name: str, default: Any = None) -> Any:
+        return default
+
+
+class FakeAioHttpRequest:
+    '''
+    aiohttp.web.Request
+    '''
+
+    def __init__(self, method: str, query: str, body: bytes,
+                 headers: dict) -> None:
+        self.method = method
+        self.query_string = query
+        self.headers = headers
+        self.query = MultiDict((key, value) for key, values in
+                               _parse(query).items() for value in values)
+        self._body = body
+        form = headers.get('Content-Type', '').startswith(MIME_FORM)
+        self._post = MultiDict(
+            (key, value) for key, values in
+            _parse(body.decode()).items() for value in values) \
+            if form else MultiDict()
+
+    async def post(self) -> MultiDict:
+        return self._post
+
+    async def text(self) -> str:
+        return self._body.decode()
+
+
+class FakeSanicRequest:
+    '''
+    sanic.request.Request
+    '''
+
+    def __init__(self, method: str, query: str, body: bytes,
+                 headers: dict) -> None:
+        self.method = method
+        self.query_string = query
+        self.headers = headers
+        self.cookies = {}
+        self.body = body
+        self.args = _Params(_parse(query))
+        form = headers.get('Content-Type', '').startswith(MIME_FORM)
+        self.form = _Params(_parse(body.decode()) if form else {})
+
+
+class FakeFlaskRequest:
+    '''
+    flask.Request
+    '''
+
+    def __init__(self, method: str, query: str, body: bytes,
+                 headers: dict) -> None:
+        self.method = method
+        self.query_string = query.encode()
+        self.headers = headers
+        self.cookies = {}
+        self._body = body
+        self.args = _Params(_parse(query))
+        form = headers.get('Content-Type', '').startswith(MIME_FORM)
+        self.form = _Params(_parse(body.decode()) if form else {})
+
+    def get_data(self, cache: bool = True, as_text: bool = False) -> Any:
+        return self._body.decode() if as_text else self._body
+
+
+# {name: (adapter, fake request)}
+FRAMEWORKS = {
+    'tornado': (TornadoRequest, FakeTornadoHandler),
+    'aiohttp': (AioHttpRequest, FakeAioHttpRequest),
+    'sanic': (SanicRequest, FakeSanicRequest),
+    'flask': (FlaskRequest, FakeFlaskRequest)
+}
+
+
+def make_request(framework: str,
+                 method: str = 'GET',
+                 query: str = '',
+                 body: str = '',
+                 content_type: str = None) -> Tuple[type, Any]:
+    '''
+    :param framework: `<str>` tornado/aiohttp/sanic/flask
+    :param method: `<str>` GET/POST...
+    :param query: `<str>` query string without '?'
+    :param body: `<str>` request body
+    :param content_type: `<str>` Content-Type header
+    :return: `<tuple>` (adapter class, fake request)
+    '''
+    proxy, fake = FRAMEWORKS[framework]
+    headers = {'Content-Type': content_type} if content_type else {}
+    return proxy, fake(method, query, body.encode(), headers)
@@ -0,0 +1,349 @@
+'''
+End-to-end load harness.
+
+Each framework server(benchmarks.load_server) is started on localhost
+and driven by keep-alive HTTP/1.1 connections with a seeded payload mix
+(generated from the form by xform.payloads),
+the report has the throughput, p50/p95/p99 latency, the time of
+Form.bind per request(measured by the server) and its share of the
+run's wall time.
+
+usage::
+
+    python -m benchmarks.load --frameworks raw,tornado,aiohttp \\
+        --concurrency 32 --requests 20000 \\
+        --mix valid=70,invalid=20,nested=5,large_list=5 --save load.json
+    # regression check of p50/p99/mean/xform per request, exit 1 if
+    # slower than the threshold
+    python -m benchmarks.load --baseline load.json --threshold 10
+    # or compare two saved reports
+    python -m benchmarks.suite compare load.json current.json
+
+Frameworks which are not installed are skipped. The client runs in one
+process, when it saturates a CPU use a lower --concurrency or compare
+the same machine only.
+'''
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from xform.payloads import PayloadGenerator
+
+from .load_server import FRAMEWORKS, LoadForm
+from .suite import compare, load
+
+PAYLOADS = ('valid', 'invalid', 'nested', 'large_list')
+DEFAULT_MIX = 'valid=70,invalid=20,nested=5,large_list=5'
+
+
+def make_payloads(list_size: int = 1000, variants: int = 64,
+                  seed: int = 0) -> Dict[str, List[Tuple[bytes, int]]]:
+    '''
+    Payloads of LoadForm by xform.payloads, valid/invalid(one broken
+    field) are sent as query string, nested/large_list as JSON body.
+
+    :param variants: `<int>` distinct requests of each payload
+    :return: `<dict>` {name: [(raw request, expected status)]}
+    '''
+    def get(query: str) -> bytes:
+        return (f'GET /?{query} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n'
+                .encode())
+
+    def post(body: str) -> bytes:
+        body = body.encode()
+        return (f'POST / HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+                f'Content-Type: application/json\r\n'
+                f'Content-Length: {len(body)}\r\n\r\n').encode() + body
+
+    # too_long_error of ids exceeds the request line limits of servers
+    flat = PayloadGenerator(LoadForm, seed=seed, list_size=(0, 3),
+                            errors=('required', 'length', 'invalid',
+                                    'min_invalid', 'max_invalid'))
+    nested = PayloadGenerator(LoadForm, seed=seed, optional=1.0)
+    large = PayloadGenerator(LoadForm, seed=seed, optional=1.0,
+                             list_size=list_size)
+    return {
+        'valid': [(get(flat.encode(flat.valid().data, 'query')), 200)
+                  for _ in range(variants)],
+        'invalid': [(get(flat.encode(flat.invalid().data, 'query')), 400)
+                    for _ in range(variants)],
+        'nested': [(post(nested.encode(nested.valid().data)), 200)
+                   for _ in range(variants)],
+        'large_list': [(post(large.encode(large.valid().data)), 200)
+                       for _ in range(variants)]
+    }
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    weights = {}
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        if name not in PAYLOADS:
+            raise ValueError(f'unknown payload {name}, use {PAYLOADS}')
+        weights[name] = int(weight or 1)
+    return weights
+
+
+def schedule(weights: Dict[str, int], number: int, seed: int) -> List[str]:
+    '''
+    :return: `<list>` payload names, the same for the same seed
+    '''
+    rand = random.Random(seed)
+    names = list(weights)
+    return rand.choices(names, [weights[name] for name in names], k=number)
+
+
+def percentile(values: List[float], percent: float) -> float:
+    '''
+    Nearest-rank percentile of sorted values.
+    '''
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1,
+                       int(round(percent / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+class Connection:
+    '''
+    Keep-alive HTTP/1.1 connection, reconnects when the server closes.
+    '''
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, raw: bytes) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                '127.0.0.1', self.port)
+        self.writer.write(raw)
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        version, status = lines[0].split(' ', 2)[:2]
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                key, _, value = line.partition(':')
+                headers[key.strip().lower()] = value.strip()
+        length = headers.get('content-length')
+        if length is not None:
+            await self.reader.readexactly(int(length))
+        else:
+            await self.reader.read()
+        if length is None or version == 'HTTP/1.0' or \
+                headers.get('connection', '').lower() == 'close':
+            self.close()
+        return int(status)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def drive(port: int, names: List[str],
+                payloads: Dict[str, List[Tuple[bytes, int]]],
+                concurrency: int) -> Tuple[List[float], int, float]:
+    '''
+    :return: `<tuple>` (sorted latencies, unexpected status count, seconds)
+    '''
+    latencies, unexpected = [], 0
+    queue = enumerate(names)
+
+    async def worker():
+        nonlocal unexpected
+        conn = Connection(port)
+        try:
+            for index, name in queue:
+                pool = payloads[name]
+                raw, expected = pool[index % len(pool)]
+                start = time.perf_counter()
+                status = await conn.request(raw)
+                latencies.append(time.perf_counter() - start)
+                if status != expected:
+                    unexpected += 1
+        finally:
+            conn.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    return sorted(latencies), unexpected, elapsed
+
+
+def _stats(port: int) -> dict:
+    with socket.create_connection(('127.0.0.1', port), timeout=5) as sock:
+        sock.sendall(b'GET /_stats HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+                     b'Connection: close\r\n\r\n')
+        data = b''
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+            head, sep, body = data.partition(b'\r\n\r\n')
+            if sep and body.rstrip().endswith(b'}'):
+                break
+    return json.loads(data.partition(b'\r\n\r\n')[2])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(framework: str, timeout: float = 30) -> tuple:
+    '''
+    :return: `<tuple>` (process, port)
+    '''
+    port = _free_port()
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.getcwd(),
+                                         env.get('PYTHONPATH', '')])
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.load_server', framework,
+         '--port', str(port)], env=env, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{framework} server exited '
+                               f'{process.returncode}')
+        try:
+            _stats(port)
+            return process, port
+        except (OSError, ValueError):
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f'{framework} server did not start in {timeout}s')
+
+
+def installed(framework: str) -> bool:
+    return framework == 'raw' or importlib.util.find_spec(framework) \
+        is not None
+
+
+def run_framework(framework: str, names: List[str], warmup: List[str],
+                  payloads: dict, concurrency: int) -> dict:
+    process, port = start_server(framework)
+    try:
+        asyncio.run(drive(port, warmup, payloads, concurrency))
+        before = _stats(port)
+        latencies, unexpected, elapsed = asyncio.run(
+            drive(port, names, payloads, concurrency))
+        after = _stats(port)
+    finally:
+        process.terminate()
+        process.wait(10)
+    binds = after['binds'] - before['binds']
+    xform = after['seconds'] - before['seconds']
+    total = sum(latencies)
+    return {
+        'requests': len(latencies),
+        'unexpected_status': unexpected,
+        'rps': len(latencies) / elapsed,
+        'mean': total / len(latencies),
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'xform_per_request': xform / binds if binds else 0.0,
+        # one server process serves the requests, the share of its time
+        'xform_share': xform / elapsed
+    }
+
+
+def report(results: Dict[str, dict]) -> None:
+    print(f'{"framework":<10} {"rps":>9} {"p50 ms":>8} {"p95 ms":>8} '
+          f'{"p99 ms":>8} {"xform us":>9} {"xform %":>8} {"bad":>5}')
+    for framework, row in results.items():
+        print(f'{framework:<10} {row["rps"]:>9.0f} {row["p50"] * 1e3:>8.2f} '
+              f'{row["p95"] * 1e3:>8.2f} {row["p99"] * 1e3:>8.2f} '
+              f'{row["xform_per_request"] * 1e6:>9.1f} '
+              f'{row["xform_share"] * 100:>7.1f}% '
+              f'{row["unexpected_status"]:>5}')
+
+
+def save(path: str, config: dict, results: Dict[str, dict]) -> None:
+    '''
+    Save the report, "results" holds the seconds of each framework
+    metric(lower is better) so it can be compared by benchmarks.suite.
+    '''
+    flat = {}
+    for framework, row in results.items():
+        for metric in ('p50', 'p99', 'mean', 'xform_per_request'):
+            flat[f'load.{framework} {metric}'] = row[metric]
+    data = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config,
+        'frameworks': results,
+        'results': flat
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.load')
+    parser.add_argument('--frameworks', default=','.join(FRAMEWORKS))
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--warmup', type=int, default=1000)
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help=f'payload weights, default {DEFAULT_MIX}')
+    parser.add_argument('--list-size', type=int, default=1000,
+                        help='ids of the large_list payload')
+    parser.add_argument('--variants', type=int, default=64,
+                        help='distinct requests of each payload')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help='write the report to a JSON file')
+    parser.add_argument('--baseline',
+                        help='compare with a saved report, exit 1 on '
+                             'regressions')
+    parser.add_argument('--threshold', type=float, default=10,
+                        help='percent, default 10')
+    args = parser.parse_args(argv)
+
+    weights = parse_mix(args.mix)
+    payloads = make_payloads(args.list_size, args.variants, args.seed)
+    names = schedule(weights, args.requests, args.seed)
+    warmup = schedule(weights, args.warmup, args.seed + 1)
+    config = {key: getattr(args, key) for key in
+              ('concurrency', 'requests', 'warmup', 'list_size',
+               'variants', 'seed')}
+    config['mix'] = weights
+
+    results = {}
+    for framework in args.frameworks.split(','):
+        if framework not in FRAMEWORKS:
+            parser.error(f'unknown framework {framework}')
+        if not installed(framework):
+            print(f'{framework} is not installed, skipped')
+            continue
+        results[framework] = run_framework(framework, names, warmup,
+                                           payloads, args.concurrency)
+    report(results)
+    if args.save:
+        save(args.save, config, results)
+    if args.baseline:
+        flat = {f'load.{framework} {metric}': row[metric]
+                for framework, row in results.items()
+                for metric in ('p50', 'p99', 'mean', 'xform_per_request')}
+        if compare(load(args.baseline), flat, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
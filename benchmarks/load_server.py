@@ -0,0 +1,217 @@
+'''
+Servers of the load harness(see benchmarks.load).
+
+The same form is served by each framework on 127.0.0.1, `/` binds the
+request(200 data, 400 error), `/_stats` returns the number of binds and
+the seconds spent in xform(instrument observer).
+
+    python -m benchmarks.load_server tornado --port 8901
+
+`raw` is a minimal asyncio HTTP/1.1 server binding DictRequest, the
+baseline without framework overhead.
+'''
+import argparse
+import asyncio
+import json
+import logging
+import threading
+from urllib.parse import urlsplit
+
+from xform import fields, instrument
+from xform.form import Form
+from xform.httputil import HttpRequest
+from xform.validate import OneOf
+
+FRAMEWORKS = ('raw', 'tornado', 'aiohttp', 'sanic', 'flask')
+LIST_MAX = 10000
+
+
+class UserSchema(Form):
+    uid = fields.Integer(required=True)
+    name = fields.Username(required=True, length=(4, 20))
+
+
+class LoadForm(Form):
+    id = fields.Integer(required=True, _min=1)
+    name = fields.Str(required=False, length=(1, 32))
+    email = fields.Email(required=False)
+    status = fields.Integer(required=False, default=1,
+                            validate=OneOf((1, 2)))
+    stime = fields.StartDate(required=False)
+    etime = fields.EndedDate('stime', required=False)
+    user = fields.Nested(UserSchema, required=False)
+    ids = fields.IntList(required=False, max_len=LIST_MAX)
+
+
+class BindTimer(instrument.Observer):
+    '''
+    Seconds spent in Form.bind, requests are served on one thread except
+    flask(threaded), the counters are updated under a lock.
+    '''
+
+    def __init__(self) -> None:
+        self.binds = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def bind(self, form, elapsed: float, error: dict, keys: dict) -> None:
+        with self._lock:
+            self.binds += 1
+            self.seconds += elapsed
+
+    def stats(self) -> str:
+        return json.dumps({'binds': self.binds, 'seconds': self.seconds})
+
+
+form = LoadForm()
+timer = BindTimer()
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=str)
+
+
+def run_raw(port: int) -> None:
+    from xform.adapters.memory import DictRequest
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                await _respond(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(reader, writer):
+        head = await reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        method, target, _ = lines[0].split(' ', 2)
+        headers = dict(line.split(': ', 1) for line in lines[1:] if line)
+        length = int(headers.get('Content-Length', 0))
+        body = (await reader.readexactly(length)).decode() \
+            if length else None
+        url = urlsplit(target)
+        if url.path == '/_stats':
+            status, text = 200, timer.stats()
+        else:
+            request = DictRequest(query=url.query, headers=headers,
+                                  body=body, method=method)
+            data, error = await form.bind(request)
+            status, text = (400, _dumps(error)) if error \
+                else (200, _dumps(data))
+        payload = text.encode()
+        writer.write(
+            f'HTTP/1.1 {status} OK\r\nContent-Type: application/json'
+            f'\r\nContent-Length: {len(payload)}\r\n\r\n'.encode() + payload)
+        await writer.drain()
+
+    async def serve():
+        server = await asyncio.start_server(handle, '127.0.0.1', port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+def run_tornado(port: int) -> None:
+    import tornado.ioloop
+    import tornado.web
+
+    class BindHandler(tornado.web.RequestHandler):
+        async def get(self):
+            data, error = await form.bind(self)
+            self.set_status(400 if error else 200)
+            self.write(_dumps(error or data))
+
+        post = get
+
+    class StatsHandler(tornado.web.RequestHandler):
+        def get(self):
+            self.write(timer.stats())
+
+    app = tornado.web.Application([(r'/', BindHandler),
+                                   (r'/_stats', StatsHandler)])
+    app.listen(port, address='127.0.0.1')
+    tornado.ioloop.IOLoop.current().start()
+
+
+def run_aiohttp(port: int) -> None:
+    from aiohttp import web
+    from xform.adapters.aiohttp import AioHttpRequest
+    HttpRequest.configure().set_request_proxy(AioHttpRequest)
+
+    async def bind(request):
+        data, error = await form.bind(request)
+        return web.Response(text=_dumps(error or data),
+                            status=400 if error else 200,
+                            content_type='application/json')
+
+    async def stats(request):
+        return web.Response(text=timer.stats(),
+                            content_type='application/json')
+
+    app = web.Application()
+    app.add_routes([web.get('/', bind), web.post('/', bind),
+                    web.get('/_stats', stats)])
+    web.run_app(app, host='127.0.0.1', port=port, access_log=None,
+                print=None)
+
+
+def run_sanic(port: int) -> None:
+    from sanic import Sanic
+    from sanic.response import text
+    from xform.adapters.sanic import SanicRequest
+    HttpRequest.configure().set_request_proxy(SanicRequest)
+    app = Sanic('xform_load')
+
+    @app.route('/', methods=['GET', 'POST'])
+    async def bind(request):
+        data, error = await form.bind(request)
+        return text(_dumps(error or data), status=400 if error else 200,
+                    content_type='application/json')
+
+    @app.route('/_stats')
+    async def stats(request):
+        return text(timer.stats(), content_type='application/json')
+
+    app.run(host='127.0.0.1', port=port, access_log=False)
+
+
+def run_flask(port: int) -> None:
+    from flask import Flask, Response, request
+    from xform.adapters.flask import FlaskRequest
+    HttpRequest.configure().set_request_proxy(FlaskRequest)
+    app = Flask('xform_load')
+    # no access log
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    local = threading.local()
+
+    @app.route('/', methods=['GET', 'POST'])
+    def bind():
+        # one event loop per server thread
+        loop = getattr(local, 'loop', None)
+        if loop is None:
+            loop = local.loop = asyncio.new_event_loop()
+        data, error = loop.run_until_complete(form.bind(request))
+        return Response(_dumps(error or data), status=400 if error else 200,
+                        content_type='application/json')
+
+    @app.route('/_stats')
+    def stats():
+        return Response(timer.stats(), content_type='application/json')
+
+    app.run(host='127.0.0.1', port=port, threaded=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.load_server')
+    parser.add_argument('framework', choices=FRAMEWORKS)
+    parser.add_argument('--port', type=int, default=8901)
+    args = parser.parse_args()
+    instrument.set_observer(timer)
+    globals()[f'run_{args.framework}'](args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+'''
+Benchmark suite with stored baselines.
+
+The cases of SUITES(every field type, dict_bind, nested schemas, large
+lists, error heavy inputs, Form.bind through each adapter) are run and
+saved as JSON, compare flags the cases slower than the baseline by more
+than the threshold(exit status 1).
+
+usage::
+
+    python -m benchmarks.suite run --save baseline.json
+    # ... change xform ...
+    python -m benchmarks.suite compare baseline.json --threshold 10
+    # or compare two saved runs
+    python -m benchmarks.suite run --save current.json
+    python -m benchmarks.suite compare baseline.json current.json
+'''
+import argparse
+import datetime
+import importlib
+import json
+import platform
+import sys
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+from . import abench, bench, report
+
+SUITES = ('benchmarks.suite_fields', 'benchmarks.suite_forms')
+
+'''
+name: unique case name, e.g: fields.Integer valid
+func: callable, return awaitable if is_async
+number: calls per measurement
+setup: callable run before the measurement, e.g: set the request proxy
+'''
+Case = namedtuple('Case', 'name func is_async number setup',
+                  defaults=(True, 2000, None))
+
+
+def collect(pattern: str = None) -> List[Case]:
+    '''
+    :param pattern: `<str>` only the cases whose name contains pattern
+    :return: `<list>` cases of SUITES
+    '''
+    cases = []
+    for module in SUITES:
+        cases.extend(importlib.import_module(module).cases())
+    names = [case.name for case in cases]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f'duplicate cases: {", ".join(sorted(duplicates))}')
+    if pattern:
+        cases = [case for case in cases if pattern in case.name]
+    return cases
+
+
+def run(cases: List[Case], repeat: int = 5, scale: float = 1,
+        verbose: bool = True) -> Dict[str, float]:
+    '''
+    :param scale: `<float>` multiply the number of calls, e.g: 0.1 quick
+    :return: `<dict>` {name: best seconds per call}
+    '''
+    results = {}
+    for case in cases:
+        if case.setup is not None:
+            case.setup()
+        number = max(1, int(case.number * scale))
+        measure = abench if case.is_async else bench
+        results[case.name] = measure(case.func, number=number, repeat=repeat)
+        if verbose:
+            report(case.name, results[case.name])
+    return results
+
+
+def save(path: str, results: Dict[str, float]) -> None:
+    data = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, float]:
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(baseline: Dict[str, float], current: Dict[str, float],
+            threshold: float = 10) -> List[str]:
+    '''
+    Print the changes of every case.
+
+    :param threshold: `<float>` percent, slower than this is a regression
+    :return: `<list>` regressed case names
+    '''
+    regressions = []
+    print(f'{"case":<48} {"baseline":>10} {"current":>10} {"change":>8}')
+    for name in sorted(set(baseline) | set(current)):
+        if name not in current or name not in baseline:
+            state = 'removed' if name not in current else 'new'
+            print(f'{name:<48} {state:>30}')
+            continue
+        base, now = baseline[name], current[name]
+        change = (now - base) / base * 100 if base else 0.0
+        flag = ''
+        if change > threshold:
+            flag = ' REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            flag = ' faster'
+        print(f'{name:<48} {base * 1e6:>8.2f}us {now * 1e6:>8.2f}us '
+              f'{change:>+7.1f}%{flag}')
+    return regressions
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_cmd = commands.add_parser('run', help='run the suite')
+    run_cmd.add_argument('--save', help='write the results to a JSON file')
+    compare_cmd = commands.add_parser(
+        'compare', help='compare with a baseline, exit 1 on regressions')
+    compare_cmd.add_argument('baseline', help='baseline JSON file')
+    compare_cmd.add_argument('current', nargs='?',
+                             help='JSON file of another run, default run '
+                                  'the suite now')
+    compare_cmd.add_argument('--threshold', type=float, default=10,
+                             help='percent, default 10')
+    for cmd in (run_cmd, compare_cmd):
+        cmd.add_argument('-k', dest='pattern',
+                         help='only the cases whose name contains it')
+        cmd.add_argument('--repeat', type=int, default=5)
+        cmd.add_argument('--quick', action='store_true',
+                         help='10x fewer calls, noisy')
+    args = parser.parse_args(argv)
+
+    scale = 0.1 if args.quick else 1
+    if args.command == 'run':
+        results = run(collect(args.pattern), args.repeat, scale)
+        if args.save:
+            save(args.save, results)
+        return 0
+    baseline = load(args.baseline)
+    if args.current:
+        current = load(args.current)
+    else:
+        cases = [case for case in collect(args.pattern)
+                 if case.name in baseline]
+        current = run(cases, args.repeat, scale, verbose=False)
+    if args.pattern:
+        baseline = {name: value for name, value in baseline.items()
+                    if args.pattern in name}
+        current = {name: value for name, value in current.items()
+                   if args.pattern in name}
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f'{len(regressions)} regression(s) over {args.threshold}%')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
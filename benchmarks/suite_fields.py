@@ -0,0 +1,104 @@
+'''
+Suite cases: validation of every field type of xform.fields, with a
+valid and an invalid value.
+'''
+import asyncio
+from typing import List
+
+from xform import fields
+from xform.form import Form
+
+from .suite import Case
+
+
+class PointSchema(Form):
+    x = fields.Integer(required=True)
+    y = fields.Integer(required=True)
+
+
+START = {'start': '2021-01-01'}
+
+# (name, field, valid value, invalid value, data)
+FIELDS = [
+    ('Field', lambda: fields.Field(required=True), 'abc', None, None),
+    ('Number', lambda: fields.Number(required=True), '12', '12x', None),
+    ('Integer', lambda: fields.Integer(required=True, _min=1), '12', '0',
+     None),
+    ('Float', lambda: fields.Float(required=True), '12.5', 'x', None),
+    ('Str', lambda: fields.Str(required=True, length=(1, 16)), 'tester',
+     'x' * 17, None),
+    ('EnStr', lambda: fields.EnStr(required=True), 'tester', 'tester1',
+     None),
+    ('Raw', lambda: fields.Raw(required=True), 'raw', None, None),
+    ('Nested', lambda: fields.Nested(PointSchema, required=True),
+     {'x': '1', 'y': '2'}, {'x': 'a'}, None),
+    ('List', lambda: fields.List(required=True), ['a', 'b', 'c'], [], None),
+    ('IntList', lambda: fields.IntList(required=True), ['1', '2', '3'],
+     ['1', 'x'], None),
+    ('Boolean', lambda: fields.Boolean(required=True), 'true', 'maybe',
+     None),
+    ('Timestamp', lambda: fields.Timestamp(required=True), '1609459200',
+     '16094592x', None),
+    ('DateTime', lambda: fields.DateTime(required=True),
+     '2021-01-01 12:30:45', '2021-13-01 12:30:45', None),
+    ('Date', lambda: fields.Date(required=True), '2021-01-01', '2021-1-1',
+     None),
+    ('StartDate', lambda: fields.StartDate(required=True), '2021-01-01',
+     '2021-02-30', None),
+    ('EndedDate', lambda: fields.EndedDate('start', required=True),
+     '2021-02-01', '2020-12-31', START),
+    ('Time', lambda: fields.Time(required=True), '1609459200', '16x',
+     None),
+    ('Url', lambda: fields.Url(required=True),
+     'https://example.com/path?q=1', 'gopher://example.com', None),
+    ('Email', lambda: fields.Email(required=True), 'tester@example.com',
+     'tester@', None),
+    ('Phone', lambda: fields.Phone(required=True), '13800138000',
+     '12800138000', None),
+    ('IDCard', lambda: fields.IDCard(required=True), '110101199003074514',
+     '000000199003074514', None),
+    ('Username', lambda: fields.Username(required=True), 'tester_1',
+     '1tester', None),
+    ('Password', lambda: fields.Password(required=True, length=(6, 32)),
+     'secret_123', 'secret 123', None),
+    ('Order', lambda: fields.Order(['id', 'time'], required=True),
+     'id asc,time', 'name desc', None),
+    ('IpAddr', lambda: fields.IpAddr(required=True), '192.168.1.1',
+     '192.168.1.256', None),
+    ('Jsonify', lambda: fields.Jsonify(required=True), '{"a": [1, 2]}',
+     '{"a": ', None),
+]
+
+
+def _check_coverage() -> None:
+    covered = {name for name, *_ in FIELDS}
+    missing = [name for name in fields.__all__
+               if isinstance(getattr(fields, name), type)
+               and issubclass(getattr(fields, name), fields.Field)
+               and name not in covered]
+    if missing:
+        raise ValueError(f'fields without suite cases: {", ".join(missing)}')
+
+
+def _make_case(name: str, field: fields.Field, value, data: dict) -> Case:
+    data = data or {}
+
+    def func():
+        return field._run_validate(value, 'f', data)
+    return Case(name, func)
+
+
+def cases() -> List[Case]:
+    _check_coverage()
+    result = []
+    for name, factory, valid, invalid, data in FIELDS:
+        for state, value, expected in (('valid', valid, True),
+                                       ('invalid', invalid, False)):
+            field = factory()
+            checked = asyncio.run(field._run_validate(value, 'f',
+                                                      data or {}))
+            if checked.is_valid is not expected:
+                raise ValueError(f'{name} {value!r} should be {state}')
+            result.append(_make_case(f'fields.{name} {state}', field,
+                                     value, data))
+    return result
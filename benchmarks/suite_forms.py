@@ -0,0 +1,183 @@
+'''
+Suite cases: forms, dict_bind(valid, error heavy, fail fast, nested
+schemas, large lists, payload mixes generated by xform.payloads) and
+Form.bind through each adapter with in-memory requests(see
+benchmarks.fakes), and with DictRequest/AsyncDictRequest which have no
+adapter overhead.
+'''
+import asyncio
+import itertools
+import json
+from typing import List
+from urllib.parse import urlencode
+
+from xform import fields
+from xform.adapters.memory import AsyncDictRequest, DictRequest
+from xform.form import Form
+from xform.httputil import HttpRequest
+from xform.payloads import PayloadGenerator
+
+from .fakes import FRAMEWORKS, make_request
+from .suite import Case
+
+MIME_JSON = 'application/json'
+MIME_FORM = 'application/x-www-form-urlencoded'
+LIST_SIZE = 1000
+
+
+class UserForm(Form):
+    id = fields.Integer(required=True, _min=1)
+    name = fields.Str(required=True, length=(1, 20))
+    email = fields.Email(required=False)
+    age = fields.Integer(required=False, _min=0, _max=150)
+    active = fields.Boolean(required=False, default=True)
+    roles = fields.IntList(required=False)
+    stime = fields.StartDate(required=False)
+    etime = fields.EndedDate('stime', required=False)
+
+
+class FailFastUserForm(UserForm):
+    __fail_fast__ = True
+
+
+USER = {'id': '12', 'name': 'tester', 'email': 'tester@example.com',
+        'age': '20', 'active': 'true', 'roles': ['1', '2', '3'],
+        'stime': '2021-01-01', 'etime': '2021-02-01'}
+# every field is invalid
+USER_ERRORS = {'id': '0', 'name': 'x' * 21, 'email': 'tester@',
+               'age': '151', 'active': 'maybe', 'roles': ['1', 'x'],
+               'stime': '2021-13-01', 'etime': '2020-12-31'}
+
+
+class AddressSchema(Form):
+    city = fields.Str(required=True)
+    zipcode = fields.Str(required=True, length=6)
+
+
+class ProfileSchema(Form):
+    nickname = fields.Str(required=True)
+    address = fields.Nested(AddressSchema, required=True)
+
+
+class AccountForm(Form):
+    id = fields.Integer(required=True)
+    profile = fields.Nested(ProfileSchema, required=True)
+
+
+ACCOUNT = {'id': '1', 'profile': {'nickname': 'tester', 'address': {
+    'city': 'shenzhen', 'zipcode': '518000'}}}
+
+
+class ListForm(Form):
+    ids = fields.IntList(required=True, max_len=LIST_SIZE)
+    tags = fields.List(required=True, max_len=LIST_SIZE)
+
+
+class CompactListForm(Form):
+    ids = fields.IntList(required=True, max_len=LIST_SIZE, compact=True)
+
+
+IDS = [str(i) for i in range(1, LIST_SIZE + 1)]
+LISTS = {'ids': IDS, 'tags': [f'tag{i}' for i in range(LIST_SIZE)]}
+
+# flat values of UserForm for query/form bodies
+USER_QUERY = urlencode([(key, value) for key, values in USER.items()
+                        for value in (values if isinstance(values, list)
+                                      else [values])])
+
+
+def _dict_case(name: str, form: Form, data: dict, valid: bool,
+               number: int = 2000) -> Case:
+    _, error = asyncio.run(form.dict_bind(data))
+    if bool(error) is valid:
+        raise ValueError(f'{name}: unexpected errors {error}')
+
+    def func():
+        return form.dict_bind(data)
+    return Case(name, func, number=number)
+
+
+def _generated_case(name: str, form: Form, invalid: float,
+                    size: int = 200) -> Case:
+    '''
+    dict_bind over distinct generated payloads, `invalid` share has one
+    broken field.
+    '''
+    gen = PayloadGenerator(form, seed=0)
+    payloads = itertools.cycle(
+        [payload.data for payload in gen.stream(size, invalid=invalid)])
+
+    def func():
+        return form.dict_bind(next(payloads))
+    return Case(name, func)
+
+
+def _bind_case(framework: str, location: str) -> Case:
+    if location == 'query':
+        proxy, request = make_request(framework, 'GET', query=USER_QUERY)
+    elif location == 'form':
+        proxy, request = make_request(framework, 'POST', body=USER_QUERY,
+                                      content_type=MIME_FORM)
+    else:
+        proxy, request = make_request(framework, 'POST',
+                                      body=json.dumps(USER),
+                                      content_type=MIME_JSON)
+    form = UserForm()
+
+    def setup():
+        HttpRequest.configure().set_request_proxy(proxy)
+
+    setup()
+    data, error = asyncio.run(form.bind(request))
+    if error or data['roles'] != [1, 2, 3]:
+        raise ValueError(f'{framework} {location}: {data} {error}')
+
+    def func():
+        return form.bind(request)
+    return Case(f'bind.{framework} {location}', func, setup=setup)
+
+
+def _memory_case(request_class: type, location: str) -> Case:
+    '''
+    Form.bind without framework, the baseline of the adapter cases.
+    '''
+    if location == 'query':
+        request = request_class(query=USER_QUERY)
+    elif location == 'form':
+        request = request_class(form=USER_QUERY)
+    else:
+        request = request_class(body=USER)
+    form = UserForm()
+    data, error = asyncio.run(form.bind(request))
+    if error or data['roles'] != [1, 2, 3]:
+        raise ValueError(f'{request_class.__name__} {location}: {error}')
+
+    def func():
+        return form.bind(request)
+    return Case(f'bind.{request_class.__name__} {location}', func)
+
+
+def cases() -> List[Case]:
+    result = [
+        _dict_case('dict_bind valid', UserForm(), USER, True),
+        _dict_case('dict_bind error heavy', UserForm(), USER_ERRORS, False),
+        _dict_case('dict_bind error heavy fail fast', FailFastUserForm(),
+                   USER_ERRORS, False),
+        _dict_case('dict_bind nested 2 levels', AccountForm(), ACCOUNT, True),
+        _dict_case(f'dict_bind lists {LIST_SIZE}', ListForm(), LISTS, True,
+                   number=100),
+        _dict_case(f'dict_bind compact IntList {LIST_SIZE}',
+                   CompactListForm(), {'ids': IDS}, True, number=100),
+        _generated_case('dict_bind generated valid', UserForm(), 0.0),
+        _generated_case('dict_bind generated 20% invalid', UserForm(), 0.2),
+        _generated_case('dict_bind generated nested', AccountForm(), 0.2),
+        _generated_case('dict_bind generated 50% invalid fail fast',
+                        FailFastUserForm(), 0.5),
+    ]
+    for framework in FRAMEWORKS:
+        for location in ('query', 'form', 'json'):
+            result.append(_bind_case(framework, location))
+    for request_class in (DictRequest, AsyncDictRequest):
+        for location in ('query', 'form', 'json'):
+            result.append(_memory_case(request_class, location))
+    return result
@@ -1,5 +1,5 @@
 class FieldABC:
-    pass
+    __slots__ = ()
 
 
 class FormABC:
@@ -0,0 +1,121 @@
+'''
+Command line tools.
+
+    python -m xform replay xform.capture xform.capture.1 --repeat 5
+    python -m xform generate app.forms:UserForm -n 1000 --invalid 0.2
+    python -m xform profile app.forms:UserForm inputs.jsonl
+'''
+import argparse
+import sys
+from typing import Optional
+
+
+def _replay(args: argparse.Namespace) -> int:
+    from . import capture
+    forms = dict(item.split('=', 1) for item in args.form)
+    try:
+        report = capture.replay(args.files, forms=forms, repeat=args.repeat)
+    except OSError as e:
+        print(e)
+        return 1
+    if not report:
+        print('no records')
+        return 1
+    print(capture.format_report(report))
+    return 0
+
+
+def _generate(args: argparse.Namespace) -> int:
+    from .form import import_form
+    from .payloads import PayloadGenerator, throttle
+    gen = PayloadGenerator(import_form(args.form), seed=args.seed,
+                           optional=args.optional,
+                           errors=args.errors.split(',') if args.errors
+                           else None)
+    payloads = gen.stream(args.number, invalid=args.invalid)
+    if args.rate:
+        payloads = throttle(payloads, args.rate)
+    for payload in payloads:
+        line = gen.encode(payload.data, args.format)
+        if args.expect:
+            # the broken field and error key, "-" if valid
+            line = f'{payload.field or "-"}\t{payload.error or "-"}\t{line}'
+        print(line, flush=bool(args.rate))
+    return 0
+
+
+def _profile(args: argparse.Namespace) -> int:
+    from .form import import_form
+    from .profile import format_plan, format_profile, profile, read_inputs
+    form = import_form(args.form)
+    try:
+        inputs = list(read_inputs(args.inputs))
+    except OSError as e:
+        print(e)
+        return 1
+    if not inputs:
+        print('no inputs')
+        return 1
+    print(format_profile(profile(form, inputs, repeat=args.repeat)))
+    print()
+    print(format_plan(form))
+    return 0
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m xform')
+    # add_subparsers(required=True) is python 3.7+
+    commands = parser.add_subparsers(dest='command')
+
+    replay = commands.add_parser(
+        'replay', help='run captured data(xform.capture) through '
+                       'dict_bind, report throughput and field cost')
+    replay.add_argument('files', nargs='+', help='capture logs')
+    replay.add_argument('--form', action='append', default=[],
+                        metavar='CAPTURED=MODULE:ATTR',
+                        help='form of the captured name, e.g: for forms '
+                             'defined in functions')
+    replay.add_argument('--repeat', type=int, default=1,
+                        help='passes over the records, default 1')
+    replay.set_defaults(func=_replay)
+
+    generate = commands.add_parser(
+        'generate', help='print synthetic payloads of a form, one per line')
+    generate.add_argument('form', help='module:attr, e.g: app.forms:UserForm')
+    generate.add_argument('-n', '--number', type=int, default=None,
+                          help='payloads, default endless')
+    generate.add_argument('--invalid', type=float, default=0.0,
+                          help='share of invalid payloads, 0-1')
+    generate.add_argument('--errors',
+                          help='error keys of the invalid payloads, e.g: '
+                               'required,length,invalid')
+    generate.add_argument('--format', default='json',
+                          choices=('json', 'urlencoded', 'query'))
+    generate.add_argument('--rate', type=float,
+                          help='maximum payloads per second')
+    generate.add_argument('--optional', type=float, default=0.8,
+                          help='probability of each optional field')
+    generate.add_argument('--seed', type=int, default=None)
+    generate.add_argument('--expect', action='store_true',
+                          help='prefix "field<TAB>error<TAB>" of the '
+                               'broken field')
+    generate.set_defaults(func=_generate)
+
+    profile = commands.add_parser(
+        'profile', help='per field cost of a form over JSON lines inputs, '
+                        'and the form plan')
+    profile.add_argument('form', help='module:attr, e.g: app.forms:UserForm')
+    profile.add_argument('inputs', nargs='+',
+                         help='JSON lines of request data or capture logs')
+    profile.add_argument('--repeat', type=int, default=1,
+                         help='passes over the inputs, default 1')
+    profile.set_defaults(func=_profile)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.error('a command is required: replay, generate or profile')
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,6 +3,10 @@ from typing import Any, Optional
 
 
 class BaseRequest(metaclass=abc.ABCMeta):
+    # xform parses the raw query string/urlencoded body itself and
+    # only decodes the declared keys, see `get_query_string`
+    raw_parsing = False
+
     def __init__(self, request) -> None:
         self.request = request
 
@@ -76,6 +80,14 @@ class BaseRequest(metaclass=abc.ABCMeta):
         :return: `<str>`
         '''
 
+    def get_query_string(self) -> Optional[str]:
+        '''
+        Get raw query string(without '?'), only for `raw_parsing`.
+
+        :return: `<str>` None if not supported
+        '''
+        return None
+
     def translate(self, message: str) -> str:
         '''
         Translation message
@@ -85,6 +97,14 @@ class BaseRequest(metaclass=abc.ABCMeta):
         '''
         return message
 
+    def get_locale(self) -> Optional[str]:
+        '''
+        Get locale code used by `translate`, part of the form cache key.
+
+        :return: `<str>` None if messages are not translated
+        '''
+        return None
+
     def get_request_method(self) -> str:
         '''
         Get request method
@@ -44,6 +44,9 @@ class AioHttpRequest(BaseRequest):
     def get_body(self) -> Awaitable[Optional[str]]:
         return self.request.text()
 
+    def get_query_string(self) -> Optional[str]:
+        return self.request.query_string
+
     def translate(self, message: str) -> str:
         return message
 
@@ -39,6 +39,9 @@ class FlaskRequest(BaseRequest):
         # please set get_data(cache=True) otherwise no data can be obtained
         return self.request.get_data(cache=True, as_text=True)
 
+    def get_query_string(self) -> Optional[str]:
+        return self.request.query_string.decode()
+
     def translate(self, message: str) -> str:
         return message
 
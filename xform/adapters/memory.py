@@ -0,0 +1,145 @@
+'''
+In-memory requests built from plain dicts, no web framework needed.
+
+DataBinding uses BaseRequest instances as they are, so the requests are
+passed to bind directly, whatever the configured request proxy is.
+
+usage::
+
+    request = DictRequest(query={'id': '1', 'tags': ['a', 'b']},
+                          headers={'X-Token': 'token'})
+    data, error = await form.bind(request)
+
+    # json body, Content-Type is set by default
+    data, error = await form.bind(DictRequest(body={'id': 1}))
+
+    # awaitable form/body getters like aiohttp
+    data, error = await form.bind(AsyncDictRequest(form={'id': '1'}))
+'''
+from typing import Any, Awaitable, Callable, Optional, Union
+from urllib.parse import parse_qs
+
+from . import BaseRequest
+from xform.utils import json_dumps
+
+__all__ = ['DictRequest', 'AsyncDictRequest']
+
+MIME_JSON = 'application/json'
+MIME_FORM = 'application/x-www-form-urlencoded'
+
+
+def _multi(args: Union[dict, str, None]) -> dict:
+    '''
+    {key: [value, ...]}, args is a dict(value or list) or query string
+    '''
+    if not args:
+        return {}
+    if isinstance(args, str):
+        return parse_qs(args, keep_blank_values=True)
+    return {key: list(value) if isinstance(value, (list, tuple))
+            else [value] for key, value in args.items()}
+
+
+class DictRequest(BaseRequest):
+    '''
+    Request of plain dicts, values of query/form are a value or a list
+    of values, get_argument returns the first one.
+    '''
+
+    def __init__(self,
+                 query: Union[dict, str] = None,
+                 form: Union[dict, str] = None,
+                 headers: dict = None,
+                 cookies: dict = None,
+                 body: Union[str, bytes, dict, list] = None,
+                 method: str = None,
+                 translate: Callable[[str], str] = None,
+                 locale: str = None) -> None:
+        '''
+        :param query: `<dict/str>` query arguments or query string
+        :param form: `<dict/str>` form arguments or urlencoded body
+        :param headers: `<dict>` names are case-insensitive
+        :param cookies: `<dict>`
+        :param body: `<str/bytes/dict/list>` request body, dict/list is
+            dumped as json
+        :param method: `<str>` default POST with form/body, else GET
+        :param translate: `<callable>` translate error messages
+        :param locale: `<str>` locale code of translate
+        '''
+        super().__init__(None)
+        self.query = _multi(query)
+        self.form = _multi(form)
+        self.headers = {key.lower(): value
+                        for key, value in (headers or {}).items()}
+        self.cookies = cookies or {}
+        if isinstance(body, (dict, list)):
+            body = json_dumps(body)
+            self.headers.setdefault('content-type', MIME_JSON)
+        elif isinstance(body, bytes):
+            body = body.decode()
+        if form is not None:
+            self.headers.setdefault('content-type', MIME_FORM)
+        self.body = body
+        self.method = (method or ('POST' if form is not None
+                                  or body is not None else 'GET')).upper()
+        self._translate = translate
+        self.locale = locale
+
+    def get_argument(self,
+                     name: str,
+                     default: Any = None) -> Optional[str]:
+        values = self.form.get(name)
+        return values[0] if values else default
+
+    def get_arguments(self, name: str) -> Optional[list]:
+        return self.form.get(name, [])
+
+    def get_query_argument(self,
+                           name: str,
+                           default: Any = None) -> Optional[str]:
+        values = self.query.get(name)
+        return values[0] if values else default
+
+    def get_query_arguments(self, name: str) -> Optional[list]:
+        return self.query.get(name, [])
+
+    def get_from_header(self,
+                        name: str,
+                        default: Any = None) -> Optional[str]:
+        return self.headers.get(name.lower(), default)
+
+    def get_from_cookie(self,
+                        name: str,
+                        default: Any = None) -> Optional[str]:
+        return self.cookies.get(name, default)
+
+    def get_body(self) -> Optional[str]:
+        return self.body
+
+    def translate(self, message: str) -> str:
+        if self._translate is None:
+            return message
+        return self._translate(message)
+
+    def get_locale(self) -> Optional[str]:
+        return self.locale
+
+    def get_request_method(self) -> str:
+        return self.method
+
+
+class AsyncDictRequest(DictRequest):
+    '''
+    DictRequest with awaitable form/body getters, like AioHttpRequest.
+    '''
+
+    async def get_argument(self,
+                           name: str,
+                           default: Any = None) -> Optional[str]:
+        return super().get_argument(name, default)
+
+    async def get_arguments(self, name: str) -> Optional[list]:
+        return super().get_arguments(name)
+
+    async def get_body(self) -> Awaitable[Optional[str]]:
+        return self.body
@@ -1,6 +1,6 @@
 from typing import Any, Optional
 from . import BaseRequest
-from xform.utils import parse_content_type
+from xform.content_type import parse_content_type
 
 
 class SanicRequest(BaseRequest):
@@ -40,6 +40,9 @@ class SanicRequest(BaseRequest):
         charset = ctype.parameters.get('charset') or 'utf-8'
         return self.request.body.decode(charset)
 
+    def get_query_string(self) -> Optional[str]:
+        return self.request.query_string
+
     def translate(self, message: str) -> str:
         return message
 
@@ -37,8 +37,14 @@ class TornadoRequest(BaseRequest):
     def get_body(self) -> Optional[str]:
         return self.request.request.body
 
+    def get_query_string(self) -> Optional[str]:
+        return self.request.request.query
+
     def translate(self, message: str) -> str:
         return self.request.locale.translate(message)
 
+    def get_locale(self) -> Optional[str]:
+        return self.request.locale.code
+
     def get_request_method(self) -> str:
         return self.request.request.method
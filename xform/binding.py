@@ -7,8 +7,9 @@ See the DataBinding class for more information.
 import types
 from typing import Any, Awaitable, Dict, Optional, Union
 
+from . import capture
 from .httputil import HttpRequest, BaseRequest
-from .utils import AttrDict, JsonDecodeError, json_loads
+from .utils import AttrDict, json_loads, parse_qs_selective, split_list
 from .fields import Field, Nested
 
 # Content-Type
@@ -24,13 +25,18 @@ IEME = AttrDict(
 
 
 class Content:
-    def __init__(self, req: BaseRequest, fields: dict) -> None:
+    def __init__(self,
+                 req: BaseRequest,
+                 fields: dict,
+                 keys: frozenset = None) -> None:
         '''
         :param req: `<BaseRequest>` tornado/flask... request
         :param fields: `<dict>` {data_key:field_class}
+        :param keys: `<frozenset>` declared request keys, see Form
         '''
         self.req = req
         self.fields = fields
+        self.keys = keys
 
     @staticmethod
     def is_coroutine(value: Any) -> bool:
@@ -84,21 +90,79 @@ class JsonContent(Content):
             if self.is_coroutine(value):
                 value = await value
             data = json_loads(value)
-        except (JsonDecodeError, ValueError):
+        # JSONDecodeError of json/ujson is a ValueError
+        except ValueError:
             data = {}
         return self._binding(data)
 
 
 class _KVContent(Content):
-    def __init__(self, req: BaseRequest, fields: dict):
-        super().__init__(req, fields)
+    # maximum number of pairs parsed by xform, see `parse`
+    max_fields = 1000
+    # maximum items of list_format values without max_len, see split
+    max_list_items = 1000
+
+    def __init__(self,
+                 req: BaseRequest,
+                 fields: dict,
+                 keys: frozenset = None):
+        super().__init__(req, fields, keys=keys)
         self.get_arg = None
         self.get_args = None
+        self._args = None
         self.initialize()
 
     def initialize(self):
         pass
 
+    @property
+    def raw_parsing(self) -> bool:
+        return self.keys is not None and self.req.raw_parsing
+
+    async def prepare(self) -> None:
+        '''
+        Load raw data before binding, only for `raw_parsing`.
+        '''
+        pass
+
+    def parse(self, *raws: Union[str, bytes]) -> None:
+        '''
+        Parse raw query string/urlencoded body, only the declared keys
+        are decoded, values of the same key are merged in order.
+
+        :param raws: `<str/bytes>` each one is limited to `max_fields`
+        :raise ValueError: more than `max_fields` pairs
+        '''
+        args = {}
+        for raw in raws:
+            if isinstance(raw, bytes):
+                raw = raw.decode('utf-8', 'replace')
+            parsed = parse_qs_selective(raw, self.keys, self.max_fields)
+            for key, values in parsed.items():
+                args.setdefault(key, []).extend(values)
+        self._args = args
+        self.get_arg = self._get_parsed_arg
+        self.get_args = self._get_parsed_args
+
+    def _get_parsed_arg(self, name: str, default: Any = None) -> Optional[str]:
+        # the first value, same as the adapters
+        values = self._args.get(name)
+        return values[0] if values else default
+
+    def _get_parsed_args(self, name: str) -> list:
+        return self._args.get(name, [])
+
+    @classmethod
+    def split(cls, field: Field, values: list) -> list:
+        '''
+        Split list_format values(e.g: ids=1,2,3) of list field.
+
+        :param values: `<list>` request values of the field
+        :return: `<list>`
+        '''
+        limit = getattr(field, '_max_len', 0) or cls.max_list_items
+        return split_list(values, field.list_format, limit)
+
     async def _get_nested(self, parent: str, nested: Nested):
         data = {}
         for name, field in nested.schema.__fields__.items():
@@ -111,6 +175,8 @@ class _KVContent(Content):
                 value = self.get_args(f'{parent}.{field.data_key}')
             if self.is_coroutine(value):
                 value = await value
+            if field.list_format and value:
+                value = self.split(field, value)
             data[name] = value
         return data
 
@@ -118,6 +184,8 @@ class _KVContent(Content):
         '''
         :return: `<dict>` name:value
         '''
+        if self.raw_parsing:
+            await self.prepare()
         data = {}
         for name, field in self.fields.items():
             if isinstance(field, Nested):
@@ -129,6 +197,8 @@ class _KVContent(Content):
                 value = self.get_args(field.data_key)
             if self.is_coroutine(value):
                 value = await value
+            if field.list_format and value:
+                value = self.split(field, value)
             data[name] = value
         return data
 
@@ -151,6 +221,16 @@ class FormContent(_KVContent):
         self.get_arg = self.req.get_argument
         self.get_args = self.req.get_arguments
 
+    async def prepare(self) -> None:
+        content_type = self.req.get_from_header('Content-Type', '').lower()
+        if IEME.MIME_MULTPART_FORM in content_type:
+            return
+        body = self.req.get_body()
+        if self.is_coroutine(body):
+            body = await body
+        # query arguments first, then the body, as the adapters do
+        self.parse(self.req.get_query_string() or '', body or '')
+
     def name(self) -> str:
         return 'form'
 
@@ -161,6 +241,11 @@ class QueryContent(_KVContent):
         self.get_arg = self.req.get_query_argument
         self.get_args = self.req.get_query_arguments
 
+    async def prepare(self) -> None:
+        query = self.req.get_query_string()
+        if query is not None:
+            self.parse(query)
+
     def name(self) -> str:
         return 'query'
 
@@ -177,6 +262,8 @@ class _CHContent(_KVContent):
                 value = [self.get_arg(f'{parent}.{field.data_key}')]
             if self.is_coroutine(value):
                 value = await value
+            if field.list_format and value:
+                value = self.split(field, value)
             data[name] = value
         return data
 
@@ -195,6 +282,8 @@ class _CHContent(_KVContent):
                 value = [self.get_arg(field.data_key)]
             if self.is_coroutine(value):
                 value = await value
+            if field.list_format and value:
+                value = self.split(field, value)
             data[name] = value
         return data
 
@@ -235,16 +324,33 @@ class DataBinding:
     def __init__(self,
                  req: 'HttpRequest',
                  fields: Dict[str, Field],
-                 locations: Union[str, tuple] = None) -> None:
+                 locations: Union[str, tuple] = None,
+                 keys: frozenset = None,
+                 name: str = None) -> None:
+        '''
+        :param req: e.g: tornado.web.RequestHandler, or BaseRequest
+        :param fields: `<dict>` {name:field_class}
+        :param locations: `<tuple/str>` form/json/query/headers/cookies
+        :param keys: `<frozenset>` declared request keys, used by the
+            raw query/form parser(see BaseRequest.raw_parsing)
+        :param name: `<str>` module:qualname of the form, the key of
+            the captured data(see xform.capture)
+        '''
         self.req = req
-        _http = HttpRequest.configure()
-        self.request = _http.request(req)
+        if isinstance(req, BaseRequest):
+            # already adapted, e.g: xform.adapters.memory.DictRequest
+            self.request = req
+        else:
+            _http = HttpRequest.configure()
+            self.request = _http.request(req)
         self.fields = fields
         self.locations = locations
+        self.keys = keys
+        self.name = name
         self.content = None
 
     def _base_kwargs(self) -> dict:
-        return dict(req=self.request, fields=self.fields)
+        return dict(req=self.request, fields=self.fields, keys=self.keys)
 
     def _auto_configure(self) -> Content:
         kwds = self._base_kwargs()
@@ -267,6 +373,12 @@ class DataBinding:
 
         :return: `<dict>`
         '''
+        data = await self._binding()
+        if capture.recorder is not None and self.name is not None:
+            capture.recorder.record(self.name, self.fields, data)
+        return data
+
+    async def _binding(self) -> Awaitable[Optional[dict]]:
         if not self.locations:
             content = self._auto_configure()
             return await content.binding()
@@ -289,6 +401,8 @@ class DataBinding:
             value = data.get(field.data_key, None)
             if field.lst and isinstance(value, str):
                 value = [value]
+                if field.list_format:
+                    value = _KVContent.split(field, value)
             _data[name] = value
         return _data
 
@@ -0,0 +1,363 @@
+'''
+Caches used by forms and fields.
+
+See the LRUCache/ResultCache class for more information.
+'''
+import asyncio
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+
+from .validate import ValidationError
+
+__all__ = ['LRUCache', 'ResultCache', 'LookupCache', 'freeze',
+           'cached_validate', 'cached_validator']
+
+_MISSING = object()
+# result of the in-flight load whose leader was cancelled
+_RETRY = object()
+
+
+def freeze(value: Any) -> Hashable:
+    '''
+    Canonical hashable representation of request values.
+
+    dict -> sorted tuple of items, list/tuple -> tuple.
+
+    :param value: `<Any>` str/int/float/bool/None/list/dict
+    :return: `<Hashable>` raise TypeError if value can not be hashed
+    '''
+    if isinstance(value, dict):
+        return ('d',) + tuple(sorted(
+            (key, freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple)):
+        return ('l',) + tuple(freeze(val) for val in value)
+    hash(value)
+    return value
+
+
+class LRUCache:
+    '''
+    LRU cache with optional TTL.
+
+    usage::
+
+        cache = LRUCache(maxsize=1024, ttl=60)
+        cache.set('key', 'value')
+        cache.get('key')
+        print(cache.stats())
+    '''
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        '''
+        :param maxsize: `<int>` maximum entries
+        :param ttl: `<float>` seconds, None never expire
+        '''
+        if maxsize <= 0:
+            raise ValueError('maxsize must be greater than 0')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __deepcopy__(self, memo: dict) -> 'LRUCache':
+        # deepcopy of a field(e.g: by user code) starts with an empty
+        # cache, the lock can't be copied. xform shares the fields and
+        # copy() shares the cache
+        return self.__class__(maxsize=self.maxsize, ttl=self.ttl)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            self.misses += 1
+            return default
+        value, expires = item
+        if expires is not None and expires < time.monotonic():
+            with self._lock:
+                self._data.pop(key, None)
+            self.misses += 1
+            return default
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            pass
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        '''
+        :return: `<dict>` hits/misses/evictions/size/hit_rate
+        '''
+        total = self.hits + self.misses
+        return dict(hits=self.hits,
+                    misses=self.misses,
+                    evictions=self.evictions,
+                    size=len(self._data),
+                    hit_rate=self.hits / total if total else 0.0)
+
+
+class ResultCache(LRUCache):
+    '''
+    Whole form result cache, keyed on the extracted request values.
+
+    Only for forms whose fields are pure(see Field.is_pure), the cached
+    (data, error) is shared between requests, don't modify the values.
+
+    usage::
+
+        class SearchForm(Form):
+            __cache__ = ResultCache(maxsize=1024, ttl=60)
+
+            keyword = fields.Str(required=True)
+            page = fields.Integer(required=False, default=1)
+    '''
+
+    @staticmethod
+    def make_key(data: dict, locale: Any = None) -> Optional[Hashable]:
+        '''
+        :param data: `<dict>` extracted values, see DataBinding
+        :param locale: `<Any>` request locale, error messages are translated
+        :return: `<Hashable>` None if data can not be hashed
+        '''
+        try:
+            return (locale, freeze(data or {}))
+        except TypeError:
+            return None
+
+
+class LookupCache:
+    '''
+    Async TTL+LRU cache with single-flight loading.
+
+    Concurrent loads of the same key share one await, negative results
+    are cached separately(usually with a shorter ttl). When the loading
+    bind is cancelled, a waiting one loads again.
+    '''
+
+    def __init__(self,
+                 maxsize: int = 1024,
+                 ttl: Optional[float] = 60,
+                 negative_maxsize: int = None,
+                 negative_ttl: Optional[float] = 10) -> None:
+        '''
+        :param maxsize: `<int>` maximum positive entries
+        :param ttl: `<float>` positive entries expire seconds
+        :param negative_maxsize: `<int>` maximum negative entries,
+            default maxsize, 0 don't cache negative results
+        :param negative_ttl: `<float>` negative entries expire seconds
+        '''
+        self.positive = LRUCache(maxsize=maxsize, ttl=ttl)
+        negative_maxsize = maxsize if negative_maxsize is None \
+            else negative_maxsize
+        self.negative = LRUCache(maxsize=negative_maxsize,
+                                 ttl=negative_ttl) \
+            if negative_maxsize > 0 else None
+        self._inflight = {}
+        self.loads = self.coalesced = 0
+
+    async def get_or_load(self,
+                          key: Hashable,
+                          loader: Callable[[], Awaitable[Tuple[Any, bool]]]
+                          ) -> Tuple[Any, bool]:
+        '''
+        :param key: `<Hashable>`
+        :param loader: `<callable>` return awaitable (result, negative)
+        :return: `<tuple>` (result, negative)
+        '''
+        result = self.positive.get(key, _MISSING)
+        if result is not _MISSING:
+            return result, False
+        if self.negative is not None:
+            result = self.negative.get(key, _MISSING)
+            if result is not _MISSING:
+                return result, True
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            while future is not None:
+                result = await asyncio.shield(future)
+                if result is not _RETRY:
+                    return result
+                # the leader was cancelled(timeout, deadline...), join
+                # the next load or load
+                future = self._inflight.get(key)
+            # counted as a load
+            self.coalesced -= 1
+        future = asyncio.get_event_loop().create_future()
+        self._inflight[key] = future
+        try:
+            self.loads += 1
+            result, negative = await loader()
+        except asyncio.CancelledError:
+            # the cancellation belongs to the leader only, a follower
+            # becomes the new leader
+            future.set_result(_RETRY)
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # retrieved by followers, avoid "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        if negative:
+            if self.negative is not None:
+                self.negative.set(key, result)
+        else:
+            self.positive.set(key, result)
+        future.set_result((result, negative))
+        return result, negative
+
+    def clear(self) -> None:
+        self.positive.clear()
+        if self.negative is not None:
+            self.negative.clear()
+        self.loads = self.coalesced = 0
+
+    def stats(self) -> dict:
+        '''
+        :return: `<dict>` hits/negative_hits/misses/loads/coalesced/hit_rate
+        '''
+        hits = self.positive.hits
+        negative_hits = self.negative.hits if self.negative else 0
+        requests = hits + negative_hits + self.loads + self.coalesced
+        return dict(hits=hits,
+                    negative_hits=negative_hits,
+                    misses=self.loads + self.coalesced,
+                    loads=self.loads,
+                    coalesced=self.coalesced,
+                    size=len(self.positive),
+                    negative_size=len(self.negative) if self.negative else 0,
+                    hit_rate=(requests - self.loads) / requests
+                    if requests else 0.0)
+
+
+def cached_validate(maxsize: int = 1024,
+                    ttl: Optional[float] = 60,
+                    negative_maxsize: int = None,
+                    negative_ttl: Optional[float] = 10,
+                    key: Callable[[Any], Hashable] = None) -> Callable:
+    '''
+    Cache Field._validate by value, see LookupCache.
+
+    The result is negative when the field error is set.
+
+    usage::
+
+        class UserField(fields.Integer):
+            cvt_type = None
+
+            @cached_validate(ttl=30, negative_ttl=5)
+            async def _validate(self, value, attr, data):
+                user = await UserCache.get(value)
+                if not user:
+                    self.set_error('not_exist')
+                else:
+                    return user
+
+        print(UserField._validate.cache.stats())
+
+    The cache belongs to the decorated function, shared by all instances.
+
+    :param key: `<callable>` cache key of value, default value
+    '''
+    def decorator(func: Callable) -> Callable:
+        cache = LookupCache(maxsize=maxsize, ttl=ttl,
+                            negative_maxsize=negative_maxsize,
+                            negative_ttl=negative_ttl)
+
+        @functools.wraps(func)
+        async def wrapper(self, value: Any, attr: str, data: dict) -> Any:
+            async def loader():
+                ret = await func(self, value, attr, data)
+                if self.error:
+                    return self._error_args, True
+                return ret, False
+
+            try:
+                _key = key(value) if key else freeze(value)
+            except TypeError:
+                return await func(self, value, attr, data)
+            result, negative = await cache.get_or_load(_key, loader)
+            if negative:
+                self.set_error(result[0], result[1], *result[2])
+                return None
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def cached_validator(maxsize: int = 1024,
+                     ttl: Optional[float] = 60,
+                     negative_maxsize: int = None,
+                     negative_ttl: Optional[float] = 10,
+                     key: Callable[[Any], Hashable] = None) -> Callable:
+    '''
+    Cache async validator by value, see LookupCache.
+
+    The result is negative when the validator raise ValidationError or
+    return False.
+
+    usage::
+
+        @cached_validator(ttl=30)
+        async def exist_user(value):
+            if not await UserCache.get(value):
+                raise ValidationError('User does not exist')
+
+        user_id = fields.Integer(validate=exist_user)
+
+    :param key: `<callable>` cache key of value, default value
+    '''
+    def decorator(func: Callable) -> Callable:
+        cache = LookupCache(maxsize=maxsize, ttl=ttl,
+                            negative_maxsize=negative_maxsize,
+                            negative_ttl=negative_ttl)
+
+        @functools.wraps(func)
+        async def wrapper(value: Any) -> Any:
+            async def loader():
+                try:
+                    ret = func(value)
+                    if asyncio.iscoroutine(ret):
+                        ret = await ret
+                except ValidationError as err:
+                    return err.message, True
+                if ret is False:
+                    return False, True
+                return ret, False
+
+            try:
+                _key = key(value) if key else freeze(value)
+            except TypeError:
+                return await func(value)
+            result, negative = await cache.get_or_load(_key, loader)
+            if negative and result is not False:
+                raise ValidationError(result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -0,0 +1,261 @@
+'''
+Capture of the extracted request data, replayed offline by dict_bind.
+
+Sampled binds write one JSON line {"form": "module:Form", "data": {...}}
+with the raw values extracted by DataBinding(before validation) to a
+rotating log file(path, path.1 ... path.N).
+
+usage::
+
+    from xform import capture
+
+    # the values of Password fields and `redact` keys are replaced by
+    # "***"
+    capture.enable('/var/log/app/xform.capture', sample=0.01,
+                   max_bytes=10 * 1024 * 1024, backups=3,
+                   redact=('token',))
+
+    # offline, throughput and per field cost
+    python -m xform replay /var/log/app/xform.capture*
+
+When capture is not enabled the cost is one attribute check per bind
+(`recorder`), json/random are imported by enable.
+'''
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from .fields import Nested, Password
+
+__all__ = ['Recorder', 'enable', 'disable', 'recorder', 'read', 'replay',
+           'format_report']
+
+REDACTED = '***'
+
+# current recorder, None if capture is disabled
+recorder: Optional['Recorder'] = None
+
+
+class Recorder:
+    '''
+    Sampled, size-capped writer of the capture log.
+    '''
+
+    def __init__(self,
+                 path: str,
+                 sample: float = 1.0,
+                 max_bytes: int = 10 * 1024 * 1024,
+                 backups: int = 3,
+                 redact: Iterable[str] = (),
+                 redact_password: bool = True) -> None:
+        '''
+        :param path: `<str>` log file
+        :param sample: `<float>` 0-1, share of the binds captured
+        :param max_bytes: `<int>` rotate when the file is larger
+        :param backups: `<int>` rotated files kept, the disk usage is at
+            most max_bytes * (backups + 1)
+        :param redact: `<list>` data keys whose values are replaced
+            by "***", e.g: token
+        :param redact_password: `<bool>` replace the values of the
+            Password fields by "***"
+        '''
+        import json
+        import random
+        if not 0 < sample <= 1:
+            raise ValueError('sample must be in (0, 1]')
+        self._dumps = json.JSONEncoder(
+            ensure_ascii=False, separators=(',', ':'), default=str).encode
+        self._random = random.random
+        self.path = path
+        self.sample = sample
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.redact = frozenset(redact)
+        self.redact_password = redact_password
+        self.records = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = f'{self.path}.{index}'
+            if os.path.exists(source):
+                os.replace(source, f'{self.path}.{index + 1}')
+        if self.backups > 0:
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._size = 0
+
+    def record(self, form: str, fields: dict, data: Optional[dict]) -> None:
+        '''
+        :param form: `<str>` module:qualname of the form class
+        :param fields: `<dict>` {name: field}
+        :param data: `<dict>` extracted {name: value}
+        '''
+        if not data or (self.sample < 1 and self._random() >= self.sample):
+            return
+        line = self._dumps({'form': form,
+                            'data': self._values(fields, data)}) + '\n'
+        size = len(line.encode('utf-8'))
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._size + size > self.max_bytes and self._size:
+                self._rotate()
+            self._file.write(line)
+            self._file.flush()
+            self._size += size
+            self.records += 1
+
+    def _values(self, fields: dict, data: dict) -> dict:
+        values = {}
+        for name, value in data.items():
+            field = fields.get(name)
+            # replayed by dict_bind, keyed by data_key(nested too)
+            key = field.data_key if field is not None else name
+            if value is None:
+                pass
+            elif key in self.redact or (self.redact_password and
+                                        isinstance(field, Password)):
+                value = REDACTED
+            elif isinstance(field, Nested):
+                value = self._nested(field.schema.__fields__, value)
+            values[key] = value
+        return values
+
+    def _nested(self, fields: dict, value: Any) -> Any:
+        if isinstance(value, dict):
+            return self._values(fields, value)
+        if isinstance(value, list):
+            return [self._nested(fields, item) for item in value]
+        return value
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def enable(path: str, **kwargs: Any) -> Recorder:
+    '''
+    Capture the binds of all forms, see Recorder for the arguments.
+
+    :return: `<Recorder>`
+    '''
+    global recorder
+    disable()
+    recorder = Recorder(path, **kwargs)
+    return recorder
+
+
+def disable() -> None:
+    global recorder
+    if recorder is not None:
+        recorder.close()
+    recorder = None
+
+
+def read(paths: Iterable[str]) -> Iterator[Tuple[str, dict]]:
+    '''
+    :return: `<iterator>` (form, data) of the capture logs
+    '''
+    import json
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record['form'], record['data']
+
+
+def replay(paths: Iterable[str],
+           forms: Dict[str, str] = None,
+           repeat: int = 1) -> dict:
+    '''
+    Run the captured data through dict_bind.
+
+    :param paths: `<list>` capture logs
+    :param forms: `<dict>` {captured form: module:attr}, for forms which
+        can't be imported by the captured name, e.g: forms defined in functions
+    :param repeat: `<int>` passes over the records
+    :return: `<dict>` {form: {records, invalid, seconds, fields}},
+        fields: see xform.profile.Profiler.report
+    '''
+    from .form import import_form
+    from .profile import Profiler
+    forms = forms or {}
+    records: Dict[str, list] = {}
+    classes, skipped = {}, {}
+    for name, data in read(paths):
+        if name not in classes:
+            try:
+                classes[name] = import_form(forms.get(name, name))
+            except (ImportError, AttributeError, ValueError, TypeError):
+                classes[name] = None
+        if classes[name] is None:
+            skipped[name] = skipped.get(name, 0) + 1
+            continue
+        records.setdefault(name, []).append(data)
+
+    async def run(form, values: list) -> int:
+        invalid = 0
+        for data in values:
+            _, error = await form.dict_bind(data)
+            invalid += bool(error)
+        return invalid
+
+    report = {}
+    loop = asyncio.new_event_loop()
+    try:
+        for name, values in records.items():
+            form = classes[name]
+            invalid = loop.run_until_complete(run(form, values))
+            start = time.perf_counter()
+            for _ in range(repeat):
+                loop.run_until_complete(run(form, values))
+            seconds = time.perf_counter() - start
+            # per field cost, separate pass, hooks slow down the binds
+            with Profiler() as profiler:
+                loop.run_until_complete(run(form, values))
+            report[name] = {
+                'records': len(values),
+                'invalid': invalid,
+                'seconds': seconds / repeat,
+                'fields': profiler.report(form)
+            }
+    finally:
+        loop.close()
+    for name, count in skipped.items():
+        report[name] = {'records': count, 'skipped': True}
+    return report
+
+
+def format_report(report: dict) -> str:
+    lines = []
+    for name, row in report.items():
+        if row.get('skipped'):
+            lines.append(f'{name}: {row["records"]} records skipped, the '
+                         'form can not be imported(see --form)')
+            continue
+        records, seconds = row['records'], row['seconds']
+        lines.append(
+            f'{name}: {records} records, '
+            f'{row["invalid"] / records * 100:.1f}% invalid, '
+            f'{records / seconds:.0f} binds/s, '
+            f'{seconds / records * 1e6:.1f} us/bind')
+        total = sum(field['seconds'] for field in row['fields'].values())
+        lines.append(f'  {"field":<24} {"us/call":>10} {"share":>8} '
+                     f'{"errors":>8}')
+        for field, stats in sorted(row['fields'].items(),
+                                   key=lambda item: -item[1]['seconds']):
+            calls = stats['calls'] or 1
+            lines.append(
+                f'  {field:<24} {stats["seconds"] / calls * 1e6:>10.2f} '
+                f'{stats["seconds"] / total * 100 if total else 0:>7.1f}% '
+                f'{stats["errors"] / calls * 100:>7.1f}%')
+    return '\n'.join(lines)
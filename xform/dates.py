@@ -0,0 +1,187 @@
+'''
+Date/time parsing engine.
+
+Each strftime format is compiled once into a specialized parser, shared
+by all the fields of the same format(see compile_format), a value is
+valid when it is exactly the formatted string of the parsed datetime,
+same as strptime + strftime round trip.
+
+usage::
+
+    parser = compile_format('%Y-%m-%d %H:%M:%S')
+    parser.parse('2021-01-01 12:30:45')  # datetime or None
+'''
+import datetime
+import re
+import time
+from functools import lru_cache
+from typing import Optional, Pattern, Tuple, Union
+
+__all__ = ['DateParser', 'compile_format', 'timestamp_seconds',
+           'TIMESTAMP_MIN', 'TIMESTAMP_MAX']
+
+# fixed width directives, the same as strftime output
+_DIRECTIVES = {
+    'Y': ('year', 4),
+    'm': ('month', 2),
+    'd': ('day', 2),
+    'H': ('hour', 2),
+    'M': ('minute', 2),
+    'S': ('second', 2),
+    'f': ('microsecond', 6)
+}
+
+# parsed by datetime.fromisoformat(python 3.7+), the compiled parser on
+# python 3.6
+_ISO_FORMATS = {
+    '%Y-%m-%d': (10, None),
+    '%Y-%m-%d %H:%M:%S': (19, ' '),
+    '%Y-%m-%dT%H:%M:%S': (19, 'T')
+} if hasattr(datetime.datetime, 'fromisoformat') else {}
+
+# strptime %Y only accepts 4 digits, strftime doesn't pad the year
+TIMESTAMP_MIN = -30610224000  # 1000-01-01 00:00:00 UTC
+TIMESTAMP_MAX = 253402300799  # 9999-12-31 23:59:59 UTC
+
+
+def _compile(fmt: str) -> Optional[Tuple[Pattern, tuple]]:
+    '''
+    :return: `<tuple>` (regex, group names), None if fmt has directives
+        other than _DIRECTIVES
+    '''
+    pattern, names, i = [], [], 0
+    while i < len(fmt):
+        char = fmt[i]
+        if char != '%':
+            pattern.append(re.escape(char))
+            i += 1
+            continue
+        directive = fmt[i + 1:i + 2]
+        if directive == '%':
+            pattern.append('%')
+        elif directive in _DIRECTIVES:
+            name, width = _DIRECTIVES[directive]
+            if name in names:
+                return None
+            names.append(name)
+            pattern.append(r'(\d{%d})' % width)
+        else:
+            return None
+        i += 2
+    if 'year' not in names:
+        # strptime default 1900-01-01
+        return None
+    return re.compile(''.join(pattern) + r'\Z', re.ASCII), tuple(names)
+
+
+class DateParser:
+    '''
+    Parser of one format, use compile_format to get the shared instance.
+    '''
+
+    def __init__(self, fmt: str, maxsize: int = 1024) -> None:
+        '''
+        :param fmt: `<str>` strftime format
+        :param maxsize: `<int>` cached values, e.g: the start date parsed
+            by StartDate is reused by EndedDate
+        '''
+        self.fmt = fmt
+        self._iso = _ISO_FORMATS.get(fmt)
+        self._compiled = _compile(fmt)
+        self.parse = lru_cache(maxsize)(self._parse)
+        self._example = None
+        self._example_expires = 0.0
+
+    def _parse(self, value: str) -> Optional[datetime.datetime]:
+        if not isinstance(value, str):
+            return None
+        if self._iso is not None:
+            return self._parse_iso(value)
+        if self._compiled is not None:
+            return self._parse_compiled(value)
+        return self._parse_strptime(value)
+
+    def _parse_iso(self, value: str) -> Optional[datetime.datetime]:
+        length, sep = self._iso
+        if len(value) != length:
+            return None
+        try:
+            date = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            return None
+        # fromisoformat also accepts e.g: 2021-W01-1, 20210101
+        if date.year < 1000:
+            return None
+        if sep is None:
+            return date if date.date().isoformat() == value else None
+        return date if date.isoformat(sep) == value else None
+
+    def _parse_compiled(self, value: str) -> Optional[datetime.datetime]:
+        pattern, names = self._compiled
+        match = pattern.match(value)
+        if match is None:
+            return None
+        values = dict(zip(names, map(int, match.groups())))
+        if values['year'] < 1000:
+            return None
+        values.setdefault('month', 1)
+        values.setdefault('day', 1)
+        try:
+            return datetime.datetime(**values)
+        except ValueError:
+            return None
+
+    def _parse_strptime(self, value: str) -> Optional[datetime.datetime]:
+        try:
+            date = datetime.datetime.strptime(value, self.fmt)
+            if date.strftime(self.fmt) != value:
+                return None
+            return date
+        except ValueError:
+            return None
+
+    def example(self) -> str:
+        '''
+        Formatted current time for error messages, updated every minute.
+        '''
+        now = time.time()
+        if now >= self._example_expires:
+            self._example = datetime.datetime.now().strftime(self.fmt)
+            self._example_expires = now + 60
+        return self._example
+
+
+@lru_cache(256)
+def compile_format(fmt: str) -> DateParser:
+    '''
+    :param fmt: `<str>` strftime format
+    :return: `<DateParser>` shared parser of fmt
+    '''
+    return DateParser(fmt)
+
+
+def timestamp_seconds(value: Union[int, str],
+                      truncate: bool = False) -> Optional[int]:
+    '''
+    Seconds of timestamp.
+
+    :param value: `<int/str>` e.g: 1609459200, 1609459200000
+    :param truncate: `<bool>` millisecond/microsecond timestamp(13 digits
+        or more) is truncated to 10 digits seconds
+    :return: `<int>` None if invalid
+    '''
+    if isinstance(value, bool):
+        return None
+    try:
+        seconds = int(value)
+    except (TypeError, ValueError):
+        return None
+    if truncate:
+        number = -seconds if seconds < 0 else seconds
+        if number >= 10 ** 12:
+            while number >= 10 ** 10:
+                number //= 10
+            seconds = -number if seconds < 0 else number
+    if not TIMESTAMP_MIN <= seconds <= TIMESTAMP_MAX:
+        return None
+    return seconds
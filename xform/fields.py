@@ -1,17 +1,29 @@
 import re
+import math
+import sys
+import asyncio
 import datetime
 import time
 import inspect
+import operator
+from copy import copy
 import types
+from array import array
 from collections.abc import Iterable
-from typing import Any, Tuple, Union, Optional
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Tuple, Union, Optional
 
 from .validate import ValidationError, Validator
+from .instrument import Span
 from . import FieldABC
 from . import FormABC
-from .utils import json_loads
+from .utils import LIST_FORMATS, InvalidList, json_loads
+from .cache import LRUCache, freeze
+from .dates import compile_format, timestamp_seconds
 from .messages import ErrMsg
 
+_MISSING = object()
+
 VALUE_TYPES = Union[str, int, float]
 ALL_TYPES = Union[str, int, float, bool, list, dict]
 
@@ -49,6 +61,57 @@ __all__ = [
 ]
 
 
+class _Limiter:
+    '''
+    Semaphore created on first use of each event loop, shared by the
+    copies of a field.
+    '''
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+        self._loop = self._semaphore = None
+
+    def get(self) -> asyncio.Semaphore:
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.value)
+        return self._semaphore
+
+
+def _run_detached(field: 'Field', value: Any, attr: str,
+                  data: dict) -> Tuple[Any, Optional[tuple]]:
+    '''
+    Run the sync validation of field in executor, see Field.executor.
+
+    :return: `<tuple>` (value, error args)
+    '''
+    run = field._validate_inline(value, attr, data)
+    try:
+        run.send(None)
+    except StopIteration:
+        return field.value, field._error_args if field.error else None
+    run.close()
+    raise RuntimeError(f'{field.__class__.__name__} awaits in validation, '
+                       'can not run in executor')
+
+
+def _value_size(value: Any) -> int:
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_value_size(val) for val in value) + len(value)
+    return 0
+
+
+def _is_process_pool(executor: Any) -> bool:
+    # concurrent.futures.process(multiprocessing) is only imported by the
+    # users of ProcessPoolExecutor
+    process = sys.modules.get('concurrent.futures.process')
+    return process is not None and \
+        isinstance(executor, process.ProcessPoolExecutor)
+
+
 def is_generator(obj):
     return inspect.isgeneratorfunction(obj) or inspect.isgenerator(obj)
 
@@ -59,8 +122,39 @@ def is_iter_but_not_string(obj):
 
 
 class Field(FieldABC):
+    __slots__ = ('data_key', 'required', 'default', 'length', 'lst',
+                 'when_field', 'when_value', 'description', 'list_format',
+                 '_pure', 'kwargs', '_value_is_null', 'validators',
+                 'validate', '_awaits', 'executor', 'offload',
+                 'offload_size', 'is_async', 'err_msg', 'value', 'error',
+                 'error_key', 'locale', '_error_args', 'timeout',
+                 'timeout_error', 'limiter', '_guarded', 'memo',
+                 '_validator_plan')
 
     cvt_type: callable = None
+    # None: auto, only the built-in validation is pure, see is_pure
+    pure: bool = None
+    # the result only depends on the field value, see memoize
+    memoizable = True
+    null_values = (None, '')
+    # err_msg shared by the instances, the class level `err_msg` of the
+    # subclasses is moved here, see __init_subclass__
+    default_err_msg: dict = {}
+    # slots of the class and its bases, see __copy__
+    _slot_names: tuple = __slots__
+    _slot_getter = operator.attrgetter(*__slots__)
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        err_msg = cls.__dict__.get('err_msg')
+        if isinstance(err_msg, dict):
+            cls.default_err_msg = err_msg
+            # the class attribute hides the `err_msg` slot
+            delattr(cls, 'err_msg')
+        cls._slot_names = tuple(
+            name for klass in cls.__mro__
+            for name in klass.__dict__.get('__slots__', ()))
+        cls._slot_getter = operator.attrgetter(*cls._slot_names)
 
     def __init__(self,
                  *,
@@ -74,6 +168,14 @@ class Field(FieldABC):
                  when_field: str = None,
                  when_value: Any = None,
                  description: str = None,
+                 pure: bool = None,
+                 memoize: Union[int, LRUCache] = None,
+                 timeout: float = None,
+                 timeout_error: str = 'timeout',
+                 concurrency: int = None,
+                 executor: Union[bool, Executor] = None,
+                 offload_size: int = 4096,
+                 list_format: str = None,
                  **kwargs: Any) -> None:
         '''
         :param data_key: `<str>` submit form parameters key, default field name
@@ -109,6 +211,26 @@ class Field(FieldABC):
                 address=fields.String(required=False,when_field='status',
                     when_value='2')
         :param description: `<str>` field description
+        :param pure: `<bool>` the result only depends on the request value,
+            no side effects, default auto(see is_pure)
+        :param memoize: `<int/LRUCache>` cache the validation result of
+            each value for pure fields, int is the maximum entries, use
+            LRUCache(maxsize, ttl) to set expire time, the cached value
+            is shared between binds(e.g: Jsonify), don't modify it
+        :param timeout: `<float>` seconds, cancel `_validate` and validators
+            on timeout
+        :param timeout_error: `<str>` err_msg key on timeout, also used when
+            the bind deadline is exceeded(see Form.bind)
+        :param concurrency: `<int>` maximum concurrent `_validate` calls,
+            e.g: limit the backend lookups
+        :param executor: `<bool/Executor>` run `_validate` and validators
+            of large values in executor, True the event loop default
+            executor, ProcessPoolExecutor only for pure fields
+        :param offload_size: `<int>` minimum value length to run in
+            executor, smaller values run inline
+        :param list_format: `<str>` csv/json/range, list field sent as one
+            query/form value, e.g: ids=1,2,3 ids=[1,2,3] ids=1-100,
+            see xform.utils.split_list
         :param kwargs: `<dict>` others params
         '''
         self.data_key = data_key
@@ -121,11 +243,14 @@ class Field(FieldABC):
             raise ValueError('when_value invalid')
         self.when_value = when_value
         self.description = description
+        if list_format is not None:
+            if list_format not in LIST_FORMATS:
+                raise ValueError(f'list_format must be one of {LIST_FORMATS}')
+            if not lst:
+                raise ValueError('list_format requires lst=True')
+        self.list_format = list_format
+        self._pure = pure
         self.kwargs = kwargs
-        self.null_values = (
-            None,
-            '',
-        )
         self._value_is_null = False
         if validate is None:
             self.validators = []
@@ -140,13 +265,42 @@ class Field(FieldABC):
             raise ValueError("The 'validate' parameter must be a callable "
                              'or a collection of callables.')
         self.validate = validate
-        if hasattr(self, 'err_msg'):
-            if err_msg:
-                self.err_msg = {**self.err_msg, **err_msg}
+        # custom `_validate` or coroutine validators, see xform.metrics
+        self._awaits = type(self)._validate.__module__ != __name__ or any(
+            inspect.iscoroutinefunction(v)
+            or inspect.iscoroutinefunction(getattr(v, '__call__', None))
+            for v in self.validators)
+        self.executor = None if executor is True else executor
+        self.offload = bool(executor)
+        self.offload_size = offload_size
+        if err_msg:
+            self.err_msg = {**self.default_err_msg, **err_msg}
+        elif type(self).add_err_msg is not Field.add_err_msg:
+            self.err_msg = dict(self.default_err_msg)
         else:
-            self.err_msg = err_msg or {}
+            self.err_msg = self.default_err_msg
         self.add_err_msg()
-        self.value = self.error = self.locale = None
+        self.value = self.error = self.error_key = self.locale = None
+        self._error_args = None
+        self.timeout = timeout
+        self.timeout_error = timeout_error
+        self.limiter = _Limiter(concurrency) if concurrency else None
+        self._guarded = timeout is not None or self.limiter is not None
+        # awaited fields keep per bind state, copied by Form._bind
+        self.is_async = self._awaits or self.offload or self._guarded
+        self.memo = None
+        # fail-fast validator order, set on the per bind copies of
+        # fail-fast forms, see xform.schedule
+        self._validator_plan = None
+        if memoize:
+            if not self.memoizable or not self.is_pure:
+                raise ValueError(f'{self.__class__.__name__} can not be '
+                                 'memoized, the field is not pure')
+            self.memo = memoize if isinstance(memoize, LRUCache) \
+                else LRUCache(maxsize=memoize)
+        if _is_process_pool(executor) and not self.is_pure:
+            raise ValueError(f'{self.__class__.__name__} can not run in '
+                             'ProcessPoolExecutor, the field is not pure')
 
     @property
     def is_valid(self):
@@ -154,8 +308,40 @@ class Field(FieldABC):
             return False
         return True
 
+    @property
+    def is_pure(self) -> bool:
+        '''
+        The field can be cached, see xform.cache.
+
+        Callable default is never pure, otherwise use `pure` if declared,
+        else the built-in fields with pure validators(see Validator.pure).
+        '''
+        if callable(self.default):
+            return False
+        pure = self.pure if self._pure is None else self._pure
+        if pure is not None:
+            return pure
+        return not self._awaits and all(
+            getattr(v, 'pure', False) for v in self.validators)
+
+    def __copy__(self) -> 'Field':
+        # copied per bind(see Form._bind), faster than the copy protocol
+        cls = self.__class__
+        field = cls.__new__(cls)
+        try:
+            for name, value in zip(cls._slot_names, cls._slot_getter(self)):
+                setattr(field, name, value)
+        except AttributeError:
+            # unset slots
+            for name in cls._slot_names:
+                if hasattr(self, name):
+                    setattr(field, name, getattr(self, name))
+        if hasattr(self, '__dict__'):
+            field.__dict__.update(self.__dict__)
+        return field
+
     def reset(self):
-        self.value = self.error = self.locale = None
+        self.value = self.error = self.error_key = self.locale = None
 
     def get_value(self):
         if self.is_valid:
@@ -202,6 +388,8 @@ class Field(FieldABC):
         if args:
             _msg = _msg % args
         self.error = _msg
+        self.error_key = key
+        self._error_args = (key, default, args)
 
     async def _run_validate(self,
                             value: ALL_TYPES,
@@ -218,32 +406,88 @@ class Field(FieldABC):
             def translate(message) -> str:
                 ...
         '''
+        value = self._prepare(value, translate)
+        if self._check_required(value) and self._check_length(value) \
+                and self._check_when(data):
+            await self._abc_validate(value, attr, data)
+        return self
+
+    async def _run_validate_traced(self,
+                                   value: ALL_TYPES,
+                                   attr: str,
+                                   data: dict,
+                                   translate: callable = None,
+                                   hook: callable = None,
+                                   form: str = None) -> 'Field':
+        '''
+        Same as `_run_validate`, report each stage to instrument hook.
+
+        :param hook: `<callable>` see xform.instrument
+        :param form: `<str>` form name
+        '''
+        with Span(hook, 'field', form, attr) as span:
+            if type(self)._run_validate is not Field._run_validate:
+                with Span(hook, 'stage', form, attr, '_validate'):
+                    await self._run_validate(value, attr, data, translate)
+                span.error = self.error
+                return self
+            value = self._prepare(value, translate)
+            with Span(hook, 'stage', form, attr, 'required'):
+                ok = self._check_required(value)
+            if ok:
+                with Span(hook, 'stage', form, attr, 'length'):
+                    ok = self._check_length(value)
+            if ok and self.when_field:
+                with Span(hook, 'stage', form, attr, 'when_field'):
+                    ok = self._check_when(data)
+            if ok:
+                await self._abc_validate(value, attr, data,
+                                         trace=(hook, form))
+            span.error = self.error
+        return self
+
+    def _prepare(self, value: ALL_TYPES, translate: callable) -> ALL_TYPES:
         self.reset()
         self.locale = translate
         self.value = value
         if self.lst:
-            if not value or value is None:
-                value = [None]
-            elif not isinstance(value, (list, tuple)):
-                value = [value]
+            value = self._list_value(value)
+        return value
+
+    def _list_value(self, value: ALL_TYPES) -> list:
+        if not value or value is None:
+            return [None]
+        elif not isinstance(value, (list, tuple)):
+            return [value]
+        return value
+
+    def _check_required(self, value: ALL_TYPES) -> bool:
+        if self.lst:
             not_null = all([0 if x in self.null_values else 1 for x in value])
             if not self._valid_required(value if not_null else ''):
-                return self
+                return False
             if self.required is False and self._value_is_null:
-                return self
+                return False
+            return True
+        return self._valid_required(value)
+
+    def _check_length(self, value: ALL_TYPES) -> bool:
+        if self.lst:
             for val in value:
                 if not isinstance(val, (str, int, float, bool)):
-                    self.set_error('invalid')
-                    return self
+                    if isinstance(val, InvalidList):
+                        self.set_list_format_error(val)
+                    else:
+                        self.set_error('invalid')
+                    return False
                 if not self._valid_length(val):
-                    return self
+                    return False
+            return True
         elif isinstance(value, dict):
-            if not self._valid_required(value):
-                return self
-        else:
-            if not self._valid_required(value) or \
-                    not self._valid_length(value):
-                return self
+            return True
+        return self._valid_length(value)
+
+    def _check_when(self, data: dict) -> bool:
         if self.when_field:
             if callable(self.when_value):
                 # eg. when_value = lambda x: x and int(x) > 0
@@ -255,19 +499,151 @@ class Field(FieldABC):
             if _flag and self._value_is_null:
                 self.set_error('required',
                                ErrMsg.get_message('default_required'))
-                return self
-        return await self._abc_validate(value, attr, data)
+                return False
+        return True
 
-    async def _abc_validate(self, value: dict, attr: str,
-                            data: dict) -> 'Field':
+    async def _abc_validate(self, value: dict, attr: str, data: dict,
+                            trace: tuple = None) -> 'Field':
+        '''
+        :param trace: `<tuple>` (hook, form name) of the traced binds, the
+            validation is reported as the _validate/validators stages
+        '''
         if self.required is False and self._value_is_null:
             self.get_defalut_value()
             return self
-        ret = await self._validate(value, attr, data)
+        if self.memo is not None:
+            run = self._memo_validate(value, attr, data)
+        elif self._guarded:
+            run = self._guarded_validate(value, attr, data)
+        else:
+            return await self._validate_value(value, attr, data, trace)
+        if trace is None:
+            return await run
+        with Span(trace[0], 'stage', trace[1], attr, '_validate'):
+            return await run
+
+    async def _validate_value(self, value: ALL_TYPES, attr: str,
+                              data: dict, trace: tuple = None) -> 'Field':
+        if self.offload and _value_size(value) >= self.offload_size:
+            if trace is None:
+                return await self._offload_validate(value, attr, data)
+            with Span(trace[0], 'stage', trace[1], attr, '_validate'):
+                return await self._offload_validate(value, attr, data)
+        return await self._validate_inline(value, attr, data, trace)
+
+    async def _offload_validate(self, value: ALL_TYPES, attr: str,
+                                data: dict) -> 'Field':
+        '''
+        Validate in executor, the error message is translated here.
+        '''
+        field = copy(self)
+        field.locale = field.executor = field.memo = field.limiter = None
+        field.when_value = None
+        loop = asyncio.get_event_loop()
+        self.value, error = await loop.run_in_executor(
+            self.executor, _run_detached, field, value, attr, data)
+        if error is not None:
+            self.set_error(error[0], error[1], *error[2])
+        return self
+
+    async def _validate_inline(self, value: ALL_TYPES, attr: str,
+                               data: dict, trace: tuple = None) -> 'Field':
+        if trace is None:
+            ret = await self._validate(value, attr, data)
+        else:
+            with Span(trace[0], 'stage', trace[1], attr, '_validate'):
+                ret = await self._validate(value, attr, data)
         if ret is not None:
             self.value = ret
         if not self.error and self.validators:
-            await self._validator(value)
+            if trace is None:
+                await self._validator(value)
+            else:
+                with Span(trace[0], 'stage', trace[1], attr, 'validators'):
+                    await self._validator(value)
+        return self
+
+    async def _guarded_validate(self, value: ALL_TYPES, attr: str,
+                                data: dict) -> 'Field':
+        '''
+        Validate with concurrency limit and timeout, the timeout includes
+        waiting for the limit.
+        '''
+        run = self._limited_validate(value, attr, data) \
+            if self.limiter is not None \
+            else self._validate_value(value, attr, data)
+        if self.timeout is None:
+            return await run
+        try:
+            await asyncio.wait_for(run, self.timeout)
+        except asyncio.TimeoutError:
+            self.set_timeout_error()
+        return self
+
+    async def _limited_validate(self, value: ALL_TYPES, attr: str,
+                                data: dict) -> 'Field':
+        async with self.limiter.get():
+            return await self._validate_value(value, attr, data)
+
+    async def _run_until(self,
+                         run: Awaitable['Field'],
+                         deadline: float,
+                         translate: callable = None) -> 'Field':
+        '''
+        Run validation before the bind deadline, cancel on timeout.
+
+        :param run: `<coroutine>` e.g: self._run_validate(...)
+        :param deadline: `<float>` loop time
+        '''
+        remaining = deadline - asyncio.get_event_loop().time()
+        if remaining > 0:
+            try:
+                if not self.is_async:
+                    return await run
+                return await asyncio.wait_for(run, remaining)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            run.close()
+            self.reset()
+            self.locale = translate
+        self.set_timeout_error()
+        return self
+
+    def set_list_format_error(self, value: InvalidList) -> None:
+        if value.error_key == 'too_long_error':
+            self.set_error('too_long_error',
+                           ErrMsg.get_message('too_long_error'), value.limit)
+        else:
+            self.set_error('invalid')
+
+    def set_timeout_error(self) -> None:
+        self.value = None
+        self.set_error(self.timeout_error, ErrMsg.get_message('timeout'))
+
+    async def _memo_validate(self, value: ALL_TYPES, attr: str,
+                             data: dict) -> 'Field':
+        '''
+        Validate with per-value cache: value -> (value, error args).
+        '''
+        try:
+            key = freeze(value)
+        except TypeError:
+            key = None
+        if key is not None:
+            result = self.memo.get(key, _MISSING)
+            if result is not _MISSING:
+                self.value, error = result
+                if error is not None:
+                    self.set_error(error[0], error[1], *error[2])
+                return self
+        if self._guarded:
+            await self._guarded_validate(value, attr, data)
+        else:
+            await self._validate_value(value, attr, data)
+        if key is not None and self.error_key != self.timeout_error:
+            self.memo.set(key, (self.value,
+                                self._error_args if self.error else None))
         return self
 
     def _valid_required(self, value: VALUE_TYPES) -> bool:
@@ -283,7 +659,11 @@ class Field(FieldABC):
                     or isinstance(self.default, bool):
                 return True
             self.get_defalut_value()
+            if self.length is None:
+                return True
             value = str(self.value)
+        elif self.length is None:
+            return True
         else:
             value = f'{value}'
 
@@ -314,6 +694,8 @@ class Field(FieldABC):
         return value
 
     async def _validator(self, value: VALUE_TYPES) -> None:
+        if self._validator_plan is not None:
+            return await self._validator_fail_fast(value)
         for validate in self.validators:
             try:
                 if self.cvt_type and value is not None \
@@ -333,11 +715,50 @@ class Field(FieldABC):
                 if self.required is True:
                     self.set_error('invalid', verr.message)
 
+    async def _validator_fail_fast(self, value: VALUE_TYPES) -> None:
+        '''
+        Run the validators in the scheduled order(see
+        xform.schedule.Scheduler), stop at the first failure.
+        '''
+        order, observe = self._validator_plan
+        if self.cvt_type and value is not None \
+                and not isinstance(value, self.cvt_type):
+            try:
+                value = self.cvt_type(value)
+            except ValueError:
+                pass
+        for index in order:
+            validate = self.validators[index]
+            start = time.perf_counter()
+            # only the validators which set the error stop the rest
+            failed = False
+            try:
+                ret = validate(value)
+                if isinstance(ret, types.CoroutineType):
+                    await ret
+                if not isinstance(validate, Validator) and ret is False:
+                    self.set_error('invalid',
+                                   ErrMsg.get_message('default_failed'))
+                    failed = True
+            except ValidationError as verr:
+                self.value = None
+                if self.required is True:
+                    self.set_error('invalid', verr.message)
+                    failed = True
+            if observe is not None:
+                observe(index, time.perf_counter() - start, failed)
+            if failed:
+                return
+
 
 class Number(Field):
+    __slots__ = ('_min', '_max', '_pattern')
 
     regex = r'\d+$|^\d+\.\d+$'
     cvt_type = float
+    # JSON values accepted without the string round trip, see _is_native
+    native_types: tuple = (int, float)
+    signed = False
     err_msg = {
         'invalid': ErrMsg.get_message('default_invalid'),
         'min_invalid': ErrMsg.get_message('min_invalid'),
@@ -354,6 +775,7 @@ class Number(Field):
         self._max = _max
         kwargs.update({'required': required})
         super().__init__(**kwargs)
+        self._pattern = re.compile(self.regex)
 
     def get_value(self):
         if self.is_valid:
@@ -370,21 +792,50 @@ class Number(Field):
         if isinstance(value, (dict, list)):
             self.set_error('invalid')
             return
-        if isinstance(value, (int, float)):
-            value = f'{value}'
-        ret = re.match(self.regex, value)
-        if not ret:
-            self.set_error('invalid')
+        if isinstance(value, self.native_types) and self._is_native(value):
+            value = self._parse(value)
         else:
-            if self._min is not None:
-                if not self._compare_value(value, self._min):
-                    self.set_error('min_invalid', None, self._min)
-                    return self.default
-            if self._max is not None:
-                if not self._compare_value(self._max, value):
-                    self.set_error('max_invalid', None, self._max)
-                    return self.default
+            if isinstance(value, (int, float)):
+                value = f'{value}'
+            if not self._pattern.match(value):
+                self.set_error('invalid')
+                return
+            try:
+                value = self._parse(value)
+            except ValueError:
+                # e.g: '-' of Integer.regex
+                self.set_error('invalid')
+                return
+        if self._min is not None:
+            if not self._compare_value(value, self._min):
+                self.set_error('min_invalid', None, self._min)
+                return self.default
+        if self._max is not None:
+            if not self._compare_value(self._max, value):
+                self.set_error('max_invalid', None, self._max)
+                return self.default
+        return value
+
+    def _is_native(self, value: Union[int, float]) -> bool:
+        '''
+        The native value matches the regex(same as its string).
+        '''
+        if value < 0 and not self.signed:
+            return False
+        if isinstance(value, float):
+            # e.g: 1e+16, inf, nan
+            return math.isfinite(value) and 'e' not in repr(value)
+        return True
+
+    def _parse(self, value: VALUE_TYPES) -> VALUE_TYPES:
+        '''
+        Parse the matched value once, get_value returns it as is.
+        '''
+        if self.cvt_type is None:
+            if isinstance(value, str):
+                return int(value) if value.isdigit() else float(value)
             return value
+        return self.cvt_type(value)
 
     def _compare_value(self,
                        value: VALUE_TYPES,
@@ -397,9 +848,12 @@ class Number(Field):
 
 
 class Integer(Number):
+    __slots__ = ()
 
     regex = r'^0$|^[-1-9]\d*$'
     cvt_type = int
+    native_types = (int,)
+    signed = True
 
     def __init__(self, *, _min: Union[int, float] = 0, **kwargs: Any):
         kwargs.update({'_min': _min})
@@ -407,11 +861,14 @@ class Integer(Number):
 
 
 class Float(Number):
+    __slots__ = ()
     regex = r'^\d+\.\d+$'
     cvt_type = float
+    native_types = (float,)
 
 
 class Str(Field):
+    __slots__ = ()
     cvt_type = str
 
     def __init__(self, *, length: tuple = (0, 255), **kwargs: Any):
@@ -427,6 +884,7 @@ class Str(Field):
 
 
 class EnStr(Str):
+    __slots__ = ('regex',)
 
     letters = r'^[a-zA-Z]+$'
     upper = r'^[A-Z]+$'
@@ -452,16 +910,30 @@ class EnStr(Str):
 
 
 class Raw(Field):
-    pass
+    __slots__ = ()
 
 
 class Nested(Field):
+    __slots__ = ('nested',)
     err_msg = {'type': ErrMsg.get_message('invalid_type')}
+    memoizable = False
 
     def __init__(self, nested: Any, required: bool = False, **kwargs: Any):
         self.nested = nested
         kwargs.update({'required': required})
         super().__init__(**kwargs)
+        # awaits the nested form
+        self.is_async = True
+
+    @property
+    def is_pure(self) -> bool:
+        if callable(self.default):
+            return False
+        pure = self.pure if self._pure is None else self._pure
+        if pure is not None:
+            return pure
+        return all(field.is_pure
+                   for field in self.schema.__fields__.values())
 
     @property
     def schema(self):
@@ -492,6 +964,7 @@ class Nested(Field):
             self.set_error('invalid')
         _data, error = await self.schema.dict_bind(data, translate)
         if error:
+            self.error_key = 'invalid'
             if self.required:
                 self.error = error
             else:
@@ -508,6 +981,7 @@ class Nested(Field):
 
 
 class List(Field):
+    __slots__ = ('_data_type', '_min_len', '_max_len')
     err_msg = {
         'invalid': ErrMsg.get_message('default_invalid'),
         'too_less_error': ErrMsg.get_message('too_less_error'),
@@ -546,13 +1020,44 @@ class List(Field):
 
 
 class IntList(List):
-    def __init__(self, dedup: bool = True, **kwargs):
+    __slots__ = ('dedup', 'compact', '_min', '_max', '_numpy')
+    err_msg = {
+        **List.default_err_msg,
+        'min_invalid': ErrMsg.get_message('min_invalid'),
+        'max_invalid': ErrMsg.get_message('max_invalid')
+    }
+
+    def __init__(self,
+                 dedup: bool = True,
+                 compact: Union[bool, str] = False,
+                 _min: int = None,
+                 _max: int = None,
+                 **kwargs):
+        '''
+        :param dedup: `<bool>` remove duplicates, keep the first
+            occurrence order in compact mode
+        :param compact: `<bool/str>` parse once into array('q'),
+            'numpy' for numpy.ndarray(int64), for huge id lists
+        :param _min: `<int>` minimum of each element
+        :param _max: `<int>` maximum of each element
+        '''
         self.dedup = dedup
+        self.compact = compact
+        self._min = _min
+        self._max = _max
+        self._numpy = None
+        if compact == 'numpy':
+            import numpy
+            self._numpy = numpy
+        elif compact not in (True, False, 'array'):
+            raise ValueError("compact must be True/False/'array'/'numpy'")
         kwargs.update({'data_type': int})
         super().__init__(**kwargs)
 
     def get_value(self):
         if self.is_valid:
+            if self.compact:
+                return self.value
             if not self.cvt_type:
                 return self.value or self.default
             if isinstance(self.value, list):
@@ -565,8 +1070,81 @@ class IntList(List):
             return list(set(data)) if self.dedup else data
         return self.default
 
+    def _check_required(self, value: ALL_TYPES) -> bool:
+        if not self.compact:
+            return super()._check_required(value)
+        # null_values, without a per element loop
+        not_null = not (None in value or '' in value)
+        if not self._valid_required(value if not_null else ''):
+            return False
+        return not (self.required is False and self._value_is_null)
+
+    def _check_length(self, value: ALL_TYPES) -> bool:
+        if not self.compact:
+            return super()._check_length(value)
+        if self._max_len > 0 and len(value) > self._max_len:
+            self.set_error('too_long_error', None, self._max_len)
+            return False
+        if self.list_format and isinstance(value[0], InvalidList):
+            self.set_list_format_error(value[0])
+            return False
+        if self.length is None:
+            # element types are checked by _parse
+            return True
+        return super()._check_length(value)
+
+    async def _validate(self, value: list, attr: str,
+                        data: dict) -> Optional[Union[list, array]]:
+        if not self.compact:
+            _data = await super()._validate(value, attr, data)
+        elif len(value) < self._min_len:
+            self.set_error('too_less_error', None, self._min_len)
+            return None
+        else:
+            _data = self._parse(value)
+        if _data is None or self.error:
+            return None
+        if self._min is not None and len(_data) and min(_data) < self._min:
+            self.set_error('min_invalid', None, self._min)
+            return None
+        if self._max is not None and len(_data) and max(_data) > self._max:
+            self.set_error('max_invalid', None, self._max)
+            return None
+        return _data
+
+    def _parse(self, value: list) -> Optional[Union[array, Any]]:
+        '''
+        Parse into array once, dedup keeps the first occurrence order.
+        '''
+        try:
+            if self._numpy is None:
+                return self._parse_array(value)
+            numpy = self._numpy
+            _data = numpy.fromiter(map(int, value), dtype=numpy.int64,
+                                   count=len(value))
+        except (TypeError, ValueError, OverflowError):
+            self.set_error('invalid')
+            return None
+        if self.dedup:
+            _, index = numpy.unique(_data, return_index=True)
+            _data = _data[numpy.sort(index)]
+        return _data
+
+    def _parse_array(self, value: list) -> array:
+        try:
+            # JSON ints, no conversion
+            _data = array('q', value)
+            ints = value
+        except TypeError:
+            ints = list(map(int, value))
+            _data = None
+        if self.dedup:
+            return array('q', dict.fromkeys(ints))
+        return array('q', ints) if _data is None else _data
+
 
 class Boolean(Field):
+    __slots__ = ('_real', '_fake')
     cvt_type = bool
     real = ('t', 'true', 'on', 'y', 'yes', '1', 1, True)
     fake = ('f', 'false', 'off', 'n', 'no', '0', 0, False)
@@ -577,10 +1155,8 @@ class Boolean(Field):
                  real: Union[list, tuple] = None,
                  fake: Union[list, tuple] = None,
                  **kwargs: Any):
-        if real is not None:
-            self.real = tuple(set(real))
-        if fake is not None:
-            self.fake = tuple(set(fake))
+        self._real = self.real if real is None else tuple(set(real))
+        self._fake = self.fake if fake is None else tuple(set(fake))
         super().__init__(**kwargs)
 
     async def _validate(self, value: VALUE_TYPES, attr: str,
@@ -590,32 +1166,32 @@ class Boolean(Field):
             return
         elif isinstance(value, (int, bool)):
             return bool(value)
-        elif value.lower() in self.real:
+        elif value.lower() in self._real:
             return True
-        elif value.lower() in self.fake:
+        elif value.lower() in self._fake:
             return False
         self.set_error('invalid')
 
 
 class Timestamp(Integer):
+    __slots__ = ()
+
     def __init__(self, length: int = 10, **kwargs: Any):
         kwargs.update({'length': length})
         super().__init__(**kwargs)
 
     async def _validate(self, value: VALUE_TYPES, attr: str,
                         data: dict) -> Optional[str]:
-        try:
-            if self.length >= 13 and len(str(value)) >= 13:
-                value = str(value)[:10]
-            date = time.strftime('%Y-%m-%d %H:%M:%S',
-                                 time.localtime(int(value)))
-            datetime.datetime.strptime(date, '%Y-%m-%d %H:%M:%S')
-            return int(value)
-        except ValueError:
+        # millisecond/microsecond timestamp when length >= 13
+        truncate = isinstance(self.length, int) and self.length >= 13
+        seconds = timestamp_seconds(value, truncate=truncate)
+        if seconds is None:
             self.set_error('invalid')
+        return seconds
 
 
 class DateTime(Field):
+    __slots__ = ('fmt', 'convert', 'parser')
     err_msg = {'invalid': ErrMsg.get_message('invalid_datetime')}
 
     def __init__(self,
@@ -628,44 +1204,41 @@ class DateTime(Field):
         self.convert = convert
         kwargs.update({'default': default})
         super().__init__(**kwargs)
+        self.parser = compile_format(fmt)
 
     @classmethod
     def _vaild(cls, value: VALUE_TYPES, fmt: str):
-        try:
-            res = datetime.datetime.strptime(value, fmt).strftime(fmt)
-            if value != res:
-                raise ValueError
-            return True
-        except ValueError:
-            return False
+        return compile_format(fmt).parse(value) is not None
 
     async def _validate(self, value: VALUE_TYPES, attr: str,
                         data: dict) -> Optional[str]:
         try:
-            # valid value regex
-            if self._vaild(self.value, self.fmt) is False:
-                raise ValueError
-            if self.convert is True:
-                date = datetime.datetime.strptime(value, self.fmt)
-                return date
-            return value
-        except (TypeError, AttributeError, ValueError):
-            eg_val = datetime.datetime.now().strftime(self.fmt)
-            self.set_error('invalid', None, value, eg_val)
+            date = self.parser.parse(value)
+        except TypeError:
+            # unhashable, e.g: list
+            date = None
+        if date is None:
+            self.set_error('invalid', None, value, self.parser.example())
+            return None
+        return date if self.convert is True else value
 
 
 class Date(DateTime):
+    __slots__ = ()
+
     def __init__(self, fmt: str = '%Y-%m-%d', **kwargs: Any):
         kwargs.update({'fmt': fmt})
         super().__init__(**kwargs)
 
 
 class StartDate(Date):
-    pass
+    __slots__ = ()
 
 
 class EndedDate(Date):
+    __slots__ = ('start_field',)
     err_msg = {'invalid': ErrMsg.get_message('invalid_start_date')}
+    memoizable = False
 
     def __init__(self, start_field: str, **kwargs: Any):
         self.start_field = start_field
@@ -673,8 +1246,10 @@ class EndedDate(Date):
 
     def _fmt_date(self, value: VALUE_TYPES) -> Optional[datetime.datetime]:
         try:
-            return datetime.datetime.strptime(value, self.fmt)
-        except ValueError:
+            # the start date is usually parsed(cached) by StartDate
+            return self.parser.parse(value) \
+                or datetime.datetime.strptime(value, self.fmt)
+        except (TypeError, ValueError):
             return None
 
     async def _validate(self, value: VALUE_TYPES, attr: str,
@@ -690,6 +1265,7 @@ class EndedDate(Date):
 
 
 class Time(Field):
+    __slots__ = ()
     err_msg = {'invalid': ErrMsg.get_message('invalid_timestamp')}
 
     async def _validate(self, value: VALUE_TYPES, attr: str,
@@ -705,6 +1281,7 @@ class Time(Field):
 
 
 class Url(Str):
+    __slots__ = ('relative', 'require_tld', 'schemes')
 
     default_schemes = {'http', 'https', 'ftp', 'ftps'}
     err_msg = {'invalid': ErrMsg.get_message('invalid_url')}
@@ -757,6 +1334,7 @@ class Url(Str):
 
 
 class Email(Str):
+    __slots__ = ()
     regex = r'^\w+([-+.]\w+)*@\w+([-.]\w+)*\.\w+([-.]\w+)*$'
     err_msg = {'invalid': ErrMsg.get_message('invalid_email')}
 
@@ -768,8 +1346,10 @@ class Email(Str):
 
 
 class Phone(Number):
+    __slots__ = ()
     regex = r'0?(13|14|15|16|17|18|19)[0-9]{9}'
     cvt_type = str
+    native_types = ()
     err_msg = {'invalid': ErrMsg.get_message('invalid_phone')}
 
     def __init__(self, *, length: int = 11, **kwargs: Any):
@@ -780,6 +1360,7 @@ class Phone(Number):
 
 
 class IDCard(Str):
+    __slots__ = ()
     len18 = (r"(?:1[1-5]|2[1-3]|3[1-7]|4[1-6]|5[0-4]|6[1-5])\d{4}(?:1[89]|20)"
              r"\d{2}(?:0[1-9]|1[0-2])(?:0[1-9]|[12]\d|3[01])\d{3}(?:\d|[xX])")
     len15 = (r"(?:1[1-5]|2[1-3]|3[1-7]|4[1-6]|5[0-4]|6[1-5])\d{4}"
@@ -798,6 +1379,7 @@ class IDCard(Str):
 
 
 class Username(Str):
+    __slots__ = ('_regex',)
     regex = r'^[a-zA-Z][a-zA-Z0-9_]{%d,%d}$'
     err_msg = {'invalid': ErrMsg.get_message('invalid_username')}
 
@@ -822,6 +1404,7 @@ class Username(Str):
 
 
 class Password(Str):
+    __slots__ = ('_length', '_regex')
     regex = r'^([a-zA-Z0-9_\-!=$@.#*&~^]){%d,%d}$'
     err_msg = {'invalid': ErrMsg.get_message('invalid_password')}
 
@@ -850,6 +1433,7 @@ class Order(Str):
 
     e.g: id asc,time desc / time desc
     '''
+    __slots__ = ('columns',)
 
     def __init__(self, _in: Union[list, tuple], **kwargs):
         self.columns = list(set(_in))
@@ -884,6 +1468,7 @@ class Order(Str):
 
 
 class IpAddr(Str):
+    __slots__ = ()
     ipv4 = (r"^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.)"
             r"{3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$")
     ipv6 = r'^(?:[A-F0-9]{1,4}:){7}[A-F0-9]{1,4}$'
@@ -904,6 +1489,7 @@ class IpAddr(Str):
 
 
 class Jsonify(Field):
+    __slots__ = ()
     err_msg = {'invalid': ErrMsg.get_message('invalid_json')}
 
     def __init__(self, **kwargs: Any):
@@ -1,13 +1,21 @@
+import asyncio
+import importlib
+import sys
+import time
 import types
-from typing import Any, Awaitable, List, Union
-from copy import deepcopy
+from typing import (Any, Awaitable, Callable, Hashable, Iterable, List,
+                    Optional, Union)
+from copy import copy
 
 from . import FormABC
+from . import capture, instrument
 from .fields import Field, Nested
 from .binding import DataBinding
+from .cache import LRUCache
+from .schedule import Scheduler
 from .utils import FrozenDict
 
-__all__ = ['Form', 'SubmitForm']
+__all__ = ['Form', 'SubmitForm', 'import_form']
 
 '''
 Web request object.
@@ -16,6 +24,9 @@ e.g:
 '''
 _REQUEST = 'Request'
 
+# subset plans cached per form class, see Form._plan
+PLANS_SIZE = 128
+
 FORM_TYPE_MAPS = FrozenDict({
     str: 'str',
     int: 'int',
@@ -25,31 +36,104 @@ FORM_TYPE_MAPS = FrozenDict({
 })
 
 
+def _data_keys(fields: dict, prefix: str = '') -> frozenset:
+    '''
+    Request keys used by fields, nested keys are joined with "."
+    '''
+    keys = set()
+    for field in fields.values():
+        # share the data_key strings
+        key = f'{prefix}{field.data_key}' if prefix else field.data_key
+        if isinstance(field, Nested):
+            keys.update(_data_keys(field.schema.__fields__, f'{key}.'))
+        else:
+            keys.add(key)
+    return frozenset(keys)
+
+
+def _present(value: Any) -> bool:
+    '''
+    The request has the value of the field, see Form.bind partial
+    '''
+    if value is None or value == []:
+        return False
+    if isinstance(value, dict):
+        # missing nested schemas are extracted as {} or {name: None}
+        return any(_present(item) for item in value.values())
+    return True
+
+
+def _declared_fields(klass: type) -> dict:
+    '''
+    Fields declared by the class itself, plain mixins included.
+    '''
+    declared = klass.__dict__.get('__declared_fields__')
+    if declared is not None:
+        return declared
+    declared = {}
+    for fname, fvalue in klass.__dict__.items():
+        if isinstance(fvalue, Field):
+            if not fvalue.data_key:
+                fvalue.data_key = fname
+            declared[fname] = fvalue
+    return declared
+
+
 class FormMeta(type):
     def __new__(cls, name: str, bases: tuple, attrs: dict):
         # meta = attrs.get('Meta')
         if name == 'Form':
             return super().__new__(cls, name, bases, attrs)
-        fields = {}
+        declared = {}
         for fname, fvalue in attrs.items():
             if isinstance(fvalue, Field):
-                fields[fname] = fvalue
+                declared[fname] = fvalue
                 if not fvalue.data_key:
                     fvalue.data_key = fname
 
-        parent_fields = {}
-        for base in bases:
-            if not hasattr(base, '__fields__'):
-                continue
-            parent_fields = deepcopy(base.__fields__)
-
         # delete attrs field
-        for key, _ in fields.items():
+        for key in declared:
             del attrs[key]
-        if parent_fields:
-            fields = {**parent_fields, **fields}
-        attrs['__fields__'] = fields
-        return super().__new__(cls, name, bases, attrs)
+        attrs['__declared_fields__'] = declared
+        new_cls = super().__new__(cls, name, bases, attrs)
+
+        # parent fields are shared like the instances of one form share
+        # fields, the first class of the MRO declaring a name wins, same
+        # as attribute lookup
+        fields = {}
+        for klass in reversed(new_cls.__mro__):
+            if klass is not object:
+                fields.update(_declared_fields(klass))
+        new_cls.__fields__ = fields
+        # fields extracted from the request, the subset plans also
+        # extract the fields they refer to, see Form._subset
+        new_cls.__extract__ = fields
+        new_cls.__data_keys__ = _data_keys(fields)
+        # result cache is not inherited
+        cache = attrs.get('__cache__')
+        if cache is not None:
+            impure = [key for key, field in fields.items()
+                      if not field.is_pure]
+            if impure:
+                raise ValueError(f'{name}.__cache__ requires pure fields, '
+                                 f'impure: {", ".join(impure)}')
+        new_cls.__cache__ = cache
+        # inherited fail-fast forms get their own statistics
+        fail_fast = getattr(new_cls, '__fail_fast__', False)
+        scheduler = None
+        if isinstance(fail_fast, Scheduler):
+            scheduler = fail_fast if attrs.get('__fail_fast__') is fail_fast \
+                else fail_fast.new()
+        elif fail_fast:
+            scheduler = Scheduler()
+        if scheduler is not None:
+            scheduler.setup(fields)
+        new_cls.__scheduler__ = scheduler
+        # subset plans of bind(only/exclude/partial), built on first use
+        new_cls.__plans__ = None
+        # form identity of the captured data, see xform.capture
+        new_cls.__capture__ = f'{new_cls.__module__}:{new_cls.__qualname__}'
+        return new_cls
 
 
 class Form(FormABC, metaclass=FormMeta):
@@ -68,63 +152,401 @@ class Form(FormABC, metaclass=FormMeta):
         datas, errors = await user.bind(self.request)
         print(errors)
         print(datas)
+
+    Cache the results of pure forms(see xform.cache.ResultCache)::
+
+        class SearchForm(Form):
+            __cache__ = ResultCache(maxsize=1024, ttl=60)
+            keyword = Str(required=True)
+
+    Stop at the first invalid field, cheap and often invalid fields
+    first(see xform.schedule.Scheduler)::
+
+        class SearchForm(Form):
+            __fail_fast__ = True
+            keyword = Str(required=True)
+
+    Bind a subset of the fields, e.g: PATCH::
+
+        data, errors = await user.bind(self.request, partial=True)
+        data, errors = await user.bind(self.request, only=('id', 'name'))
     '''
+    __cache__ = None
+    __capture__ = None
+    __fail_fast__ = False
+    __scheduler__ = None
+    __plans__ = None
 
     def __getattr__(self, key: str):
         return self.__fields__[key]
 
     async def _bind(self,
                     data: dict,
-                    translate: callable = None
+                    translate: callable = None,
+                    keys: dict = None,
+                    deadline: float = None
                     ) -> Awaitable[tuple]:
+        '''
+        :param keys: `<dict>` collect error keys, {name: error_key}
+        :param deadline: `<float>` loop time, see bind
+        '''
+        if self.__scheduler__ is not None:
+            return await self._scheduled_bind(data, translate, keys=keys,
+                                              deadline=deadline)
         ret, err, data = {}, {}, data or {}
         for name, field in self.__fields__.items():
-            validate = await field._run_validate(data.get(name),
-                                                 name,
-                                                 data,
-                                                 translate=translate)
+            if field.is_async:
+                # fields keep the bind state, isolate concurrent binds
+                field = copy(field)
+            validate = field._run_validate(data.get(name),
+                                           name,
+                                           data,
+                                           translate=translate)
+            if deadline is not None:
+                validate = field._run_until(validate, deadline, translate)
+            validate = await validate
             if not validate.is_valid:
                 err[field.data_key] = validate.error
+                if keys is not None:
+                    keys[name] = validate.error_key
             else:
                 ret[name] = validate.get_value()
         return ret, err
 
+    async def _bind_instrumented(self,
+                                 data: dict,
+                                 translate: callable = None,
+                                 keys: dict = None,
+                                 deadline: float = None
+                                 ) -> Awaitable[tuple]:
+        if self.__scheduler__ is not None:
+            return await self._scheduled_bind(data, translate, keys=keys,
+                                              deadline=deadline,
+                                              instrumented=True)
+        ret, err, data = {}, {}, data or {}
+        hook, observer = instrument.hook, instrument.observer
+        form = self.__class__.__name__
+        for name, field in self.__fields__.items():
+            timed = observer is not None and field.is_async
+            if field.is_async:
+                field = copy(field)
+                start = time.perf_counter()
+            if hook is not None:
+                validate = field._run_validate_traced(
+                    data.get(name), name, data, translate=translate,
+                    hook=hook, form=form)
+            else:
+                validate = field._run_validate(data.get(name),
+                                               name,
+                                               data,
+                                               translate=translate)
+            if deadline is not None:
+                validate = field._run_until(validate, deadline, translate)
+            validate = await validate
+            if timed:
+                observer.validator(form, name, time.perf_counter() - start)
+            if not validate.is_valid:
+                err[field.data_key] = validate.error
+                if keys is not None:
+                    keys[name] = validate.error_key
+            else:
+                ret[name] = validate.get_value()
+        return ret, err
+
+    async def _scheduled_bind(self,
+                              data: dict,
+                              translate: callable = None,
+                              keys: dict = None,
+                              deadline: float = None,
+                              instrumented: bool = False
+                              ) -> Awaitable[tuple]:
+        '''
+        Fail-fast bind in the scheduler order, stops at the first invalid
+        field.
+        '''
+        scheduler, fields = self.__scheduler__, self.__fields__
+        data = data or {}
+        hook = observer = None
+        if instrumented:
+            hook, observer = instrument.hook, instrument.observer
+        form = self.__class__.__name__
+        ret, err = {}, {}
+        order, timed = scheduler.order()
+        timed = timed or observer is not None
+        for name, plan in order:
+            field = fields[name]
+            if field.is_async or plan is not None:
+                field = copy(field)
+                field._validator_plan = plan if timed or plan is None \
+                    else (plan[0], None)
+            if timed:
+                start = time.perf_counter()
+            if hook is not None:
+                validate = field._run_validate_traced(
+                    data.get(name), name, data, translate=translate,
+                    hook=hook, form=form)
+            else:
+                validate = field._run_validate(data.get(name), name, data,
+                                               translate=translate)
+            if deadline is not None:
+                validate = field._run_until(validate, deadline, translate)
+            validate = await validate
+            if timed:
+                elapsed = time.perf_counter() - start
+                if observer is not None and field.is_async:
+                    observer.validator(form, name, elapsed)
+                scheduler.observe(name, elapsed, not validate.is_valid)
+            if not validate.is_valid:
+                err[field.data_key] = validate.error
+                if keys is not None:
+                    keys[name] = validate.error_key
+                break
+            ret[name] = validate.get_value()
+        if len(ret) > 1:
+            # declaration order, as the other binds
+            ret = {name: ret[name] for name in fields if name in ret}
+        return ret, err
+
+    async def _cached_bind(self,
+                           bind: callable,
+                           data: dict,
+                           translate: callable = None,
+                           locale: Any = None,
+                           keys: dict = None,
+                           deadline: float = None) -> Awaitable[tuple]:
+        cache = self.__cache__
+        key = cache.make_key(data, locale)
+        if key is not None:
+            result = cache.get(key)
+            if result is not None:
+                if keys is not None:
+                    keys.update(result[2])
+                return dict(result[0]), dict(result[1])
+        _keys = {}
+        ret, err = await bind(data, translate=translate, keys=_keys,
+                              deadline=deadline)
+        # don't cache timeout
+        if key is not None and not any(
+                self.__fields__[name].timeout_error == error_key
+                for name, error_key in _keys.items()):
+            cache.set(key, (dict(ret), dict(err), _keys))
+        if keys is not None:
+            keys.update(_keys)
+        return ret, err
+
+    def _subset(self, names: frozenset) -> 'Form':
+        '''
+        Copy of the form binding the fields of `names`.
+        '''
+        cls = self.__class__
+        fields = {name: field for name, field in cls.__fields__.items()
+                  if name in names}
+        extract = dict(fields)
+        for field in fields.values():
+            for name in (field.when_field,
+                         getattr(field, 'start_field', None)):
+                if name in cls.__fields__:
+                    extract.setdefault(name, cls.__fields__[name])
+        plan = cls.__new__(cls)
+        plan.__fields__ = fields
+        plan.__extract__ = extract
+        plan.__data_keys__ = _data_keys(extract)
+        # the cached results and captured data are those of all fields
+        plan.__cache__ = None
+        plan.__capture__ = None
+        scheduler = cls.__scheduler__
+        if scheduler is not None:
+            scheduler = scheduler.new()
+            scheduler.setup(fields)
+        plan.__scheduler__ = scheduler
+        return plan
+
+    def _cached_subset(self, key: Hashable, names: Callable) -> 'Form':
+        cls = self.__class__
+        if cls.__plans__ is None:
+            cls.__plans__ = LRUCache(maxsize=PLANS_SIZE)
+        plan = cls.__plans__.get(key)
+        if plan is None:
+            plan = self._subset(names())
+            cls.__plans__.set(key, plan)
+        return plan
+
+    def _plan(self,
+              only: Iterable[str] = None,
+              exclude: Iterable[str] = None) -> 'Form':
+        '''
+        Subset plan of bind(only/exclude), cached by form class.
+        '''
+        only = None if only is None else tuple(only)
+        exclude = tuple(exclude or ())
+
+        def names() -> frozenset:
+            fields = self.__class__.__fields__
+            selected = set(fields if only is None else only)
+            unknown = selected.union(exclude).difference(fields)
+            if unknown:
+                raise ValueError(f'{self.__class__.__name__} has no fields: '
+                                 f'{", ".join(sorted(unknown))}')
+            return frozenset(selected.difference(exclude))
+
+        return self._cached_subset((only, exclude), names)
+
+    def _partial(self, data: Optional[dict]) -> 'Form':
+        '''
+        Subset plan of the fields present in the extracted data.
+        '''
+        data = data or {}
+        names = frozenset(name for name in self.__fields__
+                          if _present(data.get(name)))
+        if len(names) == len(self.__fields__):
+            return self
+        return self._cached_subset(names, lambda: names)
+
+    @staticmethod
+    def _deadline(deadline: Optional[float]) -> Optional[float]:
+        if deadline is None:
+            return None
+        return asyncio.get_event_loop().time() + deadline
+
     async def bind(self,
                    request: _REQUEST,
-                   locations: Union[tuple, str] = None) -> Awaitable[tuple]:
+                   locations: Union[tuple, str] = None,
+                   deadline: float = None,
+                   partial: bool = False,
+                   only: Iterable[str] = None,
+                   exclude: Iterable[str] = None) -> Awaitable[tuple]:
         '''Bind data from request.
 
         Bind data and check the accuracy of data.
 
         :param request: e.g: tornado.web.RequestHandler
         :param locations: `<uple/str>` form/json/query/headers/cookies
+        :param deadline: `<float>` seconds, checked before each field,
+            in-flight async validation is cancelled, the remaining
+            fields get the timeout error(see Field timeout_error)
+        :param partial: `<bool>` validate only the fields present in the
+            request(not None), e.g: PATCH
+        :param only: `<list>` names of the fields to extract and validate
+        :param exclude: `<list>` names of the fields to skip
 
         :return: `<tuple>` (data, error)
         '''
-        _bind = DataBinding(request, self.__fields__, locations=locations)
+        if only is not None or exclude is not None:
+            return await self._plan(only, exclude).bind(
+                request, locations=locations, deadline=deadline,
+                partial=partial)
+        deadline = self._deadline(deadline)
+        if instrument.enabled:
+            return await self._instrumented_bind(request, locations,
+                                                 deadline, partial)
+        _bind = DataBinding(request, self.__extract__, locations=locations,
+                            keys=self.__data_keys__, name=self.__capture__)
         data = await _bind.bind()
-        return await self._bind(data, translate=_bind.translate)
+        form = self._partial(data) if partial else self
+        if form.__cache__ is not None:
+            return await form._cached_bind(form._bind, data, _bind.translate,
+                                           _bind.request.get_locale(),
+                                           deadline=deadline)
+        return await form._bind(data, translate=_bind.translate,
+                                deadline=deadline)
+
+    async def _instrumented_bind(self,
+                                 request: _REQUEST,
+                                 locations: Union[tuple, str] = None,
+                                 deadline: float = None,
+                                 partial: bool = False
+                                 ) -> Awaitable[tuple]:
+        hook, observer = instrument.hook, instrument.observer
+        form, start = self.__class__.__name__, time.perf_counter()
+        with instrument.span(hook, 'bind', form) as span:
+            with instrument.span(hook, 'stage', form, stage='extract'):
+                _bind = DataBinding(request, self.__extract__,
+                                    locations=locations,
+                                    keys=self.__data_keys__,
+                                    name=self.__capture__)
+                data = await _bind.bind()
+            keys = {}
+            plan = self._partial(data) if partial else self
+            if plan.__cache__ is not None:
+                ret, err = await plan._cached_bind(
+                    plan._bind_instrumented, data, _bind.translate,
+                    _bind.request.get_locale(), keys=keys, deadline=deadline)
+            else:
+                ret, err = await plan._bind_instrumented(
+                    data, _bind.translate, keys=keys, deadline=deadline)
+            span.error = err
+        if observer is not None:
+            observer.bind(self, time.perf_counter() - start, err, keys)
+        return ret, err
 
     def dict_bind(self,
                   data: dict,
-                  request: _REQUEST = None
+                  request: _REQUEST = None,
+                  deadline: float = None,
+                  partial: bool = False,
+                  only: Iterable[str] = None,
+                  exclude: Iterable[str] = None
                   ) -> Awaitable[tuple]:
         '''Check the accuracy of data.
 
         :param data: `<dict>`
         :param request: e.g: tornado.web.RequestHandler
+        :param deadline: `<float>` seconds, see bind
+        :param partial: `<bool>` see bind
+        :param only: `<list>` see bind
+        :param exclude: `<list>` see bind
 
         :return: `<tuple>` (data, error)
         '''
+        if only is not None or exclude is not None:
+            return self._plan(only, exclude).dict_bind(
+                data, request=request, deadline=deadline, partial=partial)
         translate: callable = None
+        locale: Any = None
         if request:
             if isinstance(request, (types.FunctionType, types.MethodType)):
-                translate = request
+                # unknown locale, cache by the translate function
+                translate = locale = request
             else:
                 _bind = DataBinding(request, data)
                 translate = _bind.translate
-        _data = DataBinding.dict_binding(self.__fields__, data)
-        return self._bind(_data, translate=translate)
+                locale = _bind.request.get_locale()
+        deadline = self._deadline(deadline)
+        if instrument.enabled:
+            return self._instrumented_dict_bind(data, translate, locale,
+                                                deadline, partial)
+        _data = DataBinding.dict_binding(self.__extract__, data)
+        form = self._partial(_data) if partial else self
+        if form.__cache__ is not None:
+            return form._cached_bind(form._bind, _data, translate, locale,
+                                     deadline=deadline)
+        return form._bind(_data, translate=translate, deadline=deadline)
+
+    async def _instrumented_dict_bind(self,
+                                      data: dict,
+                                      translate: callable = None,
+                                      locale: Any = None,
+                                      deadline: float = None,
+                                      partial: bool = False
+                                      ) -> Awaitable[tuple]:
+        hook, observer = instrument.hook, instrument.observer
+        form, start = self.__class__.__name__, time.perf_counter()
+        with instrument.span(hook, 'bind', form) as span:
+            with instrument.span(hook, 'stage', form, stage='extract'):
+                _data = DataBinding.dict_binding(self.__extract__, data)
+            keys = {}
+            plan = self._partial(_data) if partial else self
+            if plan.__cache__ is not None:
+                ret, err = await plan._cached_bind(
+                    plan._bind_instrumented, _data, translate, locale,
+                    keys=keys, deadline=deadline)
+            else:
+                ret, err = await plan._bind_instrumented(
+                    _data, translate, keys=keys, deadline=deadline)
+            span.error = err
+        if observer is not None:
+            observer.bind(self, time.perf_counter() - start, err, keys)
+        return ret, err
 
     def _fmt_detail(self, field: Field) -> dict:
         type_ = list if field.lst else (field.cvt_type or str)
@@ -181,11 +603,18 @@ class SubmitForm:
         )
         data, error = form.bind(request)
         print(data)
+
+    The captured data(see xform.capture) is named by the module:attr of
+    the form variable(looked up on the first bind with capture enabled),
+    or `__capture__`, e.g: for the forms created in functions::
+
+        form = SubmitForm(__capture__='app.views:user_form', ...)
     '''
 
     def __init__(self, **kwargs: Any):
-        self.__slots = frozenset(['_filter', 'bind'])
+        self.__slots = frozenset(['_filter', '_form', 'bind'])
         self.__form__ = None
+        self.__capture = kwargs.pop('__capture__', None)
         self.__fields__ = self._filter(kwargs)
 
     def _filter(self, fields: dict) -> dict:
@@ -204,19 +633,64 @@ class SubmitForm:
             f'{self.__class__.__name__} form does not bind initial'
         return getattr(self.__form__, key)
 
+    def _form(self) -> Form:
+        if not self.__form__:
+            form = type('SubmitForm', (Form,), dict(self.__fields__))
+            form.__capture__ = self.__capture
+            self.__form__ = form()
+        return self.__form__
+
+    def _capture_name(self) -> str:
+        for module in list(sys.modules.values()):
+            for attr, value in getattr(module, '__dict__', {}).items():
+                if value is self:
+                    return f'{module.__name__}:{attr}'
+        # not importable, distinct by the fields, see replay --form
+        return f'SubmitForm({",".join(self.__fields__)})'
+
     def bind(self,
              request: _REQUEST,
-             locations: Union[str, tuple] = None) -> Awaitable[tuple]:
+             locations: Union[str, tuple] = None,
+             deadline: float = None,
+             partial: bool = False,
+             only: Iterable[str] = None,
+             exclude: Iterable[str] = None) -> Awaitable[tuple]:
         '''Bind data from request.
 
         Bind data and check the accuracy of data.
 
         :param request: e.g: tornado.web.RequestHandler
         :param locations: `<uple/str>` form/json/query/headers/cookies
+        :param deadline: `<float>` seconds, see Form.bind
+        :param partial: `<bool>` see Form.bind
+        :param only: `<list>` see Form.bind
+        :param exclude: `<list>` see Form.bind
 
         :return: `<tuple>` (data, error)
         '''
-        if not self.__form__:
-            form = type('SubmitForm', (Form,), self.__fields__)
-            self.__form__ = form()
-        return self.__form__.bind(request, locations=locations)
+        form = self._form()
+        if capture.recorder is not None and form.__capture__ is None:
+            type(form).__capture__ = self._capture_name()
+        return form.bind(request, locations=locations, deadline=deadline,
+                         partial=partial, only=only, exclude=exclude)
+
+
+def import_form(path: str) -> Form:
+    '''
+    Form instance of "module:attr", attr is a Form class or instance, or
+    a SubmitForm.
+
+    :param path: `<str>` e.g: app.forms:UserForm
+    :return: `<Form>`
+    '''
+    module, _, name = path.partition(':')
+    value = importlib.import_module(module)
+    for attr in name.split('.'):
+        value = getattr(value, attr)
+    if isinstance(value, SubmitForm):
+        return value._form()
+    if isinstance(value, type) and issubclass(value, Form):
+        return value()
+    if isinstance(value, Form):
+        return value
+    raise TypeError(f'{path} is not a form')
@@ -1,7 +1,6 @@
 import threading
 
 from xform.adapters import BaseRequest
-from xform.adapters.tornado import TornadoRequest
 
 __all__ = ['HttpRequest']
 
@@ -20,6 +19,8 @@ class HttpRequest:
                 if request_proxy and issubclass(request_proxy, BaseRequest):
                     HttpRequest._request = request_proxy
                 else:
+                    # default adapter, imported only when used
+                    from xform.adapters.tornado import TornadoRequest
                     HttpRequest._request = TornadoRequest
         return HttpRequest._instance
 
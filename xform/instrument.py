@@ -0,0 +1,209 @@
+'''
+Instrumentation hooks.
+
+Report wall time of each bind, field and validation stage to the
+registered callbacks.
+
+usage::
+
+    from xform import instrument
+
+    def on_span(event, span):
+        # event: start/end
+        if event == 'end':
+            print(span.kind, span.form, span.field, span.stage, span.elapsed)
+
+    instrument.add_hook(on_span)
+
+Bind level observers(e.g xform.metrics) only receive the bind result
+and the latency of async validators, they don't pay for the spans.
+
+When no hook or observer is registered the cost is one attribute check
+per bind(`enabled`).
+'''
+import time
+from typing import Any, Callable, List, Optional
+
+__all__ = ['Span', 'Observer', 'span', 'add_hook', 'remove_hook', 'clear_hooks',
+           'set_observer', 'hook', 'observer', 'enabled']
+
+# span kinds
+BIND = 'bind'
+FIELD = 'field'
+STAGE = 'stage'
+
+# stage names
+STAGES = ('extract', 'required', 'length', 'when_field',
+          '_validate', 'validators')
+
+'''
+Current callback, None if no hook is registered.
+
+def hook(event: str, span: Span) -> None:
+    ...
+'''
+hook: Optional[Callable[[str, 'Span'], None]] = None
+_hooks: List[Callable[[str, 'Span'], None]] = []
+# bind level observer, see Observer
+observer: Optional['Observer'] = None
+# hook or observer registered
+enabled = False
+
+
+class Span:
+    '''
+    Timing span, used as context manager.
+
+    kind: bind/field/stage
+    form: form class name
+    field: field name, None for bind span
+    stage: see STAGES, None for bind/field span
+    error: error of the field/form after the span end
+    '''
+    __slots__ = ('hook', 'kind', 'form', 'field', 'stage',
+                 'start', 'end', 'error')
+
+    def __init__(self,
+                 hook: Callable[[str, 'Span'], None],
+                 kind: str,
+                 form: str,
+                 field: str = None,
+                 stage: str = None) -> None:
+        self.hook = hook
+        self.kind = kind
+        self.form = form
+        self.field = field
+        self.stage = stage
+        self.start = self.end = 0.0
+        self.error = None
+
+    @property
+    def elapsed(self) -> float:
+        '''
+        :return: `<float>` seconds
+        '''
+        return self.end - self.start
+
+    def __enter__(self) -> 'Span':
+        self.start = time.perf_counter()
+        self.hook('start', self)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.end = time.perf_counter()
+        self.hook('end', self)
+
+    def __repr__(self) -> str:
+        return (f'<Span {self.kind} form={self.form} field={self.field} '
+                f'stage={self.stage} elapsed={self.elapsed:.6f}>')
+
+
+class _NullSpan:
+    '''
+    Used when no hook is registered.
+    '''
+    error = None
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(hook: Optional[Callable[[str, Span], None]],
+         kind: str,
+         form: str,
+         field: str = None,
+         stage: str = None) -> Span:
+    '''
+    Create span, no-op span if hook is None.
+    '''
+    if hook is None:
+        return _NULL_SPAN
+    return Span(hook, kind, form, field, stage)
+
+
+class Observer:
+    '''
+    Bind level observer.
+    '''
+
+    def bind(self, form: Any, elapsed: float, error: dict,
+             keys: dict) -> None:
+        '''
+        Called after each Form.bind/dict_bind.
+
+        :param form: `<Form>` bound form
+        :param elapsed: `<float>` seconds
+        :param error: `<dict>` bind error
+        :param keys: `<dict>` error key of invalid fields, {name: error_key}
+        '''
+
+    def validator(self, form: str, field: str, elapsed: float) -> None:
+        '''
+        Called after each field with async validation(Field.is_async).
+
+        :param form: `<str>` form name
+        :param field: `<str>` field name
+        :param elapsed: `<float>` seconds
+        '''
+
+
+def _dispatch(event: str, span: Span) -> None:
+    for callback in _hooks:
+        callback(event, span)
+
+
+def _refresh() -> None:
+    global hook, enabled
+    if not _hooks:
+        hook = None
+    elif len(_hooks) == 1:
+        hook = _hooks[0]
+    else:
+        hook = _dispatch
+    enabled = hook is not None or observer is not None
+
+
+def add_hook(callback: Callable[[str, Span], None]) -> None:
+    '''
+    Register instrument callback.
+
+    :param callback: `<callable>` callback(event, span)
+    '''
+    if not callable(callback):
+        raise ValueError('Hook must be a callable')
+    if callback not in _hooks:
+        _hooks.append(callback)
+    _refresh()
+
+
+def remove_hook(callback: Callable[[str, Span], None]) -> None:
+    '''
+    Unregister instrument callback.
+
+    :param callback: `<callable>`
+    '''
+    if callback in _hooks:
+        _hooks.remove(callback)
+    _refresh()
+
+
+def clear_hooks() -> None:
+    _hooks.clear()
+    _refresh()
+
+
+def set_observer(value: Optional[Observer]) -> None:
+    '''
+    Set bind level observer, None to remove.
+
+    :param value: `<Observer>`
+    '''
+    global observer
+    observer = value
+    _refresh()
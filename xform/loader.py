@@ -0,0 +1,199 @@
+'''
+Batch loading of async lookups.
+
+Lookups of all the binds in flight on the event loop are collected over
+one loop tick(or `window` seconds) and sent as one batch.
+
+See the BatchLoader/BatchField class for more information.
+'''
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, Iterable, List, \
+    Optional, Union
+
+from .fields import Field, VALUE_TYPES
+from .messages import ErrMsg
+
+__all__ = ['BatchLoader', 'BatchField']
+
+BATCH_RESULT = Union[dict, list]
+
+
+class BatchLoader:
+    '''
+    DataLoader style batching.
+
+    usage::
+
+        async def load_users(ids: list) -> dict:
+            rows = await db.fetch('select * from user where id in $1', ids)
+            return {row['id']: row for row in rows}
+
+        loader = BatchLoader(load_users)
+        # concurrent loads in the same tick -> load_users([1, 2])
+        user1, user2 = await asyncio.gather(loader.load(1), loader.load(2))
+    '''
+
+    def __init__(self,
+                 batch_load: Callable[[list], Awaitable[BATCH_RESULT]],
+                 window: float = 0,
+                 max_batch: int = 1000) -> None:
+        '''
+        :param batch_load: `<callable>` async batch_load(keys), return
+            dict {key: value} or list in keys order, missing key is None
+        :param window: `<float>` seconds to collect keys, 0 one loop tick
+        :param max_batch: `<int>` maximum keys of one batch
+        '''
+        self.batch_load = batch_load
+        self.window = window
+        self.max_batch = max_batch
+        self._loop = None
+        # {key: [future of each load]}
+        self._pending = {}
+        self._handle = None
+        self.batches = self.loads = 0
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self.window > 0:
+            self._handle = loop.call_later(self.window, self._dispatch)
+        else:
+            self._handle = loop.call_soon(self._dispatch)
+
+    def load(self, key: Hashable) -> Awaitable[Any]:
+        '''
+        :param key: `<Hashable>`
+        :return: `<Future>` loaded value, None if not exist, cancelling
+            it(timeout, deadline) doesn't cancel the other loads of key
+        '''
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            # e.g: asyncio.run() in tests, drop the pending of closed loop
+            self._loop, self._pending, self._handle = loop, {}, None
+        self.loads += 1
+        future = loop.create_future()
+        waiters = self._pending.get(key)
+        if waiters is not None:
+            waiters.append(future)
+        else:
+            self._pending[key] = [future]
+            if len(self._pending) >= self.max_batch:
+                if self._handle is not None:
+                    self._handle.cancel()
+                self._dispatch()
+            elif self._handle is None:
+                self._schedule(loop)
+        return future
+
+    def load_many(self, keys: Iterable[Hashable]) -> Awaitable[List[Any]]:
+        '''
+        :param keys: `<list>`
+        :return: `<Future>` loaded values in keys order
+        '''
+        return asyncio.gather(*[self.load(key) for key in keys])
+
+    def _dispatch(self) -> None:
+        pending, self._pending, self._handle = self._pending, {}, None
+        if pending:
+            self.batches += 1
+            asyncio.ensure_future(self._load_batch(pending), loop=self._loop)
+
+    async def _load_batch(self, pending: dict) -> None:
+        keys = list(pending)
+        try:
+            result = await self.batch_load(keys)
+            if not isinstance(result, dict):
+                result = dict(zip(keys, result))
+        except Exception as exc:
+            for waiters in pending.values():
+                for future in waiters:
+                    # cancelled loads are done
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+        for key, waiters in pending.items():
+            value = result.get(key)
+            for future in waiters:
+                if not future.done():
+                    future.set_result(value)
+
+    def stats(self) -> dict:
+        '''
+        :return: `<dict>` loads/batches/keys_per_batch
+        '''
+        return dict(loads=self.loads,
+                    batches=self.batches,
+                    keys_per_batch=self.loads / self.batches
+                    if self.batches else 0.0)
+
+
+class BatchField(Field):
+    '''
+    Async lookup field, lookups are batched by BatchLoader.
+
+    With lst=True every element is looked up in the same batch.
+
+    usage::
+
+        class UserField(BatchField):
+            async def batch_load(self, keys: list) -> dict:
+                users = await UserCache.get_many(keys)
+                return {user.id: user for user in users}
+
+        form = SubmitForm(
+            user=UserField(required=True, key_type=int),
+            members=UserField(lst=True, key_type=int)
+        )
+    '''
+    __slots__ = ('key_type', 'loader')
+    err_msg = {
+        'invalid': ErrMsg.get_message('default_invalid'),
+        'not_exist': ErrMsg.get_message('not_exist')
+    }
+
+    def __init__(self,
+                 *,
+                 key_type: Optional[Callable[[Any], Hashable]] = None,
+                 window: float = 0,
+                 max_batch: int = 1000,
+                 **kwargs: Any) -> None:
+        '''
+        :param key_type: `<callable>` convert request value to key,
+            e.g: int
+        :param window: `<float>` see BatchLoader
+        :param max_batch: `<int>` see BatchLoader
+        '''
+        self.key_type = key_type
+        self.loader = BatchLoader(self.batch_load, window=window,
+                                  max_batch=max_batch)
+        super().__init__(**kwargs)
+
+    async def batch_load(self, keys: list) -> BATCH_RESULT:
+        '''
+        Load values of keys.
+
+        :param keys: `<list>`
+        :return: `<dict/list>` {key: value} or list in keys order
+        '''
+        raise NotImplementedError
+
+    def get_value(self):
+        if self.is_valid and self.value is not None:
+            return self.value
+        return self.default
+
+    async def _validate(self, value: Union[VALUE_TYPES, list], attr: str,
+                        data: dict) -> Optional[Any]:
+        values = value if self.lst else [value]
+        try:
+            keys = [self.key_type(val) for val in values] \
+                if self.key_type else values
+        except (TypeError, ValueError):
+            self.set_error('invalid')
+            return None
+        if self.lst:
+            ret = await self.loader.load_many(keys)
+        else:
+            ret = [await self.loader.load(keys[0])]
+        if any(val is None for val in ret):
+            self.set_error('not_exist')
+            return None
+        return ret if self.lst else ret[0]
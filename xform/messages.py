@@ -31,7 +31,9 @@ _err_msgs = {
     'invalid_password': 'The password string entered is invalid',
     'invalid_ip': 'Invalid Ip Address',
     'invalid_json': 'Json data format error',
-    'invalid_option': 'Invalid option value'
+    'invalid_option': 'Invalid option value',
+    'not_exist': 'Does not exist',
+    'timeout': 'Validation timed out'
 }
 
 
@@ -0,0 +1,247 @@
+'''
+Validation metrics.
+
+In-process counters and histograms of Form.bind/dict_bind, rendered in
+Prometheus text format.
+
+usage::
+
+    from xform import metrics
+
+    metrics.enable()
+
+    # e.g: tornado handler
+    class MetricsHandler(tornado.web.RequestHandler):
+        def get(self):
+            self.set_header('Content-Type', metrics.CONTENT_TYPE)
+            self.write(metrics.render_prometheus())
+
+Metrics:
+    xform_binds_total{form,result}
+    xform_field_errors_total{form,field,key}
+    xform_bind_duration_seconds{form}
+    xform_async_validator_duration_seconds{form,field}
+
+Updates don't take any lock, the lock is only used to create a new series.
+'''
+import bisect
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import instrument
+
+__all__ = ['CONTENT_TYPE', 'Counter', 'Histogram', 'Registry',
+           'enable', 'disable', 'get_registry', 'render_prometheus']
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+                   0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace(
+        '"', r'\"')
+
+
+def _fmt_labels(names: Tuple[str, ...], values: tuple,
+                extra: str = None) -> str:
+    labels = [f'{name}="{_escape(value)}"'
+              for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+    return '{%s}' % ','.join(labels) if labels else ''
+
+
+def _fmt_number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    type_ = ''
+
+    def __init__(self, name: str, doc: str, labels: Iterable[str]) -> None:
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self._series: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _new(self) -> Any:
+        raise NotImplementedError
+
+    def _get(self, key: tuple) -> Any:
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = self._new()
+        return series
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series = {}
+
+    def _render(self, key: tuple, series: Any) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.doc}',
+                 f'# TYPE {self.name} {self.type_}']
+        for key, series in sorted(self._series.items()):
+            lines.extend(self._render(key, series))
+        return lines
+
+
+class Counter(_Metric):
+    type_ = 'counter'
+
+    def _new(self) -> list:
+        return [0]
+
+    def inc(self, *labels: Any, value: float = 1) -> None:
+        self._get(labels)[0] += value
+
+    def get(self, *labels: Any) -> float:
+        series = self._series.get(labels)
+        return series[0] if series else 0
+
+    def _render(self, key: tuple, series: list) -> List[str]:
+        return [f'{self.name}{_fmt_labels(self.labels, key)} '
+                f'{_fmt_number(series[0])}']
+
+
+class Histogram(_Metric):
+    '''
+    Series layout: [bucket counts..., +Inf count, sum]
+    '''
+    type_ = 'histogram'
+
+    def __init__(self, name: str, doc: str, labels: Iterable[str],
+                 buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new(self) -> list:
+        return [0] * (len(self.buckets) + 2)
+
+    def observe(self, value: float, *labels: Any) -> None:
+        series = self._get(labels)
+        # non-cumulative counts, accumulated on render
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def get(self, *labels: Any) -> Optional[Tuple[int, float]]:
+        '''
+        :return: `<tuple>` (count, sum)
+        '''
+        series = self._series.get(labels)
+        if not series:
+            return None
+        return sum(series[:-1]), series[-1]
+
+    def _render(self, key: tuple, series: list) -> List[str]:
+        lines, total = [], 0
+        for bound, count in zip(self.buckets + (float('inf'),), series):
+            total += count
+            le = 'le="%s"' % _fmt_number(bound)
+            lines.append(f'{self.name}_bucket'
+                         f'{_fmt_labels(self.labels, key, le)} {total}')
+        labels = _fmt_labels(self.labels, key)
+        lines.append(f'{self.name}_sum{labels} {_fmt_number(series[-1])}')
+        lines.append(f'{self.name}_count{labels} {total}')
+        return lines
+
+
+class Registry(instrument.Observer):
+    '''
+    Validation metrics registry, observe binds via xform.instrument.
+    '''
+
+    def __init__(self,
+                 prefix: str = 'xform',
+                 buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.binds = Counter(f'{prefix}_binds_total',
+                             'Form binds.', ('form', 'result'))
+        self.field_errors = Counter(f'{prefix}_field_errors_total',
+                                    'Field validation failures.',
+                                    ('form', 'field', 'key'))
+        self.bind_duration = Histogram(f'{prefix}_bind_duration_seconds',
+                                       'Form bind latency.', ('form',),
+                                       buckets)
+        self.validator_duration = Histogram(
+            f'{prefix}_async_validator_duration_seconds',
+            'Async field validation latency.', ('form', 'field'), buckets)
+        self.metrics = [self.binds, self.field_errors,
+                        self.bind_duration, self.validator_duration]
+
+    def bind(self, form: Any, elapsed: float, error: dict,
+             keys: dict) -> None:
+        name = form.__class__.__name__
+        self.bind_duration.observe(elapsed, name)
+        if not error:
+            self.binds.inc(name, 'ok')
+            return
+        self.binds.inc(name, 'error')
+        for fname, key in keys.items():
+            self.field_errors.inc(name, fname, key or 'invalid')
+
+    def validator(self, form: str, field: str, elapsed: float) -> None:
+        self.validator_duration.observe(elapsed, form, field)
+
+    def clear(self) -> None:
+        for metric in self.metrics:
+            metric.clear()
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+_registry: Optional[Registry] = None
+
+
+def get_registry() -> Registry:
+    '''
+    Return the default registry.
+    '''
+    global _registry
+    if _registry is None:
+        _registry = Registry()
+    return _registry
+
+
+def enable(registry: Registry = None) -> Registry:
+    '''
+    Start collecting metrics.
+
+    :param registry: `<Registry>` default registry if None
+    :return: `<Registry>`
+    '''
+    global _registry
+    if registry is not None:
+        _registry = registry
+    registry = get_registry()
+    instrument.set_observer(registry)
+    return registry
+
+
+def disable() -> None:
+    instrument.set_observer(None)
+
+
+def render_prometheus(registry: Registry = None) -> str:
+    '''
+    Render metrics in Prometheus text exposition format.
+
+    :param registry: `<Registry>` default registry if None
+    :return: `<str>`
+    '''
+    return (registry or get_registry()).render()
@@ -0,0 +1,437 @@
+'''
+Synthetic payloads of a form, for benchmarks, load tests and fuzzing.
+
+The values are derived from the field details(see
+Form.get_field_details: type, length, min/max, when_field) and the field
+classes, OneOf choices and nested schemas. A controlled invalid payload
+is a valid one with a single field broken(missing, too long, out of
+range, wrong format...), the expected data key and error key are
+returned with it.
+
+usage::
+
+    from xform.payloads import PayloadGenerator
+
+    gen = PayloadGenerator(UserForm, seed=1)
+    for payload in gen.stream(1000, invalid=0.2):
+        body = gen.encode(payload.data, 'json')
+        # payload.field/payload.error: None or e.g. 'email'/'invalid'
+
+    python -m xform generate app.forms:UserForm -n 1000 --invalid 0.2 \\
+        --format query --rate 200
+
+Custom fields are generated like Str unless they extend a built-in
+field, the custom `_validate` may reject the values.
+'''
+import datetime
+import itertools
+import random
+import time
+from collections import namedtuple
+from typing import Any, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+from . import fields as f
+from .form import Form, SubmitForm
+from .utils import json_dumps
+from .validate import OneOf
+
+__all__ = ['Payload', 'PayloadGenerator', 'FORMATS', 'throttle']
+
+FORMATS = ('json', 'urlencoded', 'query')
+
+# data: {data_key: value}, field/error: data key and error key(e.g:
+# required/length/invalid/min_invalid) of the broken field, None if valid
+Payload = namedtuple('Payload', 'data field error')
+
+# removes the key from the payload
+MISSING = object()
+
+_BASE_DATE = datetime.datetime(2021, 1, 1, 8, 30, 0)
+
+
+def _form_instance(form: Any) -> Form:
+    if isinstance(form, SubmitForm):
+        return form._form()
+    if isinstance(form, type):
+        return form()
+    return form
+
+
+def _choices(field: f.Field) -> Optional[list]:
+    for validator in field.validators:
+        if isinstance(validator, OneOf):
+            return list(validator.choices)
+    return None
+
+
+class PayloadGenerator:
+    '''
+    Valid and controlled invalid payloads of a form.
+    '''
+
+    def __init__(self,
+                 form: Union[type, Form, SubmitForm],
+                 seed: int = None,
+                 optional: float = 0.8,
+                 list_size: Union[int, Tuple[int, int]] = (1, 5),
+                 errors: Tuple[str, ...] = None) -> None:
+        '''
+        :param form: `<Form>` form class or instance, or SubmitForm
+        :param seed: `<int>` the same payloads for the same seed
+        :param optional: `<float>` 0-1, probability of each optional
+            field in the payload
+        :param list_size: `<int/tuple>` items of list fields, bounded by
+            the field min_len/max_len
+        :param errors: `<tuple>` error keys of the invalid payloads,
+            e.g: ('required', 'length'), default all
+        '''
+        self.form = _form_instance(form)
+        self.random = random.Random(seed)
+        self.optional = optional
+        self.list_size = (list_size, list_size) \
+            if isinstance(list_size, int) else tuple(list_size)
+        self.errors = errors
+        self._counter = itertools.count(1)
+
+    # valid values
+
+    def _text(self, length: Union[int, tuple],
+              alphabet: str = 'abcdefghijklmnop') -> str:
+        low, high = 1, 12
+        if isinstance(length, int):
+            low = high = length
+        elif isinstance(length, tuple):
+            low = max(length[0], 1)
+            high = max(min(length[1], 16), low)
+        size = self.random.randint(low, high)
+        return ''.join(self.random.choice(alphabet) for _ in range(size))
+
+    def _number(self, field: f.Number) -> Union[int, float]:
+        low = field._min if field._min is not None else 0
+        high = field._max if field._max is not None else low + 10000
+        if isinstance(field, f.Integer):
+            return self.random.randint(int(low), int(high))
+        return round(self.random.uniform(low, high), 2)
+
+    def _date(self) -> datetime.datetime:
+        return _BASE_DATE + datetime.timedelta(
+            days=self.random.randint(0, 365))
+
+    def _items(self, field: f.List) -> int:
+        low = max(self.list_size[0], field._min_len)
+        high = self.list_size[1]
+        if field._max_len:
+            high = min(high, field._max_len)
+        return self.random.randint(low, max(low, high))
+
+    def valid_value(self, field: f.Field, data: dict = None) -> Any:
+        '''
+        :param field: `<Field>`
+        :param data: `<dict>` generated {name: value} of the other
+            fields, used by EndedDate
+        :return: `<Any>` JSON value accepted by the field
+        '''
+        choices = _choices(field)
+        if choices:
+            return self.random.choice(choices)
+        n = next(self._counter)
+        if isinstance(field, f.Nested):
+            return self.valid(field.schema).data
+        if isinstance(field, f.IntList):
+            low = field._min if field._min is not None else 1
+            high = field._max if field._max is not None else low + 100000
+            return [self.random.randint(low, high)
+                    for _ in range(self._items(field))]
+        if isinstance(field, f.List):
+            return [f'item{n}{i}' for i in range(self._items(field))]
+        if isinstance(field, f.Boolean):
+            return self.random.choice((True, False))
+        if isinstance(field, f.Phone):
+            return '138' + ''.join(self.random.choice('0123456789')
+                                   for _ in range(8))
+        if isinstance(field, f.Timestamp):
+            seconds = int(self._date().timestamp())
+            return seconds * 1000 if isinstance(field.length, int) and \
+                field.length >= 13 else seconds
+        if isinstance(field, f.Number):
+            return self._number(field)
+        if isinstance(field, f.EndedDate):
+            start = (data or {}).get(field.start_field)
+            try:
+                start = datetime.datetime.strptime(start, field.fmt)
+            except (TypeError, ValueError):
+                start = self._date()
+            return (start + datetime.timedelta(
+                days=self.random.randint(0, 30))).strftime(field.fmt)
+        if isinstance(field, f.DateTime):
+            return self._date().strftime(field.fmt)
+        if isinstance(field, f.Time):
+            return str(int(self._date().timestamp()))
+        if isinstance(field, f.Email):
+            return f'user{n}@example.com'
+        if isinstance(field, f.Url):
+            return f'https://example.com/{n}'
+        if isinstance(field, f.IDCard):
+            return f'110101199001{self.random.randint(10, 28)}123X'
+        if isinstance(field, f.Username):
+            return 'u' + self._text(field.length,
+                                    'abcdefghijklmnop0123456789')[1:]
+        if isinstance(field, f.Password):
+            return self._text(field._length, 'abcdefABCDEF0123456789_')
+        if isinstance(field, f.Order):
+            return f'{self.random.choice(field.columns)} ' \
+                f'{self.random.choice(("asc", "desc"))}'
+        if isinstance(field, f.IpAddr):
+            return f'10.0.{self.random.randint(0, 255)}.' \
+                f'{self.random.randint(1, 254)}'
+        if isinstance(field, f.Jsonify):
+            return {'id': n, 'name': f'name{n}'}
+        if isinstance(field, f.EnStr) and field.regex == f.EnStr.upper:
+            return self._text(field.length, 'ABCDEFGHIJKLMNOP')
+        return self._text(field.length)
+
+    # invalid values
+
+    def invalid_values(self, field: f.Field,
+                       data: dict = None) -> List[Tuple[str, Any]]:
+        '''
+        :return: `<list>` [(error key, value)], MISSING removes the key
+        '''
+        result = []
+        if field.required:
+            result.append(('required', MISSING))
+        length = field.length
+        if isinstance(length, int) and not isinstance(field, f.Number) \
+                and not field.lst:
+            result.append(('length', 'a' * (length + 1)))
+        elif isinstance(length, tuple) and not field.lst and \
+                isinstance(field, f.Str):
+            result.append(('length', 'a' * (length[1] + 1)))
+        choices = _choices(field)
+        if choices and field.required:
+            # validators only fail required fields
+            outside = max(choices) + 1 if all(
+                isinstance(c, int) for c in choices) else \
+                f'{max(map(str, choices))}_x'
+            result.append(('invalid', outside))
+        result.extend(self._format_errors(field, data))
+        if self.errors is not None:
+            result = [item for item in result if item[0] in self.errors]
+        return result
+
+    def _format_errors(self, field: f.Field,
+                       data: dict) -> List[Tuple[str, Any]]:
+        if isinstance(field, f.Nested):
+            invalid = self.invalid(field.schema) if field.required else None
+            return [('invalid', invalid.data)] if invalid else []
+        if isinstance(field, f.IntList):
+            result = [('invalid', ['x'])]
+            if field._max_len:
+                result.append(('too_long_error',
+                               list(range(1, field._max_len + 2))))
+            if field._min is not None:
+                result.append(('min_invalid', [field._min - 1]))
+            if field._max is not None:
+                result.append(('max_invalid', [field._max + 1]))
+            return result
+        if isinstance(field, f.List):
+            if field._max_len:
+                return [('too_long_error', [f'item{i}' for i in
+                                            range(field._max_len + 1)])]
+            return []
+        if isinstance(field, f.Boolean):
+            return [('invalid', 'maybe')]
+        if isinstance(field, f.Phone):
+            return [('invalid', '12345678901')]
+        if isinstance(field, f.Timestamp):
+            return [('invalid', 'abc')]
+        if isinstance(field, f.Number):
+            result = [('invalid', 'abc')]
+            integer = isinstance(field, f.Integer)
+            if field._min is not None and (integer or field._min >= 1):
+                result.append(('min_invalid', field._min - 1 if integer
+                               else round(field._min - 0.5, 2)))
+            if field._max is not None:
+                result.append(('max_invalid', field._max + 1))
+            return result
+        if isinstance(field, f.EndedDate):
+            start = (data or {}).get(field.start_field)
+            try:
+                start = datetime.datetime.strptime(start, field.fmt)
+            except (TypeError, ValueError):
+                return [('invalid', '0000')]
+            return [('invalid', (start - datetime.timedelta(days=1))
+                     .strftime(field.fmt))]
+        if isinstance(field, f.DateTime):
+            return [('invalid', 'not a date')]
+        if isinstance(field, f.Time):
+            return [('invalid', 'abc')]
+        if isinstance(field, f.Email):
+            return [('invalid', 'user@')]
+        if isinstance(field, f.Url):
+            return [('invalid', 'example')]
+        if isinstance(field, f.IDCard):
+            return [('invalid', '0' * 18)]
+        if isinstance(field, f.Username):
+            low = field.length if isinstance(field.length, int) \
+                else field.length[0]
+            return [('invalid', '9' * max(low, 1))]
+        if isinstance(field, f.Password):
+            return [('invalid', '<' * max(field._length[0], 1))]
+        if isinstance(field, f.Order):
+            return [('invalid', 'unknown_column asc')]
+        if isinstance(field, f.IpAddr):
+            return [('invalid', '999.1.1.1')]
+        if isinstance(field, f.Jsonify):
+            return [('invalid', '{x')]
+        if isinstance(field, f.EnStr):
+            return [('invalid', ' ' * max(field.length[0], 1)
+                     if isinstance(field.length, tuple) else ' ')]
+        return []
+
+    # payloads
+
+    def _valid_data(self, form: Form) -> dict:
+        values = {}
+        fields = form.__fields__
+        # EndedDate after its start field
+        order = sorted(fields, key=lambda name: isinstance(
+            fields[name], f.EndedDate))
+        included = {name for name in order
+                    if fields[name].required or fields[name].when_field
+                    or self.random.random() < self.optional}
+        for name in order:
+            field = fields[name]
+            if isinstance(field, f.EndedDate) and name in included:
+                # validated against the start date
+                included.add(field.start_field)
+        for name in order:
+            if name in included and name in fields:
+                values[name] = self.valid_value(fields[name], values)
+        # declaration order
+        return {field.data_key: values[name]
+                for name, field in fields.items() if name in values}
+
+    def valid(self, form: Form = None) -> Payload:
+        '''
+        :param form: `<Form>` default the form of the generator
+        :return: `<Payload>`
+        '''
+        return Payload(self._valid_data(form or self.form), None, None)
+
+    def invalid(self, form: Form = None) -> Optional[Payload]:
+        '''
+        A valid payload with one broken field, None if the form has no
+        field that can be broken.
+
+        :return: `<Payload>`
+        '''
+        form = form or self.form
+        fields = form.__fields__
+        data = self._valid_data(form)
+        by_name = {name: data.get(field.data_key)
+                   for name, field in fields.items()}
+        candidates = [(field, error, value)
+                      for name, field in fields.items()
+                      for error, value in self.invalid_values(field, by_name)]
+        when = self._when_errors(form, data)
+        candidates.extend(when)
+        if not candidates:
+            return None
+        field, error, value = self.random.choice(candidates)
+        if isinstance(field, tuple):
+            # when_field: set the condition, drop the field
+            trigger, field = field
+            data[trigger.data_key] = value
+            value = MISSING
+        if value is MISSING:
+            data.pop(field.data_key, None)
+        else:
+            data[field.data_key] = value
+        return Payload(data, field.data_key, error)
+
+    def _when_errors(self, form: Form, data: dict) -> list:
+        if self.errors is not None and 'required' not in self.errors:
+            return []
+        result = []
+        fields = form.__fields__
+        for field in fields.values():
+            trigger = fields.get(field.when_field)
+            if trigger is None or callable(field.when_value):
+                continue
+            value = field.when_value
+            if isinstance(value, dict):
+                value = next(iter(value), None)
+            elif isinstance(value, tuple):
+                value = value[0] if value else None
+            if value is not None:
+                result.append(((trigger, field), 'required', value))
+        return result
+
+    def stream(self, number: int = None, invalid: float = 0.0
+               ) -> Iterator[Payload]:
+        '''
+        :param number: `<int>` payloads, None endless
+        :param invalid: `<float>` 0-1, share of invalid payloads
+        :return: `<iterator>` Payload
+        '''
+        count = itertools.count() if number is None else range(number)
+        for _ in count:
+            payload = None
+            if invalid and self.random.random() < invalid:
+                payload = self.invalid()
+            yield payload or self.valid()
+
+    def encode(self, data: dict, fmt: str = 'json') -> str:
+        '''
+        :param data: `<dict>` Payload.data
+        :param fmt: `<str>` json, urlencoded(form body) or query(query
+            string), nested fields are sent as "parent.key"
+        :return: `<str>`
+        '''
+        if fmt == 'json':
+            return json_dumps(data)
+        if fmt not in FORMATS:
+            raise ValueError(f'fmt must be one of {FORMATS}')
+        return urlencode(_pairs(data, self.form))
+
+
+def _to_text(value: Any) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (dict, list)):
+        return json_dumps(value)
+    return f'{value}'
+
+
+def _pairs(data: dict, form: Form, prefix: str = '') -> list:
+    by_key = {field.data_key: field for field in form.__fields__.values()}
+    pairs = []
+    for key, value in data.items():
+        field = by_key.get(key)
+        name = f'{prefix}{key}'
+        if isinstance(field, f.Nested) and isinstance(value, dict):
+            pairs.extend(_pairs(value, field.schema, f'{name}.'))
+        elif isinstance(value, list) and field is not None and field.lst:
+            if field.list_format == 'json':
+                pairs.append((name, json_dumps(value)))
+            elif field.list_format:
+                pairs.append((name, ','.join(map(str, value))))
+            else:
+                pairs.extend((name, _to_text(item)) for item in value)
+        else:
+            pairs.append((name, _to_text(value)))
+    return pairs
+
+
+def throttle(items: Iterator, rate: float) -> Iterator:
+    '''
+    :param rate: `<float>` maximum items per second
+    '''
+    interval, start = 1 / rate, time.monotonic()
+    for index, item in enumerate(items):
+        delay = start + index * interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        yield item
@@ -0,0 +1,298 @@
+'''
+Per field cost of a form over recorded inputs.
+
+    python -m xform profile app.forms:UserForm inputs.jsonl --repeat 3
+
+Each line of the input file is a JSON object of request data(see
+xform.payloads), or a capture record(see xform.capture). The inputs run
+through dict_bind with the instrument hooks, the report has the calls,
+total/mean time, failure rate, most common error key and slowest stage
+of each field, followed by the form plan: the checks of each field in
+bind order, its regex, validators and async/offload/memoize settings.
+
+Nested schema fields are reported as "Schema.field", the time of the
+Nested field includes them.
+'''
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import fields as f
+from . import instrument
+from .form import Form
+
+__all__ = ['FieldStats', 'Profiler', 'read_inputs', 'profile', 'plan',
+           'format_profile', 'format_plan']
+
+
+class FieldStats:
+    __slots__ = ('calls', 'seconds', 'errors', 'error_keys', 'stages')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.errors = 0
+        self.error_keys = Counter()
+        # {stage: seconds}
+        self.stages: Dict[str, float] = {}
+
+
+class Profiler(instrument.Observer):
+    '''
+    Collect FieldStats of the binds inside the `with` block, the
+    current observer is restored on exit.
+
+    usage::
+
+        with Profiler() as profiler:
+            await form.dict_bind(data)
+        profiler.fields  # {(form name, field name): FieldStats}
+    '''
+
+    def __init__(self) -> None:
+        self.fields: Dict[Tuple[str, str], FieldStats] = {}
+        self._observer = None
+
+    def _stats(self, form: str, field: str) -> FieldStats:
+        stats = self.fields.get((form, field))
+        if stats is None:
+            stats = self.fields[(form, field)] = FieldStats()
+        return stats
+
+    def __call__(self, event: str, span: instrument.Span) -> None:
+        if event != 'end' or span.field is None:
+            return
+        stats = self._stats(span.form, span.field)
+        if span.kind == instrument.FIELD:
+            stats.calls += 1
+            stats.seconds += span.elapsed
+            if span.error:
+                stats.errors += 1
+        else:
+            stats.stages[span.stage] = \
+                stats.stages.get(span.stage, 0.0) + span.elapsed
+
+    def bind(self, form: Any, elapsed: float, error: dict,
+             keys: dict) -> None:
+        name = type(form).__name__
+        for field, key in keys.items():
+            self._stats(name, field).error_keys[key] += 1
+        if self._observer is not None:
+            self._observer.bind(form, elapsed, error, keys)
+
+    def validator(self, form: str, field: str, elapsed: float) -> None:
+        if self._observer is not None:
+            self._observer.validator(form, field, elapsed)
+
+    def __enter__(self) -> 'Profiler':
+        self._observer = instrument.observer
+        instrument.set_observer(self)
+        instrument.add_hook(self)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        instrument.remove_hook(self)
+        instrument.set_observer(self._observer)
+        self._observer = None
+
+    def report(self, form: Form) -> Dict[str, dict]:
+        '''
+        :param form: `<Form>` profiled form, the fields of the other
+            forms(nested schemas) are prefixed by the form name
+        :return: `<dict>` {field: {calls, seconds, errors, error_key,
+            stage}}
+        '''
+        owner = type(form).__name__
+        result = {}
+        for (name, field), stats in self.fields.items():
+            if not stats.calls:
+                continue
+            key = field if name == owner else f'{name}.{field}'
+            top = stats.error_keys.most_common(1)
+            stage = max(stats.stages, key=stats.stages.get) \
+                if stats.stages else None
+            result[key] = {
+                'calls': stats.calls,
+                'seconds': stats.seconds,
+                'errors': stats.errors,
+                'error_key': top[0][0] if top else None,
+                'stage': stage,
+                'stage_seconds': stats.stages.get(stage, 0.0)
+            }
+        return result
+
+
+def read_inputs(paths: Iterable[str]) -> Iterator[dict]:
+    '''
+    :return: `<iterator>` request data of the JSON lines, the data of
+        capture records
+    '''
+    for path in paths:
+        with open(path, encoding='utf-8') as fp:
+            for line in fp:
+                if not line.strip():
+                    continue
+                value = json.loads(line)
+                if isinstance(value, dict) and value.keys() == \
+                        {'form', 'data'}:
+                    value = value['data']
+                yield value
+
+
+def profile(form: Form, inputs: List[dict], repeat: int = 1) -> dict:
+    '''
+    :param form: `<Form>`
+    :param inputs: `<list>` request data
+    :param repeat: `<int>` passes over the inputs
+    :return: `<dict>` {binds, invalid, seconds(per bind, without hooks),
+        fields(see Profiler.report)}
+    '''
+    async def run() -> int:
+        invalid = 0
+        for data in inputs:
+            _, error = await form.dict_bind(data)
+            invalid += bool(error)
+        return invalid
+
+    loop = asyncio.new_event_loop()
+    try:
+        invalid = loop.run_until_complete(run())
+        start = time.perf_counter()
+        for _ in range(repeat):
+            loop.run_until_complete(run())
+        seconds = time.perf_counter() - start
+        with Profiler() as profiler:
+            for _ in range(repeat):
+                loop.run_until_complete(run())
+    finally:
+        loop.close()
+    binds = len(inputs) * repeat
+    return {
+        'binds': len(inputs),
+        'invalid': invalid,
+        'seconds': seconds / binds if binds else 0.0,
+        'fields': profiler.report(form)
+    }
+
+
+def format_profile(report: dict) -> str:
+    binds = report['binds']
+    lines = [f'{binds} inputs, '
+             f'{report["invalid"] / binds * 100 if binds else 0:.1f}% '
+             f'invalid, {report["seconds"] * 1e6:.1f} us/bind']
+    lines.append(f'{"field":<24} {"calls":>7} {"total ms":>9} '
+                 f'{"mean us":>8} {"fail":>7} {"top error":<14} '
+                 f'{"slowest stage":<18}')
+    for field, row in sorted(report['fields'].items(),
+                             key=lambda item: -item[1]['seconds']):
+        stage = '-'
+        if row['stage']:
+            share = row['stage_seconds'] / row['seconds'] * 100 \
+                if row['seconds'] else 0
+            stage = f'{row["stage"]} {share:.0f}%'
+        lines.append(
+            f'{field:<24} {row["calls"]:>7} {row["seconds"] * 1e3:>9.2f} '
+            f'{row["seconds"] / row["calls"] * 1e6:>8.2f} '
+            f'{row["errors"] / row["calls"] * 100:>6.1f}% '
+            f'{row["error_key"] or "-":<14} {stage:<18}')
+    return '\n'.join(lines)
+
+
+def _regex(field: f.Field) -> Optional[str]:
+    pattern = getattr(field, '_pattern', None)
+    if pattern is not None:
+        return pattern.pattern
+    for name in ('_regex', 'regex', 'len18', 'ipv4'):
+        value = getattr(field, name, None)
+        if isinstance(value, str):
+            return value
+    if isinstance(field, f.Url):
+        return '(built per call)'
+    return None
+
+
+def _validator_name(validator: Any) -> str:
+    name = getattr(validator, '__name__', None) or type(validator).__name__
+    if asyncio.iscoroutinefunction(validator) or \
+            asyncio.iscoroutinefunction(getattr(validator, '__call__', None)):
+        name = f'async {name}'
+    return name
+
+
+def plan(form: Form, prefix: str = '') -> List[dict]:
+    '''
+    The checks of each field in bind order.
+
+    :return: `<list>` [{field, class, checks, regex, validators, flags}]
+    '''
+    rows = []
+    for name, field in form.__fields__.items():
+        checks = ['required' if field.required else 'optional']
+        if field.length is not None:
+            checks.append(f'length={field.length}')
+        if field.when_field:
+            checks.append(f'when={field.when_field}')
+        if isinstance(field, f.DateTime):
+            checks.append(f'fmt={field.fmt}')
+        if type(field)._validate is not f.Field._validate:
+            custom = type(field)._validate.__module__ != f.__name__
+            checks.append('custom _validate' if custom else '_validate')
+        for attr in ('_min', '_max', '_min_len', '_max_len'):
+            value = getattr(field, attr, None)
+            if value:
+                checks.append(f'{attr.lstrip("_")}={value}')
+        flags = []
+        if field.is_async:
+            flags.append('async')
+        if field.is_pure:
+            flags.append('pure')
+        if field.memo is not None:
+            flags.append('memoize')
+        if field.offload:
+            flags.append('offload')
+        if field.timeout is not None:
+            flags.append(f'timeout={field.timeout}')
+        if field.limiter is not None:
+            flags.append('concurrency')
+        if field.list_format:
+            flags.append(f'list_format={field.list_format}')
+        if getattr(field, 'compact', False):
+            flags.append('compact')
+        rows.append({
+            'field': f'{prefix}{name}',
+            'data_key': f'{prefix}{field.data_key}',
+            'class': type(field).__name__,
+            'checks': checks,
+            'regex': _regex(field),
+            'validators': [_validator_name(v) for v in field.validators],
+            'flags': flags
+        })
+        if isinstance(field, f.Nested):
+            rows.extend(plan(field.schema, f'{prefix}{name}.'))
+    return rows
+
+
+def format_plan(form: Form) -> str:
+    cache = form.__cache__
+    lines = [f'plan of {type(form).__name__}: '
+             f'{len(form.__fields__)} fields, '
+             f'{len(form.__data_keys__)} request keys, '
+             f'result cache {"on" if cache is not None else "off"}']
+    scheduler = form.__scheduler__
+    if scheduler is not None:
+        order = ', '.join(scheduler.stats())
+        lines.append(f'fail fast, evaluation order: {order}')
+    for row in plan(form):
+        lines.append(f'  {row["field"]} <{row["class"]}> '
+                     f'key={row["data_key"]}: {", ".join(row["checks"])}')
+        if row['regex']:
+            regex = row['regex']
+            regex = regex if len(regex) <= 60 else regex[:57] + '...'
+            lines.append(f'      regex {regex}')
+        if row['validators']:
+            lines.append(f'      validators {", ".join(row["validators"])}')
+        if row['flags']:
+            lines.append(f'      {", ".join(row["flags"])}')
+    return '\n'.join(lines)
@@ -1,25 +1,78 @@
-from functools import lru_cache
-from typing import Any
-try:
-    import ujson as json
-    JDecodeError = ValueError
-except ImportError:
-    import json
-    JDecodeError = json.decoder.JSONDecodeError
-import attr
-from multidict import MultiDict, MultiDictProxy
-
-
-class JsonDecodeError(JDecodeError):
-    pass
+'''
+Helpers shared by the fields and the bindings.
+
+The JSON backend(ujson if installed, else json) is probed on first use,
+ContentType/parse_content_type(attrs, multidict) are loaded from
+xform.content_type on first access, only sanic requests use them. The
+backend module and its decode error are still exported as `json` and
+`JDecodeError`.
+'''
+import sys
+import types
+from typing import Any, Container, Dict, Optional
+from urllib.parse import unquote_plus
+
+_json = None
+
+
+def _json_backend():
+    global _json
+    if _json is None:
+        try:
+            import ujson as backend
+        except ImportError:
+            import json as backend
+        _json = backend
+    return _json
 
 
 def json_dumps(value: Any, sort_keys=None) -> str:
-    return json.dumps(value, sort_keys=sort_keys)
+    return (_json or _json_backend()).dumps(value, sort_keys=sort_keys)
 
 
 def json_loads(value: Any) -> Any:
-    return json.loads(value)
+    return (_json or _json_backend()).loads(value)
+
+
+def _json_decode_base() -> type:
+    backend = _json_backend()
+    return ValueError if backend.__name__ == 'ujson' \
+        else backend.decoder.JSONDecodeError
+
+
+def _json_decode_error() -> type:
+    return type('JsonDecodeError', (_json_decode_base(),),
+                {'__module__': __name__})
+
+
+_LAZY = {
+    'json': _json_backend,
+    'JDecodeError': _json_decode_base,
+    'JsonDecodeError': _json_decode_error,
+    'ContentType': lambda: _content_type().ContentType,
+    'parse_content_type': lambda: _content_type().parse_content_type
+}
+
+
+def _content_type():
+    from . import content_type
+    return content_type
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = globals()[name] = _LAZY[name]()
+    return value
+
+
+if sys.version_info < (3, 7):
+    # no module __getattr__(PEP 562), same lookup by the module class
+    class _LazyModule(types.ModuleType):
+        def __getattr__(self, name: str) -> Any:
+            return __getattr__(name)
+
+    sys.modules[__name__].__class__ = _LazyModule
 
 
 class AttrDict(dict):
@@ -51,25 +104,133 @@ class FrozenDict(dict):
         raise TypeError('Dictionary can not be modified')
 
 
-@attr.s(auto_attribs=True, frozen=True, slots=True)
-class ContentType:
-    type: str
-    subtype: str
-    parameters: 'MultiDictProxy[str]'
+def parse_qs_selective(qs: str,
+                       keys: Container[str],
+                       max_fields: Optional[int] = None,
+                       encoding: str = 'utf-8') -> Dict[str, list]:
+    '''
+    Parse urlencoded/query string, only decode the declared keys.
+
+    Values of undeclared keys are never percent-decoded, ValueError is
+    raised once more than `max_fields` pairs were seen(the input is
+    never silently truncated, same as urllib.parse.parse_qsl).
+
+    usage::
+
+        >>> parse_qs_selective('id=1&junk=%20&id=2', {'id'})
+        {'id': ['1', '2']}
+
+    :param qs: `<str>` raw query string or urlencoded body
+    :param keys: `<set>` declared keys(data_key)
+    :param max_fields: `<int>` maximum number of pairs, default unlimited
+    :param encoding: `<str>` percent-encoded character encoding
+    :return: `<dict>` {key: [value, ...]}
+    '''
+    data = {}
+    if not qs:
+        return data
+    start, count, length = 0, 0, len(qs)
+    while start < length:
+        end = qs.find('&', start)
+        if end < 0:
+            end = length
+        if end > start:
+            count += 1
+            if max_fields and count > max_fields:
+                raise ValueError('Max number of fields exceeded')
+            sep = qs.find('=', start, end)
+            key = qs[start:end] if sep < 0 else qs[start:sep]
+            if '%' in key or '+' in key:
+                key = unquote_plus(key, encoding=encoding)
+            if key in keys:
+                value = '' if sep < 0 else qs[sep + 1:end]
+                if '%' in value or '+' in value:
+                    value = unquote_plus(value, encoding=encoding)
+                data.setdefault(key, []).append(value)
+        start = end + 1
+    return data
+
+
+LIST_FORMATS = ('csv', 'json', 'range')
+
+
+def _split_range(raw: str, limit: int) -> list:
+    data = []
+    for item in raw.split(',', limit):
+        start, sep, end = item.partition('-')
+        if not sep:
+            data.append(int(item))
+        else:
+            start, end = int(start), int(end)
+            if start < 0 or end < start:
+                raise ValueError(item)
+            # never expand more than limit + 1 items
+            data.extend(range(start, min(end, start + limit - len(data)) + 1))
+        if len(data) > limit:
+            break
+    return data
+
+
+class InvalidList:
+    '''
+    Invalid list_format value, reported by the field validation as
+    error_key, see split_list.
+    '''
+    __slots__ = ('raw', 'error_key', 'limit')
+
+    def __init__(self, raw: str, error_key: str = 'invalid',
+                 limit: int = None) -> None:
+        self.raw = raw
+        self.error_key = error_key
+        self.limit = limit
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, InvalidList) and \
+            (self.raw, self.error_key) == (other.raw, other.error_key)
+
+    def __hash__(self) -> int:
+        return hash((self.raw, self.error_key))
 
+    def __repr__(self) -> str:
+        return f'InvalidList({self.raw!r}, {self.error_key!r})'
 
-@lru_cache(50)
-def parse_content_type(ctype: str) -> str:
-    parts = ctype.split(';')
-    params = MultiDict()
-    for item in parts[1:]:
-        if not item:
+
+def split_list(values: list, fmt: str, limit: int = 1000) -> list:
+    '''
+    Split list wire formats.
+
+    csv: 1,2,3 json: [1,2,3] range: 1-100 or 1-5,8,10-12
+
+    Invalid or more than limit items value is returned as
+    [InvalidList(raw)], the field reports it(invalid/too_long_error).
+
+    usage::
+
+        >>> split_list(['1,2', '3'], 'csv')
+        ['1', '2', '3']
+
+    :param values: `<list>` request values, e.g: get_query_arguments
+    :param fmt: `<str>` csv/json/range
+    :param limit: `<int>` maximum items
+    :return: `<list>`
+    '''
+    data = []
+    for raw in values:
+        if not isinstance(raw, str) or not raw:
+            data.append(raw)
             continue
-        key, value = item.split('=', 1) if '=' in item else (item, '')
-        params.add(key.lower().strip(), value.strip(' "'))
-    fulltype = parts[0].strip().lower()
-    if fulltype == '*':
-        fulltype = '*/*'
-    mtype, stype = fulltype.split(
-        '/', 1) if '/' in fulltype else (fulltype, '')
-    return ContentType(type=mtype, subtype=stype, parameters=params)
+        try:
+            if fmt == 'csv':
+                items = raw.split(',', limit)
+            elif fmt == 'json':
+                items = json_loads(raw)
+                if not isinstance(items, list):
+                    raise ValueError(raw)
+            else:
+                items = _split_range(raw, limit)
+        except ValueError:
+            return [InvalidList(raw)]
+        data.extend(items)
+        if len(data) > limit:
+            return [InvalidList(raw, 'too_long_error', limit)]
+    return data
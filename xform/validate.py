@@ -14,6 +14,9 @@ class ValidationError(Exception):
 
 
 class Validator:
+    # the result only depends on the value, see Field.is_pure
+    pure = False
+
     def __repr__(self):
         args = self.__repr_args__()
         args = '{}'.format(args) if args else ''
@@ -23,6 +26,7 @@ class Validator:
 
 
 class OneOf(Validator):
+    pure = True
     default_message = ErrMsg.get_message('invalid_option')
 
     def __init__(self, choices: Union[list, tuple], error: str = None):